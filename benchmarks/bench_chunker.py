@@ -0,0 +1,87 @@
+# benchmarks/bench_chunker.py
+"""
+리콜 공지문 청크 분할(create_recall_chunks) 벤치마크 - 대형 합성 공지문 사용
+
+사용법 (프로젝트 루트에서 실행):
+  python -m benchmarks.bench_chunker
+  python -m benchmarks.bench_chunker --sizes 10000,100000,1000000 --repeat 5
+
+합성 공지문에는 보호 대상 정보(회사명, 로트 번호, 전화번호, 제품 수량)와 문장부호/줄바꿈이
+실제 공지문과 비슷한 비율로 섞여 있습니다. 크기를 10배 늘렸을 때 시간도 10배 안팎이면 선형입니다.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Dict, List
+
+WORDS = (
+    "the product was voluntarily recalled because it may contain undeclared milk eggs and wheat "
+    "consumers who have purchased the affected items are urged not to consume them and to return "
+    "them to the place of purchase for a full refund no illnesses have been reported to date"
+).split()
+
+def synthetic_announcement(size: int, seed: int = 0) -> str:
+    """보호 대상 정보가 섞인 size 글자 안팎의 합성 Company Announcement"""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    length = 0
+    while length < size:
+        roll = rng.random()
+        if roll < 0.02:
+            part = f"{rng.choice(['Acme Foods', 'Green Valley Farms', 'Sunrise Bakery'])} {rng.choice(['LLC', 'Inc.', 'Company'])}"
+        elif roll < 0.035:
+            part = f"Lot #{rng.randint(1000, 999999)}"
+        elif roll < 0.04:
+            part = f"1-800-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+        elif roll < 0.05:
+            part = f"{rng.randint(1, 500)} boxes of {rng.choice(['Snack Mix', 'Frozen Dumplings', 'Granola Bars'])}"
+        elif roll < 0.12:
+            part = rng.choice([".", ",", ".\n\n", ";", "\n"])
+        else:
+            part = rng.choice(WORDS)
+        parts.append(part)
+        length += len(part) + 1
+    return " ".join(parts)
+
+def bench_size(size: int, repeat: int) -> Dict:
+    from utils.fda_realtime_crawler import create_recall_chunks
+
+    text = synthetic_announcement(size)
+    timings = []
+    chunks: List[str] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks = create_recall_chunks(text)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {
+        "chars": len(text),
+        "chunks": len(chunks),
+        "best_s": round(best, 5),
+        "mean_s": round(sum(timings) / len(timings), 5),
+        "mb_per_s": round(len(text) / best / 1e6, 2) if best else 0.0,
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="리콜 공지문 청크 분할 벤치마크")
+    parser.add_argument("--sizes", default="5000,50000,500000", help="쉼표로 구분한 공지문 크기(글자 수)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    results = [bench_size(int(size), args.repeat) for size in args.sizes.split(",") if size.strip()]
+
+    print("=== create_recall_chunks ===")
+    for result in results:
+        print(json.dumps(result, ensure_ascii=False))
+
+    # 크기 대비 시간 증가율 (선형이면 1 근처)
+    for previous, current in zip(results, results[1:]):
+        if previous["best_s"] and current["best_s"]:
+            growth = (current["best_s"] / previous["best_s"]) / (current["chars"] / previous["chars"])
+            print(f"{previous['chars']} → {current['chars']} 글자: 크기 대비 시간 증가율 {growth:.2f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
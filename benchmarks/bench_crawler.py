@@ -0,0 +1,182 @@
+# benchmarks/bench_crawler.py
+"""
+FDA 크롤러 처리량 벤치마크 (fda.gov 대신 로컬 대역 서버 benchmarks/fda_stub_server.py 사용)
+
+측정 항목
+- parse: 상세 페이지/목록 응답 1건 파싱 시간 (ms)
+- http: FDARealtimeCrawler http 모드 수집 - 초당 페이지 수, 전체 시간
+- selenium: selenium 모드 수집 (Chrome/셀레니움이 있을 때만) - 첫 실행(cold)과 브라우저 풀 재사용(warm)
+- ingest: 수집 → 벡터스토어 적재까지 전체 시간 (임시 Chroma + 결정적 가짜 임베딩, 네트워크 없음)
+
+사용법 (프로젝트 루트에서 실행):
+  python -m benchmarks.bench_crawler --latency-ms 80 --jitter-ms 20
+  python -m benchmarks.bench_crawler --save-baseline bench_crawler_baseline.json
+  python -m benchmarks.bench_crawler --baseline bench_crawler_baseline.json --max-regression 0.2   # 회귀 게이트
+
+--baseline 을 주면 기준값보다 max-regression 비율 이상 느려진 항목이 있을 때 종료 코드 1을 반환합니다.
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List
+
+# (지표 경로, 높을수록 좋은지) - 회귀 게이트 비교 대상
+GATED_METRICS = [
+    (("parse", "detail_ms"), False),
+    (("parse", "listing_ms"), False),
+    (("http", "pages_per_s"), True),
+    (("ingest", "total_s"), False),
+]
+
+def bench_parse(repeat: int) -> Dict:
+    from benchmarks.fda_stub_server import FIXTURE_DIR, listing_rows
+    from utils.fda_realtime_crawler import parse_listing_rows, parse_recall_detail
+
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "detail_*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append(f.read())
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            parse_recall_detail(html, "https://www.fda.gov/fixture")
+    detail_ms = (time.perf_counter() - start) * 1000 / (repeat * len(pages))
+
+    payload = {"data": listing_rows(0, 25, 25, datetime.now())}
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse_listing_rows(payload, "https://www.fda.gov")
+    listing_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    return {"detail_ms": round(detail_ms, 3), "listing_ms": round(listing_ms, 3)}
+
+def _crawl(server, mode: str, max_recalls: int) -> Dict:
+    from utils.crawl_state import get_crawl_state
+    from utils.fda_realtime_crawler import FDARealtimeCrawler
+
+    get_crawl_state().reset()
+    server.reset_stats()
+    crawler = FDARealtimeCrawler(base_url=server.url, mode=mode)
+    start = time.perf_counter()
+    recalls = list(crawler.iter_latest_recalls(after_date=datetime(2000, 1, 1), max_recalls=max_recalls))
+    elapsed = time.perf_counter() - start
+    pages = server.stats["listing"] + server.stats["datatable"] + server.stats["detail"]
+    return {
+        "recalls": len(recalls),
+        "pages": pages,
+        "total_s": round(elapsed, 3),
+        "pages_per_s": round(pages / elapsed, 2) if elapsed else 0.0,
+    }
+
+def bench_ingest(server, max_recalls: int, workdir: str) -> Dict:
+    from langchain_community.vectorstores import Chroma
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from utils.crawl_state import get_crawl_state
+    from utils.fda_realtime_crawler import FDARealtimeCrawler, ingest_recall_stream
+
+    get_crawl_state().reset()
+    vectorstore = Chroma(
+        persist_directory=os.path.join(workdir, "chroma"),
+        embedding_function=DeterministicFakeEmbedding(size=256),
+        collection_name="bench_recalls",
+    )
+    crawler = FDARealtimeCrawler(base_url=server.url, mode="http")
+    start = time.perf_counter()
+    added = ingest_recall_stream(
+        crawler.iter_latest_recalls(after_date=datetime(2000, 1, 1), max_recalls=max_recalls), vectorstore
+    )
+    elapsed = time.perf_counter() - start
+    return {"documents": added, "total_s": round(elapsed, 3), "docs_per_s": round(added / elapsed, 2) if elapsed else 0.0}
+
+def bench_selenium(server, max_recalls: int) -> Dict:
+    from utils.fda_realtime_crawler import SELENIUM_AVAILABLE
+    if not SELENIUM_AVAILABLE:
+        return {"skipped": "selenium 미설치"}
+    try:
+        cold = _crawl(server, "selenium", max_recalls)
+        warm = _crawl(server, "selenium", max_recalls)  # 브라우저 풀의 드라이버 재사용
+    except Exception as e:
+        return {"skipped": f"selenium 실행 실패: {e}"}
+    if not cold["pages"]:
+        # 크롤러가 드라이버 오류를 내부에서 처리하고 빈 결과를 반환한 경우
+        return {"skipped": "selenium 수집 0건 (Chrome/chromedriver 확인)"}
+    return {"cold": cold, "warm": warm}
+
+def check_regressions(results: Dict, baseline: Dict, max_regression: float) -> List[str]:
+    """기준값 대비 max_regression 비율 이상 나빠진 지표 목록"""
+    failures = []
+    for (section, metric), higher_is_better in GATED_METRICS:
+        current = results.get(section, {}).get(metric)
+        reference = baseline.get(section, {}).get(metric)
+        if not current or not reference:
+            continue
+        change = (reference - current) / reference if higher_is_better else (current - reference) / reference
+        if change > max_regression:
+            failures.append(f"{section}.{metric}: 기준 {reference} → 현재 {current} ({change:+.0%})")
+    return failures
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="FDA 크롤러 처리량 벤치마크 (로컬 대역 서버)")
+    parser.add_argument("--records", type=int, default=200, help="대역 서버 목록 행 수")
+    parser.add_argument("--max-recalls", type=int, default=100, help="1회 크롤링 최대 수집 건수")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--parse-repeat", type=int, default=50)
+    parser.add_argument("--host-rps", type=float, default=1000.0,
+                        help="호스트당 초당 요청 수 제한 (대역 서버라 기본은 사실상 무제한, 운영 설정 재현 시 4)")
+    parser.add_argument("--modes", default="http,selenium", help="쉼표로 구분 (http, selenium)")
+    parser.add_argument("--baseline", help="회귀 게이트 기준 결과 JSON")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용 성능 저하 비율")
+    parser.add_argument("--save-baseline", help="이번 결과를 기준 JSON으로 저장")
+    args = parser.parse_args(argv)
+
+    # 상태 저장소/캐시는 임시 디렉터리 사용 - 크롤러 모듈을 불러오기 전에 환경 변수 적용
+    workdir = tempfile.mkdtemp(prefix="bench_crawler_")
+    os.environ["CRAWL_STATE_PATH"] = os.path.join(workdir, "crawl_state.sqlite3")
+    os.environ["HTTP_CACHE"] = "0"  # 매번 네트워크(대역 서버)까지 가는 시간을 측정
+    os.environ["CRAWL_HOST_RPS"] = str(args.host_rps)
+
+    from benchmarks.fda_stub_server import FDAStubServer
+
+    modes = {mode.strip() for mode in args.modes.split(",") if mode.strip()}
+    results: Dict[str, Dict] = {"parse": bench_parse(args.parse_repeat)}
+    try:
+        with FDAStubServer(args.records, args.latency_ms, args.jitter_ms) as server:
+            print(f"FDA 대역 서버: {server.url} (지연 {args.latency_ms}±{args.jitter_ms}ms, {args.records}행)")
+            if "http" in modes:
+                results["http"] = _crawl(server, "http", args.max_recalls)
+                results["ingest"] = bench_ingest(server, args.max_recalls, workdir)
+            if "selenium" in modes:
+                results["selenium"] = bench_selenium(server, args.max_recalls)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n=== 크롤러 벤치마크 ===")
+    for section, result in results.items():
+        print(section, json.dumps(result, ensure_ascii=False))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"기준 결과 저장: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        failures = check_regressions(results, baseline, args.max_regression)
+        if failures:
+            print("\n❌ 성능 회귀 감지:")
+            for failure in failures:
+                print(f"  - {failure}")
+            return 1
+        print("\n✅ 기준 대비 성능 회귀 없음")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
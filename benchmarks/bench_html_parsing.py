@@ -0,0 +1,81 @@
+# benchmarks/bench_html_parsing.py
+"""
+HTML 파서 백엔드 비교 벤치마크 - 저장된 페이지(기본: benchmarks/fixtures/fda) 사용
+
+백엔드(html.parser, lxml, 설치된 경우 html5lib)마다
+- full: 문서 전체 파싱 시간
+- strained: SoupStrainer로 본문(<main>)만 파싱한 시간
+을 페이지 1건당 ms로 출력합니다. html5lib는 SoupStrainer를 지원하지 않아 full만 측정합니다.
+
+사용법 (프로젝트 루트에서 실행):
+  python -m benchmarks.bench_html_parsing
+  python -m benchmarks.bench_html_parsing --pages "saved_pages/*.html" --only main --repeat 20
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+DEFAULT_PAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "fda", "*.html")
+
+def available_parsers() -> List[str]:
+    parsers = ["html.parser"]
+    for name, module in (("lxml", "lxml"), ("html5lib", "html5lib")):
+        try:
+            __import__(module)
+            parsers.append(name)
+        except ImportError:
+            pass
+    return parsers
+
+def _per_page_ms(pages: List[str], repeat: int, parse) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            parse(html)
+    return round((time.perf_counter() - start) * 1000 / (repeat * len(pages)), 3)
+
+def bench_parser(parser: str, pages: List[str], repeat: int, only: Optional[str]) -> Dict:
+    from bs4 import BeautifulSoup
+    from utils.html_parsing import make_soup, SoupStrainer
+
+    result = {"full_ms": _per_page_ms(pages, repeat, lambda html: BeautifulSoup(html, parser))}
+    if only and parser != "html5lib":
+        strainer = SoupStrainer(only)
+        result["strained_ms"] = _per_page_ms(pages, repeat, lambda html: make_soup(html, only=strainer, parser=parser))
+    return result
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="HTML 파서 백엔드 비교 벤치마크")
+    parser.add_argument("--pages", default=DEFAULT_PAGES, help="저장된 HTML 페이지 glob 패턴")
+    parser.add_argument("--only", default="main", help="부분 파싱할 태그 이름 (빈 문자열이면 생략)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    pages = []
+    for path in sorted(glob.glob(args.pages)):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            pages.append(f.read())
+    if not pages:
+        print(f"페이지가 없습니다: {args.pages}")
+        return 1
+
+    from utils.html_parsing import HTML_PARSER
+
+    size_kb = sum(len(html) for html in pages) / len(pages) / 1024
+    print(f"=== HTML 파서 비교: 페이지 {len(pages)}건 (평균 {size_kb:.1f}KB), 현재 설정 HTML_PARSER={HTML_PARSER} ===")
+    results = {name: bench_parser(name, pages, args.repeat, args.only) for name in available_parsers()}
+    for name, result in results.items():
+        print(name, json.dumps(result, ensure_ascii=False))
+
+    baseline = results["html.parser"]["full_ms"]
+    for name, result in results.items():
+        fastest = min(result.values())
+        print(f"{name}: html.parser 전체 파싱 대비 {baseline / fastest:.1f}배" if fastest else name)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
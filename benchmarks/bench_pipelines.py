@@ -0,0 +1,252 @@
+# benchmarks/bench_pipelines.py
+"""
+챗봇 파이프라인 오프라인 벤치마크 (utils/llm_replay.py 녹화/재생 백엔드 사용)
+
+사용법 (프로젝트 루트에서 실행):
+  # 1) 실제 API로 한 번 녹화
+  LLM_BACKEND_MODE=record python -m benchmarks.bench_pipelines --repeat 1
+
+  # 2) 네트워크 없이 재생 - 가상 지연시간으로 API 편차를 제거한 채 우리 코드의 지연만 측정
+  LLM_BACKEND_MODE=replay LLM_REPLAY_LATENCY_MS="chat=800,embedding=60" \\
+      python -m benchmarks.bench_pipelines --repeat 5
+
+  # 3) 웹 수집까지 오프라인으로 - FDA 리콜 크롤링은 로컬 대역 서버(benchmarks/fda_stub_server.py),
+  #    구글 뉴스/식품음료신문/eCFR 수집은 고정 응답으로 대체
+  LLM_BACKEND_MODE=replay python -m benchmarks.bench_pipelines --offline --repeat 3
+
+파이프라인
+- regulation: 규제 챗봇 (ask_question)
+- recall: 리콜 챗봇 (ask_recall_question) - --offline이면 실시간 크롤링을 타는 "최근" 질문도 포함
+- ecfr: eCFR 변경 규정 수집/번역/요약 배치 (utils/c.py main)
+- news: 뉴스 탭 (components/tab_news.py show_news) - streamlit 실행 컨텍스트 없이 호출하므로 화면 출력은 무시됨
+
+참고: 실시간 크롤링/뉴스 수집은 LLM 호출이 아니므로 재생 대상이 아닙니다.
+--offline 없이 실행하면 실제 사이트에 접속합니다.
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+DEFAULT_QUESTIONS = {
+    "regulation": [
+        "FDA 등록은 어떻게 하나요?",
+        "식품 첨가물 규정이 궁금해요.",
+        "알러지 라벨링 규제는 어떻게 되나요?",
+    ],
+    "recall": [
+        "만두 리콜 사례가 있나요?",
+        "리콜 사례의 주요 원인은?",
+        "알레르기 표시 누락으로 인한 리콜 사례는?",
+    ],
+}
+# --offline에서 추가하는 리콜 질문 - "최근" 키워드로 실시간 크롤링(대역 서버)까지 실행
+REALTIME_RECALL_QUESTION = "최근 식품 리콜 사례 알려줘"
+
+OFFLINE_ARTICLE = (
+    "미국 식품의약국(FDA)은 알레르기 유발 성분 표시 누락을 이유로 포장 식품에 대한 자발적 리콜을 발표했다. "
+    "해당 제품은 전국 유통망을 통해 판매되었으며 소비자는 구매처에서 환불받을 수 있다. "
+    "FDA는 수입 식품의 라벨링 점검을 강화하고 있으며 한국 수출 기업도 표시 사항을 다시 확인할 필요가 있다."
+)
+OFFLINE_REGULATION_TEXT = (
+    "§ 101.9 Nutrition labeling of food. (a) Nutrition information relating to food shall be provided "
+    "for all products intended for human consumption and offered for sale. (b) All nutrient and food component "
+    "quantities shall be declared in relation to a serving. (c) The declaration of nutrition information on the "
+    "label and in labeling of a food shall contain information about the level of the listed nutrients. "
+) * 4
+OFFLINE_PARTS = [("B", "101"), ("B", "117"), ("A", "11")]
+
+def _offline_news_feed(rss_url: str):
+    """구글 뉴스 RSS 대신 쓰는 고정 피드 (검색어가 제목에 들어간 최신 기사 5건)"""
+    import feedparser
+    from urllib.parse import parse_qs, urlsplit
+    from email.utils import format_datetime
+    from xml.sax.saxutils import escape
+
+    query = parse_qs(urlsplit(rss_url).query).get("q", [""])[0]
+    published = format_datetime(datetime.now().astimezone())
+    items = "".join(
+        f"<item><title>{escape(query)} 관련 소식 {i + 1}</title>"
+        f"<link>https://news.example.invalid/{i + 1}</link><pubDate>{published}</pubDate>"
+        f"<description>{escape(OFFLINE_ARTICLE[:80])}</description></item>"
+        for i in range(5)
+    )
+    return feedparser.parse(f'<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>{items}</channel></rss>')
+
+def _offline_articles(keyword=None, max_pages=5, max_articles=3):
+    """식품음료신문 목록 수집 대신 쓰는 고정 기사 목록"""
+    return [{
+        "title": f"{keyword or '세계'} 식품 시장 동향 {i + 1}",
+        "summary": OFFLINE_ARTICLE[:200] + "...",
+        "info": datetime.now().strftime("%Y.%m.%d"),
+        "link": f"https://news.example.invalid/article/{i + 1}",
+        "img_url": None,
+    } for i in range(max_articles)]
+
+def _offline_recent_changes():
+    """eCFR 최근 변경 목록 대신 쓰는 고정 목록"""
+    return [{
+        "subchapter": subchapter,
+        "part_number": part,
+        "change_date": datetime.now().strftime("%m/%d/%Y"),
+        "url": f"https://www.ecfr.gov/current/title-21/chapter-I/subchapter-{subchapter}/part-{part}",
+    } for subchapter, part in OFFLINE_PARTS]
+
+def _offline_part_data(subchapter_letter, part_num, url=None):
+    """eCFR Part 페이지 수집 대신 쓰는 고정 본문"""
+    return {
+        "title": f"PART {part_num} - FOOD LABELING",
+        "subchapter": subchapter_letter,
+        "part_number": part_num,
+        "url": url,
+        "content": OFFLINE_REGULATION_TEXT,
+    }
+
+def enter_offline_mode(stack: contextlib.ExitStack, workdir: str) -> None:
+    """
+    웹 수집을 네트워크 없이 실행되도록 전환 - 파이프라인 모듈을 불러오기 전에 호출해야 함
+    - FDA 리콜 사이트: 로컬 대역 서버 (FDA_BASE_URL), 크롤링 상태/HTTP 캐시는 임시 디렉터리
+    - 구글 뉴스 RSS/기사 본문, 식품음료신문, eCFR: 수집 함수를 고정 응답으로 교체
+    """
+    from benchmarks.fda_stub_server import FDAStubServer
+
+    server = stack.enter_context(FDAStubServer(records=100))
+    os.environ["FDA_BASE_URL"] = server.url
+    os.environ["CRAWL_STATE_PATH"] = os.path.join(workdir, "crawl_state.sqlite3")
+    os.environ["HTTP_CACHE_PATH"] = os.path.join(workdir, "http_cache.sqlite3")
+    os.environ["CRAWL_HOST_RPS"] = "1000"
+    print(f"오프라인 모드: FDA 대역 서버 {server.url}, 뉴스/eCFR 수집은 고정 응답")
+
+    import components.tab_news as tab_news
+    import utils.c as ecfr
+    import utils.google_crawler as google_crawler
+
+    patches = [
+        (google_crawler, "_fetch_rss", _offline_news_feed),
+        (google_crawler, "extract_news_content", lambda url: OFFLINE_ARTICLE),
+        (tab_news, "fetch_articles_with_keyword", _offline_articles),
+        (tab_news, "fetch_full_article_content", lambda url: OFFLINE_ARTICLE),
+        (ecfr, "get_recent_changes", _offline_recent_changes),
+        (ecfr, "get_part_data", _offline_part_data),
+        (ecfr, "output_filename", os.path.join(workdir, "risk_federal_changes.json")),
+    ]
+    for module, name, replacement in patches:
+        original = getattr(module, name)
+        setattr(module, name, replacement)
+        stack.callback(setattr, module, name, original)
+
+def percentile(values: List[float], pct: float) -> float:
+    """단순 최근접 순위 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+def run_pipeline(name: str, ask: Callable, questions: List[str], repeat: int) -> Dict:
+    """질문 목록을 repeat 회 반복 실행하고 지연시간 통계 반환"""
+    latencies = []
+    errors = 0
+    for _ in range(repeat):
+        for question in questions:
+            start = time.perf_counter()
+            result = ask(question, [])
+            latencies.append(time.perf_counter() - start)
+            if str(result.get("answer", "")).startswith("처리 중 오류"):
+                errors += 1
+
+    return {
+        "pipeline": name,
+        "runs": len(latencies),
+        "errors": errors,
+        "mean_s": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+        "p50_s": round(percentile(latencies, 50), 4),
+        "p95_s": round(percentile(latencies, 95), 4),
+        "max_s": round(max(latencies), 4) if latencies else 0.0,
+    }
+
+def run_batch(name: str, run: Callable, repeat: int) -> Dict:
+    """질문 없는 배치/화면 함수를 repeat 회 실행하고 지연시간 통계 반환 (예외는 오류로 집계)"""
+    latencies = []
+    errors = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            run()
+        except Exception as e:
+            print(f"⚠️ {name} 실행 오류: {e}")
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "pipeline": name,
+        "runs": len(latencies),
+        "errors": errors,
+        "mean_s": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+        "p50_s": round(percentile(latencies, 50), 4),
+        "p95_s": round(percentile(latencies, 95), 4),
+        "max_s": round(max(latencies), 4) if latencies else 0.0,
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="챗봇 파이프라인 오프라인 벤치마크")
+    parser.add_argument("--pipeline", choices=["regulation", "recall", "ecfr", "news", "all"], default="all")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--questions", help="파이프라인별 질문 목록 JSON 파일 ({\"regulation\": [...], \"recall\": [...]})")
+    parser.add_argument("--offline", action="store_true",
+                        help="FDA 크롤링은 로컬 대역 서버로, 뉴스/eCFR 수집은 고정 응답으로 대체")
+    args = parser.parse_args(argv)
+
+    mode = os.getenv("LLM_BACKEND_MODE", "live")
+    print(f"LLM 백엔드 모드: {mode}")
+
+    questions = {name: list(items) for name, items in DEFAULT_QUESTIONS.items()}
+    if args.questions:
+        with open(args.questions, "r", encoding="utf-8") as f:
+            questions = json.load(f)
+    elif args.offline:
+        questions["recall"].append(REALTIME_RECALL_QUESTION)
+
+    workdir = tempfile.mkdtemp(prefix="bench_pipelines_")
+    with contextlib.ExitStack() as stack:
+        stack.callback(shutil.rmtree, workdir, ignore_errors=True)
+        # 오프라인/백엔드 환경 변수가 적용된 뒤에 파이프라인 모듈을 불러와야 함
+        if args.offline:
+            enter_offline_mode(stack, workdir)
+        from utils.llm_gateway import get_gateway
+
+        results = []
+        if args.pipeline in ("regulation", "all"):
+            from utils.chat_regulation import ask_question
+            results.append(run_pipeline("regulation", ask_question, questions.get("regulation", []), args.repeat))
+        if args.pipeline in ("recall", "all"):
+            from utils.chat_recall import ask_recall_question
+            results.append(run_pipeline("recall", ask_recall_question, questions.get("recall", []), args.repeat))
+        if args.pipeline in ("ecfr", "all"):
+            import utils.c as ecfr
+            results.append(run_batch("ecfr", ecfr.main, args.repeat))
+        if args.pipeline in ("news", "all"):
+            from components.tab_news import show_news
+            results.append(run_batch("news", show_news, args.repeat))
+
+    print("\n=== 파이프라인 지연시간 ===")
+    for result in results:
+        print(json.dumps(result, ensure_ascii=False))
+
+    print("\n=== 모델별 게이트웨이 지표 ===")
+    gateway = get_gateway()
+    for model, metrics in gateway.get_metrics().items():
+        print(model, json.dumps(metrics, ensure_ascii=False))
+    if gateway.backend is not None:
+        print(f"카세트 통계: {gateway.backend.stats}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
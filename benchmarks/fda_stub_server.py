@@ -0,0 +1,236 @@
+# benchmarks/fda_stub_server.py
+"""
+FDA 리콜 사이트 대역(stand-in) 로컬 HTTP 서버 - 크롤러 벤치마크/재현용
+- benchmarks/fixtures/fda 의 저장된 목록/상세 페이지를 fda.gov와 같은 경로로 제공
+  · /safety/recalls-market-withdrawals-safety-alerts        목록 페이지 (Selenium 모드용, 스크립트로 테이블 렌더링)
+  · /datatables/views/ajax                                  목록 테이블 데이터 (DataTables JSON)
+  · /safety/recalls-market-withdrawals-safety-alerts/<slug> 상세 페이지 (detail_*.html 을 순환 사용)
+  · /about-fda/contact-fda/stay-informed/rss-feeds/food-safety-recalls/rss.xml  리콜 RSS 피드 (최신 20건)
+- 요청마다 지연시간(--latency-ms, --jitter-ms)을 넣어 실제 사이트 응답 시간을 흉내냄
+- 상세 페이지와 피드는 ETag / Last-Modified 를 붙이고 조건부 요청에는 304로 응답
+
+사용법 (프로젝트 루트에서 실행):
+  python -m benchmarks.fda_stub_server --port 8765 --records 300 --latency-ms 80
+  FDA_BASE_URL=http://127.0.0.1:8765 streamlit run main.py   # 앱을 대역 서버에 연결
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from email.utils import format_datetime, formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "fda")
+LISTING_PATH = "/safety/recalls-market-withdrawals-safety-alerts"
+DATATABLE_PATH = "/datatables/views/ajax"
+FEED_PATH = "/about-fda/contact-fda/stay-informed/rss-feeds/food-safety-recalls/rss.xml"
+FEED_ITEMS = 20
+
+BRANDS = ["Harbor Valley", "Northfield", "Sunrise", "Green Valley", "Blue Ridge", "Maple Lane", "Coastal Kitchen"]
+REASONS = ["Undeclared milk", "Potential Listeria monocytogenes", "Potential Salmonella", "Foreign material"]
+
+def listing_rows(start: int, length: int, records: int, start_date: datetime) -> List[List[str]]:
+    """DataTables 형식 목록 행 - 날짜 내림차순 (하루 2건씩)"""
+    rows = []
+    for i in range(start, min(start + length, records)):
+        date = start_date - timedelta(days=i // 2)
+        brand = BRANDS[i % len(BRANDS)]
+        rows.append([
+            f'<time datetime="{date.strftime("%Y-%m-%d")}T04:00:00Z">{date.strftime("%m/%d/%Y")}</time>',
+            f'<a href="{LISTING_PATH}/{brand.lower().replace(" ", "-")}-recall-{i:05d}">{brand}</a>',
+            "Packaged food product",
+            "Food &amp; Beverages",
+            REASONS[i % len(REASONS)],
+            f"{brand} Foods LLC",
+        ])
+    return rows
+
+def recall_feed(site_url: str, records: int, start_date: datetime, items: int = FEED_ITEMS) -> bytes:
+    """목록 최신 items건을 FDA 리콜 피드 형식(RSS 2.0)으로"""
+    entries = []
+    for i in range(min(items, records)):
+        date = start_date - timedelta(days=i // 2)
+        brand = BRANDS[i % len(BRANDS)]
+        link = f"{site_url}{LISTING_PATH}/{brand.lower().replace(' ', '-')}-recall-{i:05d}"
+        entries.append(
+            f"<item><title>{escape(brand)} Foods LLC Recalls Product Due to {escape(REASONS[i % len(REASONS)])}</title>"
+            f"<link>{link}</link><guid isPermaLink=\"true\">{link}</guid>"
+            f"<pubDate>{format_datetime(date.replace(hour=4, minute=0, second=0, microsecond=0))}</pubDate>"
+            f"<description>{escape(brand)} Foods LLC</description></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+        f"<title>Food Safety Recalls</title><link>{site_url}{LISTING_PATH}</link>"
+        "<description>FDA food safety recalls (stand-in)</description>"
+        + "".join(entries) + "</channel></rss>"
+    ).encode("utf-8")
+
+class FDAStubServer:
+    """저장된 FDA 페이지를 제공하는 스레드 HTTP 서버"""
+
+    def __init__(self, records: int = 200, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0, start_date: Optional[datetime] = None):
+        self.records = records
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.start_date = start_date or datetime.now()
+        self.listing_html = self._read("listing.html")
+        self.details = [self._read(path) for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "detail_*.html")))]
+        if not self.details:
+            raise FileNotFoundError(f"상세 페이지 픽스처가 없습니다: {FIXTURE_DIR}")
+        self.last_modified = formatdate(time.time(), usegmt=True)
+        self.stats: Dict[str, int] = {"listing": 0, "datatable": 0, "detail": 0, "feed": 0, "not_modified": 0, "bytes": 0}
+        self._stats_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _read(name: str) -> bytes:
+        with open(os.path.join(FIXTURE_DIR, name), "rb") as f:
+            return f.read()
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FDAStubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fda-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FDAStubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def _count(self, kind: str, size: int = 0) -> None:
+        with self._stats_lock:
+            self.stats[kind] += 1
+            self.stats["bytes"] += size
+
+    def _delay(self) -> None:
+        delay = self.latency_ms + (random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                server._delay()
+                parsed = urlparse(self.path)
+                path = parsed.path.rstrip("/")
+
+                if path == LISTING_PATH:
+                    server._count("listing", len(server.listing_html))
+                    self._send(200, server.listing_html, "text/html; charset=utf-8")
+                    return
+
+                if path == DATATABLE_PATH:
+                    query = parse_qs(parsed.query)
+                    start = int(query.get("start", ["0"])[0])
+                    length = int(query.get("length", ["25"])[0])
+                    # 대역 서버의 행은 모두 Food & Beverages - Product Type 필터와 무관하게 같은 행 반환
+                    payload = {
+                        "draw": int(query.get("draw", ["1"])[0]),
+                        "recordsTotal": server.records,
+                        "recordsFiltered": server.records,
+                        "data": listing_rows(start, length, server.records, server.start_date),
+                    }
+                    body = json.dumps(payload).encode("utf-8")
+                    server._count("datatable", len(body))
+                    self._send(200, body, "application/json")
+                    return
+
+                if path == FEED_PATH:
+                    body = recall_feed(server.url, server.records, server.start_date)
+                    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                    if self.headers.get("If-None-Match") == etag:
+                        server._count("not_modified")
+                        self._send(304, b"", "application/rss+xml", {"ETag": etag})
+                        return
+                    server._count("feed", len(body))
+                    self._send(200, body, "application/rss+xml; charset=utf-8",
+                               {"ETag": etag, "Last-Modified": server.last_modified})
+                    return
+
+                if path.startswith(LISTING_PATH + "/"):
+                    slug = path.rsplit("/", 1)[-1]
+                    try:
+                        index = int(slug.rsplit("-", 1)[-1])
+                    except ValueError:
+                        index = int(hashlib.md5(slug.encode("utf-8")).hexdigest(), 16)
+                    body = server.details[index % len(server.details)]
+                    etag = '"' + hashlib.sha1(body + slug.encode("utf-8")).hexdigest() + '"'
+                    if self.headers.get("If-None-Match") == etag:
+                        server._count("not_modified")
+                        self._send(304, b"", "text/html; charset=utf-8", {"ETag": etag})
+                        return
+                    server._count("detail", len(body))
+                    self._send(200, body, "text/html; charset=utf-8",
+                               {"ETag": etag, "Last-Modified": server.last_modified})
+                    return
+
+                # 이미지/CSS/스크립트 등은 빈 응답
+                self._send(404, b"", "text/plain")
+
+        return Handler
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="FDA 리콜 사이트 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--records", type=int, default=200, help="목록 테이블 전체 행 수")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="요청당 지연시간(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="지연시간 편차(±ms)")
+    args = parser.parse_args(argv)
+
+    server = FDAStubServer(args.records, args.latency_ms, args.jitter_ms, args.host, args.port)
+    print(f"FDA 대역 서버 실행 중: {server.url} (FDA_BASE_URL로 지정, Ctrl+C로 종료)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# components/dev_panel.py
+
+import os
+import streamlit as st
+import pandas as pd
+from utils.instrumentation import (
+    get_span_summary, get_recent_spans, reset_spans, render_prometheus
+)
+from utils.llm_gateway import get_gateway
+
+def is_dev_panel_enabled() -> bool:
+    """
+    DEV_PANEL=1 환경 변수로만 개발자 패널 활성화
+    패널은 전체 사용자의 스팬/게이트웨이 지표를 보여주고 집계를 초기화할 수 있으므로 방문자가 URL로 켤 수 없게 함
+    """
+    return os.getenv("DEV_PANEL", "0") == "1"
+
+def show_dev_panel():
+    """노드/LLM/Chroma 구간별 실행 시간 및 토큰 요약 패널"""
+    with st.expander("🛠️ 개발자 패널 - 구간별 성능 지표", expanded=False):
+        summary = get_span_summary()
+        if not summary:
+            st.info("아직 기록된 스팬이 없습니다. 챗봇에 질문하면 구간별 지표가 표시됩니다.")
+            return
+
+        kinds = sorted({item["kind"] for item in summary})
+        selected_kinds = st.multiselect("구간 종류", kinds, default=kinds, key="dev_panel_kinds")
+
+        summary_df = pd.DataFrame([item for item in summary if item["kind"] in selected_kinds])
+        st.markdown("##### 구간별 집계 (누적 시간 순)")
+        st.dataframe(summary_df, use_container_width=True, hide_index=True)
+
+        # 질문 1건(파이프라인) 대비 각 노드가 차지하는 비중
+        pipelines = [item for item in summary if item["kind"] == "pipeline"]
+        nodes = [item for item in summary if item["kind"] == "node"]
+        if pipelines and nodes:
+            st.markdown("##### 노드별 평균 실행 시간 (ms)")
+            node_df = pd.DataFrame(nodes).set_index("name")[["avg_ms", "p95_ms"]]
+            st.bar_chart(node_df)
+
+        st.markdown("##### 최근 스팬")
+        recent_df = pd.DataFrame([
+            {
+                "start": span.get("start", ""),
+                "name": span["name"],
+                "kind": span["kind"],
+                "duration_ms": span.get("duration_ms"),
+                "tokens_in": span["tokens_in"],
+                "tokens_out": span["tokens_out"],
+                "result_size": span["result_size"],
+                "status": span.get("status", ""),
+                "trace_id": span["trace_id"][:8],
+            }
+            for span in get_recent_spans(limit=100)
+        ])
+        st.dataframe(recent_df, use_container_width=True, hide_index=True)
+
+        st.markdown("##### 모델별 게이트웨이 지표")
+        gateway_metrics = get_gateway().get_metrics()
+        if gateway_metrics:
+            st.dataframe(pd.DataFrame(gateway_metrics).T, use_container_width=True)
+
+        breaker = get_gateway().breaker.snapshot()
+        st.caption(
+            f"🔌 OpenAI 서킷 브레이커: {breaker['state']} "
+            f"(최근 {breaker['window_calls']}건 중 실패 {breaker['window_failures']}건, "
+            f"open 전환 {breaker['opened']}회, 즉시 실패 {breaker['rejected']}건)"
+        )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                "📥 Prometheus 지표 다운로드",
+                data=render_prometheus(),
+                file_name="metrics.prom",
+                mime="text/plain",
+                use_container_width=True,
+            )
+        with col2:
+            if st.button("🗑️ 집계 초기화", use_container_width=True, key="dev_panel_reset"):
+                reset_spans()
+                st.rerun()
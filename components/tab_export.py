@@ -7,8 +7,7 @@ import json
 import shutil
 import pandas as pd
 import json
-from langchain_openai import ChatOpenAI
-from langchain.schema import HumanMessage
+from utils.report_summarizer import split_qa_pairs, summarize_qa_pairs
 import os
 from functools import lru_cache
 from openpyxl import load_workbook
@@ -286,12 +285,12 @@ def process_qa_analysis(selected_project):
             st.warning("⚠️ 불러올 대화 기록이 없습니다. 먼저 채팅 탭에서 대화를 진행해주세요.")
             return
         
-        # Q&A 텍스트 생성
-        qa_text = generate_qa_text(chat_history)
+        # Q&A 쌍 생성
+        qa_pairs = split_qa_pairs(chat_history)
         
-        if qa_text:
+        if qa_pairs:
             # AI 분석 수행
-            perform_ai_analysis(qa_text, selected_project)
+            perform_ai_analysis(qa_pairs, selected_project)
         
     except Exception as e:
         st.error(f"❌ 분석 처리 중 오류: {e}")
@@ -299,49 +298,11 @@ def process_qa_analysis(selected_project):
         st.session_state.ai_processing = False
         st.rerun()
 
-def generate_qa_text(chat_history):
-    """채팅 히스토리에서 Q&A 텍스트 생성"""
-    qa_text = ""
-    for i in range(0, len(chat_history), 2):
-        if i + 1 < len(chat_history):
-            question = chat_history[i]["content"]
-            answer = chat_history[i + 1]["content"]
-            qa_text += f"질문: {question}\n답변: {answer}\n\n"
-    return qa_text
-
 @st.cache_data(ttl=1800)  # 30분 캐시
-def perform_ai_analysis_cached(qa_text, openai_api_key):
-    """AI 분석 수행 - 캐시 적용"""
+def perform_ai_analysis_cached(qa_pairs, openai_api_key):
+    """AI 분석 수행 - 캐시 적용 (Q&A 청크별 병렬 요약 후 병합, 청크 요약은 내용 해시로 디스크 캐시)"""
     try:
-        llm = ChatOpenAI(
-            model="gpt-4o-mini", 
-            temperature=0.3,
-            openai_api_key=openai_api_key
-        )
-        
-        # 통합 분석 프롬프트 (단일 요청으로 최적화)
-        analysis_prompt = f"""
-다음 Q&A 대화들을 분석하여 규제 및 리콜사례 관련 내용을 요약해주세요.
-
-분석 요구사항:
-1. 규제 관련 내용 (FDA 규정, 법령, 허가, 등록, 라벨링 등)
-2. 리콜사례 관련 내용 (제품 리콜, 회수, 안전 경고 등)
-
-각 카테고리별로 3-4문장으로 핵심 내용을 요약하고, 해당 내용이 없는 경우 "관련 내용 없음"으로 표시해주세요.
-
-응답 형식:
-📋 **규제 관련 요약**
-[규제 관련 요약 내용]
-
-🚨 **리콜사례 요약**
-[리콜사례 관련 요약 내용]
-
-Q&A 내용:
-{qa_text}
-"""
-        
-        response = llm.invoke([HumanMessage(content=analysis_prompt)])
-        final_summary = response.content.strip()
+        final_summary = summarize_qa_pairs(list(qa_pairs), openai_api_key=openai_api_key)
         
         # URL 및 불필요한 내용 제거
         import re
@@ -353,7 +314,7 @@ Q&A 내용:
     except Exception as e:
         return f"AI 분석 실패: {str(e)}"
 
-def perform_ai_analysis(qa_text, selected_project):
+def perform_ai_analysis(qa_pairs, selected_project):
     """AI 분석 수행"""
     with st.spinner("🤖 AI가 대화 내용을 통합 분석하고 있습니다..."):
         try:
@@ -363,7 +324,7 @@ def perform_ai_analysis(qa_text, selected_project):
                 return
             
             # 캐시된 AI 분석 수행
-            final_summary = perform_ai_analysis_cached(qa_text, openai_api_key)
+            final_summary = perform_ai_analysis_cached(tuple(qa_pairs), openai_api_key)
             st.session_state.summary_content = final_summary
             
             # 성공 메시지
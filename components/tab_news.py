@@ -1,11 +1,16 @@
 # components/news.py
 
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
 import re
 import os
 from dotenv import load_dotenv
+from utils.llm_gateway import chat_completion, openai_client
+from utils.http_cache import cached_get
+from utils.html_parsing import make_soup, SoupStrainer
+
+# 목록/기사 페이지에서 실제로 읽는 부분만 파싱
+_LIST_BLOCK_STRAINER = SoupStrainer(class_="list-block")
+_FIGURE_STRAINER = SoupStrainer("figure")
 
 def fetch_articles_with_keyword(keyword=None, max_pages=5, max_articles=3):
     base_url = "https://www.thinkfood.co.kr/news/articleList.html?sc_section_code=S1N2&view_type=sm"
@@ -13,11 +18,12 @@ def fetch_articles_with_keyword(keyword=None, max_pages=5, max_articles=3):
 
     for page in range(1, max_pages + 1):
         url = f"{base_url}&page={page}"
-        res = requests.get(url)
+        # 목록 페이지는 자주 바뀌므로 10분만 로컬 캐시 사용 후 재검증
+        res = cached_get(url, max_age=600)
         if res.status_code != 200:
             continue
 
-        soup = BeautifulSoup(res.text, "html.parser")
+        soup = make_soup(res.text, only=_LIST_BLOCK_STRAINER)
         articles = soup.select(".list-block")
 
         for article in articles:
@@ -44,8 +50,8 @@ def fetch_articles_with_keyword(keyword=None, max_pages=5, max_articles=3):
             # 기사 본문에서 이미지 가져오기
             img_url = None
             try:
-                res_detail = requests.get(link)
-                soup_detail = BeautifulSoup(res_detail.text, "html.parser")
+                res_detail = cached_get(link)
+                soup_detail = make_soup(res_detail.text, only=_FIGURE_STRAINER)
                 img_tag = soup_detail.select_one("figure img")
                 if img_tag and "src" in img_tag.attrs:
                     src = img_tag["src"]
@@ -66,9 +72,9 @@ def fetch_articles_with_keyword(keyword=None, max_pages=5, max_articles=3):
 def fetch_full_article_content(url):
     """기사 URL에서 전체 본문 내용을 가져오는 함수"""
     try:
-        res = requests.get(url)
+        res = cached_get(url)
         res.raise_for_status()
-        soup = BeautifulSoup(res.text, "html.parser")
+        soup = make_soup(res.text)
         
         # 기사 본문 추출
         content = ""
@@ -119,10 +125,6 @@ def fetch_full_article_content(url):
 def summarize_with_openai(content, openai_api_key):
     """OpenAI API를 사용하여 미국 식품 시장 기사 요약"""
     try:
-        from openai import OpenAI
-
-        client = OpenAI(api_key=openai_api_key)
-
         prompt = f"""
         다음은 최근 미국 식품 시장 관련 뉴스 기사들의 본문입니다.
 
@@ -156,7 +158,8 @@ def summarize_with_openai(content, openai_api_key):
             "사례를 구체적으로 인용하고, 전략 제안은 현실적이어야 합니다."
         )
 
-        response = client.chat.completions.create(
+        response = chat_completion(
+            client=openai_client(openai_api_key),
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": system_msg},
@@ -212,3 +212,11 @@ elif st.session_state.active_tab == 'summary':
         st.error("내보내기 도우미 모듈을 불러올 수 없습니다.")
     except Exception as e:
         st.error(f"내보내기 도우미 로딩 중 오류 발생: {str(e)}")
+
+# 개발자 패널 (DEV_PANEL=1 환경 변수로만 활성화)
+try:
+    from components.dev_panel import is_dev_panel_enabled, show_dev_panel
+    if is_dev_panel_enabled():
+        show_dev_panel()
+except Exception as e:
+    st.error(f"개발자 패널 로딩 중 오류 발생: {str(e)}")
@@ -0,0 +1,200 @@
+# utils/browser_pool.py
+"""
+헤드리스 Chrome 드라이버 풀 (Selenium 대체 경로용)
+- 드라이버를 크롤링마다 새로 띄우지 않고 반납받아 재사용 (warm 상태 유지)
+- 대여 시 상태 확인(health check) → 응답 없는 드라이버는 폐기 후 새로 생성
+- 드라이버당 N페이지 이동 후 재생성해 메모리 증가 억제
+- 이미지/폰트/CSS 요청은 CDP(Network.setBlockedURLs)로 네트워크 단계에서 차단
+- 고정 time.sleep 대신 document.readyState / 요소 상태 기반 대기
+
+환경 변수
+- BROWSER_POOL_SIZE: 최대 동시 드라이버 수 (기본 1)
+- BROWSER_MAX_PAGES: 드라이버 재생성 전 최대 페이지 이동 수 (기본 50)
+- BROWSER_IDLE_SECONDS: 이 시간 이상 쉬고 있던 드라이버는 재생성 (기본 600)
+- BROWSER_BLOCK_RESOURCES: "0"이면 리소스 차단 비활성화 (기본 "1")
+"""
+import atexit
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+    from webdriver_manager.chrome import ChromeDriverManager
+    SELENIUM_AVAILABLE = True
+except ImportError:
+    SELENIUM_AVAILABLE = False
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "1"))
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "50"))
+BROWSER_IDLE_SECONDS = float(os.getenv("BROWSER_IDLE_SECONDS", "600"))
+BROWSER_BLOCK_RESOURCES = os.getenv("BROWSER_BLOCK_RESOURCES", "1") != "0"
+
+# 네트워크 단계에서 차단할 리소스 (텍스트/스크립트만 로드)
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.css", "*.mp4", "*.webm",
+]
+
+@lru_cache(maxsize=1)
+def _driver_path() -> str:
+    """chromedriver 설치/경로 조회는 프로세스당 1회"""
+    return ChromeDriverManager().install()
+
+def _chrome_options():
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless=new')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-logging')
+    options.add_argument('--log-level=3')
+    options.add_argument('--silent')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    options.add_experimental_option('useAutomationExtension', False)
+    # DOMContentLoaded 시점에 get() 반환 - 이후 필요한 요소만 명시적으로 대기
+    options.page_load_strategy = 'eager'
+    return options
+
+def wait_ready(driver, timeout: float = 15) -> bool:
+    """document.readyState가 interactive/complete가 될 때까지 대기"""
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script("return document.readyState") in ("interactive", "complete")
+        )
+        return True
+    except TimeoutException:
+        return False
+
+def wait_stale(driver, element, timeout: float = 10) -> bool:
+    """기존 요소가 DOM에서 교체될 때까지 대기 (테이블 재렌더링 감지용)"""
+    if element is None:
+        return False
+    try:
+        WebDriverWait(driver, timeout).until(EC.staleness_of(element))
+        return True
+    except TimeoutException:
+        return False
+
+class BrowserPool:
+    """상태 확인 + 재사용 + 주기적 재생성을 지원하는 드라이버 풀"""
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE, max_pages: int = BROWSER_MAX_PAGES,
+                 idle_seconds: float = BROWSER_IDLE_SECONDS, block_resources: bool = BROWSER_BLOCK_RESOURCES):
+        self.max_pages = max_pages
+        self.idle_seconds = idle_seconds
+        self.block_resources = block_resources
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()  # _idle / _pages / stats 보호 (여러 세션이 동시에 대여/반납)
+        self._idle: List[Tuple[object, float]] = []  # (드라이버, 반납 시각)
+        self._pages: Dict[int, int] = {}
+        self.stats = {"created": 0, "reused": 0, "recycled": 0, "unhealthy": 0}
+
+    def _create(self):
+        driver = webdriver.Chrome(service=Service(_driver_path()), options=_chrome_options())
+        if self.block_resources:
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+            except Exception as e:
+                print(f"⚠️ 리소스 차단 설정 실패: {e}")
+        with self._lock:
+            self._pages[id(driver)] = 0
+            self.stats["created"] += 1
+        return driver
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _quit(self, driver) -> None:
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"드라이버 종료 중 오류: {e}")
+
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except WebDriverException:
+            return False
+
+    def acquire(self, timeout: Optional[float] = None):
+        """드라이버 대여 - 쉬고 있는 드라이버를 상태 확인 후 재사용, 없으면 생성"""
+        if not SELENIUM_AVAILABLE:
+            raise RuntimeError("selenium이 설치되어 있지 않습니다")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("사용 가능한 브라우저가 없습니다")
+        try:
+            while True:
+                with self._lock:
+                    if not self._idle:
+                        break
+                    driver, released_at = self._idle.pop()
+                if time.monotonic() - released_at > self.idle_seconds:
+                    self._count("recycled")
+                    self._quit(driver)
+                elif self._is_healthy(driver):
+                    self._count("reused")
+                    return driver
+                else:
+                    self._count("unhealthy")
+                    self._quit(driver)
+            return self._create()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, driver, broken: bool = False) -> None:
+        """드라이버 반납 - 고장났거나 페이지 이동 상한을 넘었으면 폐기"""
+        try:
+            with self._lock:
+                pages = self._pages.get(id(driver), 0)
+            if broken:
+                self._count("unhealthy")
+                self._quit(driver)
+            elif pages >= self.max_pages:
+                self._count("recycled")
+                self._quit(driver)
+            else:
+                with self._lock:
+                    self._idle.append((driver, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def navigate(self, driver, url: str, ready_timeout: float = 15) -> bool:
+        """페이지 이동 + 문서 준비 대기 (페이지 수 집계)"""
+        driver.get(url)
+        with self._lock:
+            self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+        return wait_ready(driver, ready_timeout)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver, _ in idle:
+            self._quit(driver)
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+def get_browser_pool() -> BrowserPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool()
+                atexit.register(_pool.shutdown)
+    return _pool
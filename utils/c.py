@@ -7,11 +7,12 @@ import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import re
-from bs4 import BeautifulSoup
-import openai
 from datetime import timedelta
 import os
 import streamlit as st
+from utils.llm_gateway import chat_completion, openai_client
+from utils.http_cache import cached_get
+from utils.html_parsing import make_soup
 
 openai_api_key = st.secrets["OPENAI_API_KEY"]
 
@@ -38,6 +39,10 @@ TRANSLATE_CONTENT = True  # False로 설정하면 번역하지 않음
 MAX_CONTENT_LENGTH = 10000  # 번역할 최대 내용 길이 (문자 수)
 TRANSLATION_CHUNK_SIZE = 2500  # 번역 청크 크기
 
+# 동시 처리 설정 (실제 호출 속도는 llm_gateway의 모델별 쿼터가 제한)
+PART_WORKERS = 4  # 동시에 처리할 Part 수
+TRANSLATION_WORKERS = 4  # Part 하나에서 동시에 번역할 청크 수
+
 def translate_to_korean(text, max_retries=3):
     """OpenAI API를 사용하여 영어 텍스트를 한글로 번역"""
     if not text or len(text.strip()) == 0:
@@ -71,51 +76,42 @@ def translate_to_korean(text, max_retries=3):
         chunks.append(chunk)
         start = end
     
-    # 각 청크를 번역
-    translated_chunks = []
+    # 각 청크를 병렬 번역 (레이트 리밋은 게이트웨이가 처리, 순서는 유지)
     total_chunks = len(chunks)
+    logger.info(f"번역 중... 청크 {total_chunks}개 (총 길이: {len(text)}자)")
     
-    for i, chunk in enumerate(chunks):
-        logger.info(f"번역 중... 청크 {i+1}/{total_chunks} (길이: {len(chunk)}자)")
-        translated_chunk = _translate_chunk(chunk, max_retries)
-        translated_chunks.append(translated_chunk)
-        
-        # API 호출 간 잠시 대기 (레이트 리밋 방지)
-        if i < len(chunks) - 1:
-            time.sleep(2)  # 2초 대기
+    with ThreadPoolExecutor(max_workers=TRANSLATION_WORKERS) as executor:
+        translated_chunks = list(executor.map(lambda chunk: _translate_chunk(chunk, max_retries), chunks))
     
     return ''.join(translated_chunks)
 
 def _translate_chunk(text, max_retries=3):
-    """단일 텍스트 청크를 번역"""
-    for attempt in range(max_retries):
-        try:
-            response = openai.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "당신은 전문 번역가입니다. 미국 연방 규정(CFR)의 영어 텍스트를 정확하고 자연스러운 한국어로 번역해주세요. 법률 및 규제 용어는 정확하게 번역하되, 한국어로 읽기 쉽게 번역해주세요. 원본의 구조와 형식을 최대한 유지해주세요."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"다음 텍스트를 한국어로 번역해주세요:\n\n{text}"
-                    }
-                ],
-                max_tokens=4000,
-                temperature=0.3
-            )
-            
-            translated_text = response.choices[0].message.content.strip()
-            return translated_text
-            
-        except Exception as e:
-            logger.warning(f"번역 시도 {attempt + 1}/{max_retries} 실패: {str(e)}")
-            if attempt < max_retries - 1:
-                time.sleep(5 * (attempt + 1))  # 점진적으로 대기 시간 증가
-            else:
-                logger.error(f"번역 실패, 원본 텍스트 반환: {str(e)}")
-                return text  # 번역 실패 시 원본 반환
+    """단일 텍스트 청크를 번역 (재시도/백오프는 llm_gateway가 담당)"""
+    try:
+        response = chat_completion(
+            client=openai_client(openai_api_key),
+            max_retries=max_retries,
+            model="gpt-4o-mini",
+            messages=[
+                {
+                    "role": "system",
+                    "content": "당신은 전문 번역가입니다. 미국 연방 규정(CFR)의 영어 텍스트를 정확하고 자연스러운 한국어로 번역해주세요. 법률 및 규제 용어는 정확하게 번역하되, 한국어로 읽기 쉽게 번역해주세요. 원본의 구조와 형식을 최대한 유지해주세요."
+                },
+                {
+                    "role": "user",
+                    "content": f"다음 텍스트를 한국어로 번역해주세요:\n\n{text}"
+                }
+            ],
+            max_tokens=4000,
+            temperature=0.3
+        )
+        
+        translated_text = response.choices[0].message.content.strip()
+        return translated_text
+        
+    except Exception as e:
+        logger.error(f"번역 실패, 원본 텍스트 반환: {str(e)}")
+        return text  # 번역 실패 시 원본 반환
 
 def get_date_one_month_ago():
     """정확히 한 달 전 날짜 반환"""
@@ -235,7 +231,7 @@ def get_recent_changes():
         # with open('ecfr_debug.html', 'w', encoding='utf-8') as f:
         #     f.write(response.text)
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response.text)
         changes = []
         
         # 페이지에 있는 모든 날짜 헤더 찾기 (다양한 클래스나 형식을 처리)
@@ -410,13 +406,14 @@ def get_part_data(subchapter_letter, part_num, url=None):
     
     while retry_count < max_retries:
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            # 변경 없는 파트 페이지는 조건부 GET(304) 또는 로컬 캐시로 재사용
+            response = cached_get(url, headers=headers, timeout=30)
             response.raise_for_status()
             
             # with open(f'debug_page_{part_num}.html', 'w', encoding='utf-8') as f:
             #     f.write(response.text)
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = make_soup(response.text)
             
             # 제목 추출
             title = ""
@@ -664,23 +661,22 @@ def summarize_korean_text(text, max_retries=3):
     규정 전문:
     {text}
     """
-    for attempt in range(max_retries):
-        try:
-            response = openai.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "당신은 한국어 요약 전문가입니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=700  # 1,000자 내외로 제한
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            if attempt < max_retries - 1:
-                time.sleep(2 * (attempt + 1))
-            else:
-                return "요약 실패"
+    try:
+        response = chat_completion(
+            client=openai_client(openai_api_key),
+            max_retries=max_retries,
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": "당신은 한국어 요약 전문가입니다."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=700  # 1,000자 내외로 제한
+        )
+        return response.choices[0].message.content.strip()
+    except Exception as e:
+        logger.error(f"요약 실패: {str(e)}")
+        return "요약 실패"
 
 
 def main():
@@ -703,17 +699,14 @@ def main():
     completed_tasks = 0
     all_data = []
     
-    # 번역 작업은 시간이 오래 걸리므로 배치 크기를 줄임
-    batch_size = 2  # 번역 때문에 더 작은 배치로 처리
-    batches = [recent_changes[i:i + batch_size] for i in range(0, len(recent_changes), batch_size)]
-    
-    for batch_index, batch in enumerate(batches):
-        logger.info(f"배치 {batch_index + 1}/{len(batches)} 처리 중...")
+    # Part 단위 병렬 처리 (API 레이트 리밋은 llm_gateway가 모델 쿼터에 맞춰 조절)
+    with ThreadPoolExecutor(max_workers=PART_WORKERS) as executor:
+        future_to_part = {executor.submit(process_part, part_info): part_info for part_info in recent_changes}
         
-        # 번역 작업은 순차 처리 (API 레이트 리밋 고려)
-        for part_info in batch:
+        for future in as_completed(future_to_part):
+            part_info = future_to_part[future]
             try:
-                part_data = process_part(part_info)
+                part_data = future.result()
                 # 성공적으로 처리된 경우에만 결과에 추가
                 if part_data is not None:
                     # 요청된 필드만 포함하여 최종 데이터 생성 (한글 번역 포함)
@@ -728,19 +721,14 @@ def main():
                     }
                     all_data.append(simplified_data)
                 
-                completed_tasks += 1
-                progress_percent = (completed_tasks / total_tasks) * 100
-                elapsed_time = time.time() - start_time
-                eta = (elapsed_time / completed_tasks) * (total_tasks - completed_tasks) if completed_tasks > 0 else 0
-                logger.info(f"진행 상황: {completed_tasks}/{total_tasks} ({progress_percent:.1f}%) 완료, ETA: {eta:.1f}초")
-                
             except Exception as e:
                 logger.error(f"Subchapter {part_info['subchapter']}, Part {part_info['part_number']} 결과 처리 중 오류: {str(e)}")
-        
-        # 배치 간 대기 (API 제한 고려하여 더 긴 대기)
-        if batch_index < len(batches) - 1:
-            logger.info(f"다음 배치 전 30초 대기... (API 레이트 리밋 고려)")
-            time.sleep(30)
+            
+            completed_tasks += 1
+            progress_percent = (completed_tasks / total_tasks) * 100
+            elapsed_time = time.time() - start_time
+            eta = (elapsed_time / completed_tasks) * (total_tasks - completed_tasks) if completed_tasks > 0 else 0
+            logger.info(f"진행 상황: {completed_tasks}/{total_tasks} ({progress_percent:.1f}%) 완료, ETA: {eta:.1f}초")
     
     # 결과가 없으면 종료
     if not all_data:
@@ -12,7 +12,7 @@ import os
 import glob
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 import threading
 from functools import lru_cache
 
@@ -52,7 +52,12 @@ def save_chat_history(project_name: str, chat_history: List, langchain_history:
             serialized_langchain = []
             if langchain_history:
                 for msg in langchain_history:
-                    msg_type = "HumanMessage" if isinstance(msg, HumanMessage) else "AIMessage"
+                    if isinstance(msg, HumanMessage):
+                        msg_type = "HumanMessage"
+                    elif isinstance(msg, SystemMessage):
+                        msg_type = "SystemMessage"  # 이전 대화 요약
+                    else:
+                        msg_type = "AIMessage"
                     serialized_langchain.append({
                         "type": msg_type, 
                         "content": msg.content
@@ -95,6 +100,8 @@ def _create_message_object(msg_type: str, content: str):
         return HumanMessage(content=content)
     elif msg_type == "AIMessage":
         return AIMessage(content=content)
+    elif msg_type == "SystemMessage":
+        return SystemMessage(content=content)
     return None
 
 def restore_langchain_history(langchain_data: List[Dict]) -> List:
@@ -1,60 +1,76 @@
 # utils/chat_recall.py - 핵심 기능만 남긴 버전
 
-import json
 import os
 from datetime import datetime, timedelta
-from typing import TypedDict, List, Dict, Any
+from typing import TypedDict, List, Dict, Any, Iterator, Optional, Tuple
 from dotenv import load_dotenv
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
+from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
-from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate
 from langchain_core.messages import AIMessage, HumanMessage
 from langgraph.graph import StateGraph, START, END
 from langchain_teddynote import logging
-from utils.fda_realtime_crawler import get_crawler, update_vectorstore_with_new_data,get_latest_date_from_vectorstore
+from utils.fda_realtime_crawler import (
+    get_crawler, ingest_recall_stream, get_latest_date_from_vectorstore, recall_document_id, content_hash,
+    index_recall_passages, search_recall_passages, RECALL_PASSAGE_INDEX, RECALL_PASSAGE_MIN_CHARS
+)
+from utils.recall_feed import iter_new_recalls
 from utils.google_crawler import search_and_extract_news, format_news_for_context
+from utils.llm_gateway import make_chat_model, invoke_llm, wrap_embeddings
+from utils.instrumentation import span, timed_call, timed_node
+from utils.diagnostics import diagnose, should_sample
+from utils.conversation_memory import apply_pending_compaction, has_marker, schedule_compaction
+from utils.translation_memory import get_translation_memory
+from utils.speculative_retrieval import submit
+from utils.deadline import (
+    CAPPED_NEWS, PARTIAL_CRAWL, PARTIAL_RELEVANCE, SKIPPED_CRAWL, SKIPPED_NEWS, SKIPPED_RELEVANCE,
+    can_afford, degrade, degraded_notice, expired, retry_budget, start_deadline
+)
+from utils.fallback import UNAVAILABLE_ANSWER, get_answer_cache, recall_table_answer, stale_answer
+from utils.stream_ingest import iter_json_array, ingest_documents
 
 load_dotenv()
 logging.langsmith("LLMPROJECT")
 
+# 실시간 크롤링 결과가 포함된 답변 표식 (세션당 1회 크롤링 판단용)
+REALTIME_MARKER = "⚡실시간:"
+
 class RecallState(TypedDict):
     """리콜 검색 시스템 상태"""
     question: str
     question_en: str  # 영어 번역된 질문
     recall_context: str
     recall_documents: List[Document]
+    relevant_count: int  # 관련성 검사를 통과한 문서 수 (검사를 생략한 문서는 관련으로 간주)
     final_answer: str
     chat_history: List[HumanMessage | AIMessage]
     news_context: str  # 구글 뉴스 컨텍스트 추가
     final_answer: str
     news_documents: List[Dict]  # 뉴스 문서들 추가
+    deadline: Optional[float]  # 응답 시간 예산 (절대 시각, None이면 제한 없음)
+    degraded: List[str]  # 시간 부족으로 생략/축소한 단계
 
-def load_recall_documents():
-    """이 코드는 FDA 리콜 JSON 데이터를 청크 없이 단일 문서로 변환합니다"""
-    recall_file = "fda_recall.json"
-    documents = []
+def iter_recall_documents(recall_file: str = "fda_recall.json") -> Iterator[Document]:
+    """이 코드는 FDA 리콜 JSON 데이터를 청크 없이 단일 문서로 변환합니다 (항목 단위 증분 파싱)"""
+    count = 0
     
     try:
-        with open(recall_file, "r", encoding="utf-8") as f:
-            recall_data = json.load(f)
-            
-            for item in recall_data:
-                if isinstance(item, dict) and item.get("document_type") == "recall":
-                    # 🆕 청크를 하나의 전체 내용으로 결합
-                    chunks = item.get("chunks", [])
-                    if not chunks:
-                        continue
-                    
-                    # 모든 청크를 하나로 합치기
-                    full_content = "\n\n".join(chunk for chunk in chunks if chunk and len(chunk.strip()) > 30)
-                    
-                    if not full_content or len(full_content.strip()) < 100:
-                        continue
-                    
-                    # 구조화된 컨텐츠 생성 (기존과 동일)
-                    structured_content = f"""
+        for item in iter_json_array(recall_file):
+            if isinstance(item, dict) and item.get("document_type") == "recall":
+                # 🆕 청크를 하나의 전체 내용으로 결합
+                chunks = item.get("chunks", [])
+                if not chunks:
+                    continue
+                
+                # 모든 청크를 하나로 합치기
+                full_content = "\n\n".join(chunk for chunk in chunks if chunk and len(chunk.strip()) > 30)
+                
+                if not full_content or len(full_content.strip()) < 100:
+                    continue
+                
+                # 구조화된 컨텐츠 생성 (기존과 동일)
+                structured_content = f"""
 제목: {item.get('title', '')}
 카테고리: {item.get('category', '')}
 등급: {item.get('class', 'Unclassified')}
@@ -63,31 +79,38 @@ def load_recall_documents():
 
 리콜 내용:
 {full_content}
-                    """.strip()
-                    
-                    metadata = {
-                        "document_type": "recall",
-                        "category": item.get("category", ""),
-                        "class": item.get("class", "Unclassified"),
-                        "title": item.get("title", ""),
-                        "url": item.get("url", ""),
-                        "effective_date": item.get("effective_date", ""),
-                        "source": "fda_recall_database"
-                        # 🆕 chunk_index 제거 - 더 이상 청크가 아님
-                    }
-                    
-                    doc = Document(page_content=structured_content, metadata=metadata)
-                    documents.append(doc)
+                """.strip()
+                
+                metadata = {
+                    "document_type": "recall",
+                    "category": item.get("category", ""),
+                    "class": item.get("class", "Unclassified"),
+                    "title": item.get("title", ""),
+                    "url": item.get("url", ""),
+                    "effective_date": item.get("effective_date", ""),
+                    "source": "fda_recall_database",
+                    "content_hash": content_hash(structured_content)
+                    # 🆕 chunk_index 제거 - 더 이상 청크가 아님
+                }
+                
+                count += 1
+                yield Document(page_content=structured_content, metadata=metadata)
         
-        print(f"리콜 데이터 로드 완료: {len(documents)}개 문서 (청크 제거)")
-        return documents
+        print(f"리콜 데이터 로드 완료: {count}개 문서 (청크 제거)")
         
     except FileNotFoundError:
         print(f"리콜 파일을 찾을 수 없습니다: {recall_file}")
-        return []
     except Exception as e:
-        print(f"리콜 데이터 로드 오류: {e}")
-        return []
+        print(f"리콜 데이터 로드 오류 ({count}개 문서 이후): {e}")
+
+def load_recall_documents():
+    """리콜 문서 전체 목록 (벡터스토어 생성은 iter_recall_documents로 스트리밍 적재)"""
+    return list(iter_recall_documents())
+
+def _recall_doc_id(doc: Document) -> str:
+    """실시간 크롤링과 같은 URL 기반 ID (URL이 없으면 내용 해시)"""
+    url = doc.metadata.get("url")
+    return recall_document_id(url) if url else "recall-" + doc.metadata["content_hash"]
 
 def initialize_recall_vectorstore():
     """이 코드는 리콜 전용 벡터스토어를 초기화하거나 기존 데이터를 로드합니다"""
@@ -97,7 +120,7 @@ def initialize_recall_vectorstore():
     if os.path.exists(persist_dir) and os.listdir(persist_dir):
         try:
             print("기존 리콜 벡터스토어를 로드합니다...")
-            embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+            embeddings = wrap_embeddings(OpenAIEmbeddings(model="text-embedding-3-small"))
             
             vectorstore = Chroma(
                 persist_directory=persist_dir,
@@ -113,24 +136,32 @@ def initialize_recall_vectorstore():
         except Exception as e:
             print(f"기존 리콜 벡터스토어 로드 실패: {e}")
     
-    # 새 벡터스토어 생성
+    # 새 벡터스토어 생성 (JSON 항목을 읽는 대로 배치 임베딩 → 적재)
     try:
         print("새 리콜 벡터스토어를 생성합니다...")
-        documents = load_recall_documents()
+        embeddings = wrap_embeddings(OpenAIEmbeddings(model="text-embedding-3-small"))
         
-        if not documents:
-            raise ValueError("로드된 리콜 문서가 없습니다.")
+        vectorstore = Chroma(
+            persist_directory=persist_dir,
+            embedding_function=embeddings,
+            collection_name="FDA_recalls"
+        )
         
-        embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+        def report(progress: Dict) -> None:
+            print(f"  리콜 문서 적재 중: {progress['inserted']}개 ({progress['rate']:.1f}개/초)")
         
-        vectorstore = Chroma.from_documents(
-            documents=documents,
-            embedding=embeddings,
-            collection_name="FDA_recalls",
-            persist_directory=persist_dir
+        # 문단 색인을 켠 경우 배치마다 긴 문서의 문단도 함께 적재 (새로 만드는 컬렉션이라 기존 문단 삭제 불필요)
+        after_batch = None
+        if RECALL_PASSAGE_INDEX:
+            after_batch = lambda ids, docs: index_recall_passages(vectorstore, docs, ids, replace=False)
+        
+        inserted = ingest_documents(
+            vectorstore, iter_recall_documents(), id_of=_recall_doc_id, progress=report, after_batch=after_batch
         )
+        if not inserted:
+            raise ValueError("로드된 리콜 문서가 없습니다.")
         
-        print(f"리콜 벡터스토어 생성 완료 ({len(documents)}개 문서)")
+        print(f"리콜 벡터스토어 생성 완료 ({inserted}개 문서)")
         return vectorstore
         
     except Exception as e:
@@ -144,11 +175,15 @@ except Exception as e:
     print(f"벡터스토어 초기화 실패: {e}")
     recall_vectorstore = None
 
+@timed_node("recall.translate")
 def translation_node(state: RecallState) -> RecallState:
     """조건부 번역 노드 - 고유명사 보존 번역"""
     
     will_use_vectorstore = recall_vectorstore is not None
     
+    # 🆕 검색용 키워드 추출을 번역과 동시에 시작 (LLM 왕복 1회를 임계 경로에서 제거)
+    keywords_future = submit(extract_search_keywords, state["question"])
+    
     if will_use_vectorstore:
         # 🆕 고유명사 보존 번역 수행
         question_en = translate_with_proper_nouns(state["question"])
@@ -157,8 +192,7 @@ def translation_node(state: RecallState) -> RecallState:
         question_en = state["question"]
         print(f"🔤 번역 생략 (웹 검색 전용): '{question_en}'")
     
-    # 🆕 검색용 키워드 추출
-    search_keywords = extract_search_keywords(state["question"])
+    search_keywords = keywords_future.result()
     
     return {
         **state,
@@ -167,19 +201,27 @@ def translation_node(state: RecallState) -> RecallState:
     }
 
 def translate_with_proper_nouns(korean_text: str) -> str:
-    """고유명사를 보존하면서 번역하는 개선된 함수"""
+    """고유명사를 보존하면서 번역하는 개선된 함수 (번역 메모리/브랜드 용어집 우선)"""
     try:
-        llm = ChatOpenAI(model_name="gpt-4o-mini", temperature=0.1)
-        
-        # 🆕 고유명사 보존 프롬프트
-        prompt = f"""
+        return get_translation_memory().translate("recall", korean_text, _llm_translate_with_proper_nouns)
+    except Exception as e:
+        print(f"고유명사 보존 번역 오류: {e}")
+        return korean_text
+
+def _llm_translate_with_proper_nouns(korean_text: str) -> str:
+    """LLM 고유명사 보존 번역 (용어집이 적용된 텍스트를 입력으로 받음)"""
+    llm = make_chat_model("gpt-4o-mini", temperature=0.1)
+    
+    # 🆕 고유명사 보존 프롬프트
+    prompt = f"""
 다음 한국어 텍스트를 영어로 번역하되, 제품명과 브랜드명은 원형을 유지하세요.
 
 번역 규칙:
 1. 제품명/브랜드명은 한국어 원형 유지 (예: 불닭볶음면 → Buldak)
 2. 일반적인 식품 카테고리만 영어로 번역 (예: 라면 → ramen, 과자 → snack)
 3. "리콜", "사례" 등은 영어로 번역
-4. 번역문만 반환하고 설명 없이
+4. 이미 영어로 된 단어는 그대로 유지
+5. 번역문만 반환하고 설명 없이
 
 예시:
 - "불닭볶음면의 리콜 사례" → "Buldak ramen recall case"
@@ -189,27 +231,23 @@ def translate_with_proper_nouns(korean_text: str) -> str:
 
 영어 번역:"""
 
-        response = llm.invoke([HumanMessage(content=prompt)])
-        translated = response.content.strip()
-        
-        # 🆕 번역 결과 검증 및 후처리
-        if translated and len(translated) > 0:
-            # 불필요한 따옴표나 설명 제거
-            translated = translated.replace('"', '').replace("'", "")
-            if translated.lower().startswith('translation:'):
-                translated = translated[12:].strip()
-            return translated
-        else:
-            return korean_text
-            
-    except Exception as e:
-        print(f"고유명사 보존 번역 오류: {e}")
+    response = invoke_llm(llm, [HumanMessage(content=prompt)])
+    translated = response.content.strip()
+    
+    # 🆕 번역 결과 검증 및 후처리
+    if translated and len(translated) > 0:
+        # 불필요한 따옴표나 설명 제거
+        translated = translated.replace('"', '').replace("'", "")
+        if translated.lower().startswith('translation:'):
+            translated = translated[12:].strip()
+        return translated
+    else:
         return korean_text
     
 def extract_search_keywords(question: str) -> str:
     """이 코드는 질문에서 뉴스 검색용 핵심 키워드를 추출합니다"""
     try:
-        llm = ChatOpenAI(model_name="gpt-4o-mini", temperature=0.1)
+        llm = make_chat_model("gpt-4o-mini", temperature=0.1)
         
         prompt = f"""
 다음 질문에서 뉴스 검색에 적합한 핵심 키워드만 추출하세요.
@@ -230,7 +268,7 @@ def extract_search_keywords(question: str) -> str:
 질문: {question}
 키워드:"""
 
-        response = llm.invoke([HumanMessage(content=prompt)])
+        response = invoke_llm(llm, [HumanMessage(content=prompt)])
         keywords = response.content.strip()
         
         # 후처리: 불필요한 따옴표나 설명 제거
@@ -276,6 +314,52 @@ def is_recall_related_question(question: str) -> bool:
     question_lower = question.lower()
     return any(keyword.lower() in question_lower for keyword in recall_keywords)
 
+def _doc_summary(doc: Document) -> Dict[str, str]:
+    """진단 로그용 문서 요약"""
+    return {
+        "date": doc.metadata.get('effective_date', 'N/A'),
+        "source": doc.metadata.get('source', ''),
+        "title": doc.metadata.get('title', '')[:50],
+        "url": doc.metadata.get('url', '')[-30:],
+    }
+
+def _latest_dated_entries(metadatas: List[Dict], limit: int = 5) -> List[Dict[str, str]]:
+    """진단 로그용 - 올해 발효일 기준 최신 리콜 목록"""
+    this_year = str(datetime.now().year)
+    latest = [
+        {
+            "date": metadata['effective_date'],
+            "source": metadata.get('source', ''),
+            "title": metadata.get('title', '')[:50],
+            "url": metadata.get('url', '')[-30:],
+        }
+        for metadata in metadatas
+        if metadata and str(metadata.get('effective_date', '')).startswith(this_year)
+    ]
+    latest.sort(key=lambda x: x['date'], reverse=True)
+    return latest[:limit]
+
+def _passage_level_content(doc: Document, query: str, k: int = 3) -> str:
+    """긴 리콜 문서 → 머리글(제목/날짜 등) + 질문과 관련된 문단 (문단이 없으면 원문 그대로)"""
+    url = doc.metadata.get("url")
+    if not url:
+        return doc.page_content
+    try:
+        passages = timed_call(
+            "chroma.recall.passages",
+            lambda: search_recall_passages(recall_vectorstore, query, parent_ids=[recall_document_id(url)], k=k)
+        )
+    except Exception as e:
+        print(f"문단 검색 실패: {e}")
+        return doc.page_content
+    if not passages:
+        return doc.page_content
+    passages.sort(key=lambda passage: passage.metadata.get("chunk_index", 0))
+    header = doc.page_content.split("리콜 내용:", 1)[0].strip()
+    body = "\n...\n".join(passage.page_content for passage in passages)
+    return f"{header}\n\n리콜 내용 (관련 문단):\n{body}"
+
+@timed_node("recall.recall_search")
 def recall_search_node(state: RecallState) -> RecallState:
     """이 코드는 벡터DB에서 리콜 관련 문서를 검색하고 실시간 크롤링을 조건부로 수행합니다"""
     
@@ -296,6 +380,10 @@ def recall_search_node(state: RecallState) -> RecallState:
             "recall_documents": []
         }
     
+    # 진단 모드 여부는 쿼리당 한 번만 결정
+    diag_enabled = should_sample()
+    degraded = state.get("degraded") or []
+
     try:
         # 실시간 크롤링 조건 체크 (첫 질문 + 최신 데이터 요청)
         chat_history = state.get("chat_history", [])
@@ -304,25 +392,33 @@ def recall_search_node(state: RecallState) -> RecallState:
         recent_keywords = ["최근", "recent", "latest", "new", "새로운", "요즘", "현재"]
         is_recent_query = any(keyword in state["question"].lower() for keyword in recent_keywords)
         
-        # 세션 내에서 이미 크롤링했는지 확인
-        has_crawled_in_session = False
-        for msg in chat_history:
-            if isinstance(msg, AIMessage) and "⚡실시간:" in msg.content:
-                has_crawled_in_session = True
-                break
+        # 세션 내에서 이미 크롤링했는지 확인 (요약으로 압축된 대화 포함)
+        has_crawled_in_session = has_marker(chat_history, REALTIME_MARKER)
         
         should_crawl = is_recent_query and not has_crawled_in_session
         
+        # 남은 시간이 부족하면 크롤링 없이 기존 벡터DB 데이터로 답변
+        if should_crawl and not can_afford(state.get("deadline"), "crawl"):
+            degraded = degrade(state, SKIPPED_CRAWL)
+            should_crawl = False
+        
         if should_crawl:
             print("🔍 첫 질문 + 최신 데이터 요청 - 실시간 크롤링 수행")
             try:     
                 crawler = get_crawler()
                 # 벡터DB의 최신 날짜 조회
-                latest_date_in_db = get_latest_date_from_vectorstore(recall_vectorstore)
-                new_recalls = crawler.crawl_latest_recalls(after_date=latest_date_in_db, vectorstore=recall_vectorstore)
+                latest_date_in_db = timed_call("chroma.recall.latest_date", lambda: get_latest_date_from_vectorstore(recall_vectorstore))
+                # 리콜 피드로 새 리콜 여부를 먼저 확인 (변경 없으면 요청 1건으로 끝남)
+                # 새 리콜의 상세 페이지를 병렬 수집하면서 완료되는 대로 벡터DB에 적재 (답변 생성 시간만 남으면 중단)
+                deadline = state.get("deadline")
+                added_count = ingest_recall_stream(
+                    iter_new_recalls(crawler, after_date=latest_date_in_db, deadline=deadline), recall_vectorstore,
+                    deadline=deadline,
+                )
+                if expired(deadline):
+                    degraded = degrade({**state, "degraded": degraded}, PARTIAL_CRAWL)
                 
-                if new_recalls:
-                    added_count = update_vectorstore_with_new_data(new_recalls, recall_vectorstore)
+                if added_count:
                     print(f"✅ 새 데이터 {added_count}건 추가됨")
                 else:
                     print("📋 새 리콜 데이터 없음")
@@ -330,34 +426,8 @@ def recall_search_node(state: RecallState) -> RecallState:
             except Exception as e:
                 print(f"⚠️ 실시간 크롤링 실패: {e}")
         
-        # 🆕 여기에 디버깅 코드 추가 (크롤링 직후)
-        all_data = recall_vectorstore.get()
-        metadatas = all_data.get('metadatas', [])
-        
-        # 최근 데이터 확인
-        latest_dates = []
-        for metadata in metadatas:
-            if metadata and metadata.get('effective_date'):
-                date_str = metadata['effective_date']
-                if date_str.startswith('2025'):  # 2025년 데이터만
-                    latest_dates.append({
-                        'date': date_str,
-                        'title': metadata.get('title', '')[:50],
-                        'source': metadata.get('source', ''),
-                        'url': metadata.get('url', '')[-30:]
-                    })
-        
-        # 날짜순 정렬해서 최신 5개 출력
-        latest_dates.sort(key=lambda x: x['date'], reverse=True)
-        print("\n🔍 벡터DB의 2025년 데이터 확인:")
-        for item in latest_dates[:5]:
-            print(f"  📅 {item['date']} | {item['source']} | {item['title']} | {item['url']}")
-        
-        # 📅 최신 데이터 우선 검색 (벡터 검색 우회)
-        print("📅 최신 데이터 우선 검색...")
-
-        # 전체 데이터 가져오기
-        all_data = recall_vectorstore.get()
+        # 전체 데이터 가져오기 (최신 데이터 우선 검색 - 벡터 검색 우회)
+        all_data = timed_call("chroma.recall.get_all", recall_vectorstore.get)
         all_documents = []
 
         for i, metadata in enumerate(all_data.get('metadatas', [])):
@@ -366,6 +436,10 @@ def recall_search_node(state: RecallState) -> RecallState:
                 doc = Document(page_content=content, metadata=metadata)
                 all_documents.append(doc)
 
+        # 진단 모드에서만 벡터DB 최신 데이터 현황 기록 (운영 쿼리는 계산하지 않음)
+        diagnose("recall_search", "vectorstore_latest", diag_enabled,
+                 latest=lambda: _latest_dated_entries(all_data.get('metadatas', [])))
+
         def get_date_for_sorting(doc):
             date_str = doc.metadata.get('effective_date', '1900-01-01')
             try:
@@ -386,45 +460,55 @@ def recall_search_node(state: RecallState) -> RecallState:
             
             unique_recalls = list(url_groups.values())
             unique_recalls.sort(key=get_date_for_sorting, reverse=True)
-            print(f"📊 URL 기준 중복 제거: {len(unique_recalls)}개")
+            sort_mode = "url_dedup"
         else:
             # 청크 없는 새 데이터 - 바로 날짜순 정렬
             unique_recalls = all_documents
             unique_recalls.sort(key=get_date_for_sorting, reverse=True)
-            print(f"📊 단일 문서 정렬: {len(unique_recalls)}개")
-
-        # 디버깅 출력
-        for i, doc in enumerate(unique_recalls[:10]):
-            date = doc.metadata.get('effective_date', 'N/A')
-            title = doc.metadata.get('title', '')[:50]
-            source = doc.metadata.get('source', '')
-            url_suffix = doc.metadata.get('url', '')[-30:]
-            print(f"  {i+1}. {date} | {source} | {title}... | {url_suffix}")
+            sort_mode = "single_document"
 
         # 상위 5개 선택
         selected_docs = unique_recalls[:5]
 
-        print(f"\n🎯 최종 selected_docs:")
-        for i, doc in enumerate(selected_docs):
-            date = doc.metadata.get('effective_date', 'N/A')
-            title = doc.metadata.get('title', '')[:50]
-            source = doc.metadata.get('source', '')
-            print(f"  {i+1}. {date} | {source} | {title}...")
+        diagnose("recall_search", "ranking", diag_enabled,
+                 sort_mode=sort_mode,
+                 candidates=len(unique_recalls),
+                 top10=lambda: [_doc_summary(doc) for doc in unique_recalls[:10]],
+                 selected=lambda: [_doc_summary(doc) for doc in selected_docs])
 
-        # 컨텍스트 생성
+        # 컨텍스트 생성 (문단 색인이 있으면 긴 공지문은 질문과 관련된 문단만 사용)
+        query = state.get("question_en") or state["question"]
         context_parts = []
         for doc in selected_docs:
-            content_with_meta = f"{doc.page_content}\nSource URL: {doc.metadata.get('url', 'N/A')}"
+            content = doc.page_content
+            if RECALL_PASSAGE_INDEX and len(content) >= RECALL_PASSAGE_MIN_CHARS:
+                content = _passage_level_content(doc, query)
+            content_with_meta = f"{content}\nSource URL: {doc.metadata.get('url', 'N/A')}"
             context_parts.append(content_with_meta)
 
         context = "\n\n---\n\n".join(context_parts)
         
         print(f"📊 검색 완료: 총 {len(selected_docs)}건")
         
+        # LLM 관련성 검사 (구글 뉴스 검색 여부 판단용) - 시간이 없으면 검색 결과를 그대로 사용
+        relevant_count = len(selected_docs)
+        if selected_docs:
+            if not can_afford(state.get("deadline"), "relevance"):
+                degraded = degrade({**state, "degraded": degraded}, SKIPPED_RELEVANCE)
+            else:
+                relevant_docs, checked_all = check_document_relevance(
+                    state["question"], selected_docs, deadline=state.get("deadline")
+                )
+                relevant_count = len(relevant_docs)
+                if not checked_all:
+                    degraded = degrade({**state, "degraded": degraded}, PARTIAL_RELEVANCE)
+        
         return {
             **state,
             "recall_context": context,
-            "recall_documents": selected_docs
+            "recall_documents": selected_docs,
+            "relevant_count": relevant_count,
+            "degraded": degraded
         }
         
     except Exception as e:
@@ -432,7 +516,9 @@ def recall_search_node(state: RecallState) -> RecallState:
         return {
             **state,
             "recall_context": "",
-            "recall_documents": []
+            "recall_documents": [],
+            "relevant_count": 0,
+            "degraded": degraded
         }
 
 #==============================================================
@@ -489,6 +575,7 @@ PROMPT_NEWS_ANSWER = """
 """
 #==============================================================
 
+@timed_node("recall.google_search")
 def google_news_search_node(state: RecallState) -> RecallState:
     """이 코드는 구글 뉴스에서 리콜 정보를 검색합니다"""
     
@@ -496,10 +583,26 @@ def google_news_search_node(state: RecallState) -> RecallState:
         # 🆕 뉴스 검색 전용 키워드 추출
         clean_keywords = extract_question_keywords(state["question"])  # "만두 리콜 사례" → "만두"
         
+        # 남은 시간에 따라 뉴스 건수 축소 또는 생략
+        deadline = state.get("deadline")
+        degraded = state.get("degraded") or []
+        if can_afford(deadline, "news"):
+            max_results = 3
+        elif can_afford(deadline, "news_minimal"):
+            max_results = 1
+            degraded = degrade(state, CAPPED_NEWS)
+        else:
+            return {
+                **state,
+                "news_context": "",
+                "news_documents": [],
+                "degraded": degrade(state, SKIPPED_NEWS)
+            }
+        
         print(f"📰 구글 뉴스 검색 시작: '{clean_keywords}' (원본: '{state['question']}')")
         
         # 뉴스 검색 및 본문 추출
-        news_results = search_and_extract_news(clean_keywords, max_results=3)
+        news_results = search_and_extract_news(clean_keywords, max_results=max_results)
         
         if news_results:
             # 뉴스 컨텍스트 생성
@@ -511,14 +614,16 @@ def google_news_search_node(state: RecallState) -> RecallState:
                 "recall_context": "",  # 🆕 FDA 컨텍스트 완전 제거
                 "recall_documents": [],  # 🆕 FDA 문서 완전 제거
                 "news_context": news_context,
-                "news_documents": news_results
+                "news_documents": news_results,
+                "degraded": degraded
             }
         else:
             print("❌ 관련 뉴스를 찾을 수 없습니다")
             return {
                 **state,
                 "news_context": "",
-                "news_documents": []
+                "news_documents": [],
+                "degraded": degraded
             }
             
     except Exception as e:
@@ -543,10 +648,9 @@ def should_use_google_news(state: RecallState) -> str:
     
     print(f"🔍 벡터DB 검색 결과: {recall_count}건")
     
-    # 🆕 유사도 기반 관련성 검사
+    # 🆕 유사도 기반 관련성 검사 결과 (recall_search_node에서 수행, 시간 부족으로 생략된 문서는 관련으로 간주)
     if recall_count > 0:
-        relevant_docs = check_document_relevance(state["question"], recall_docs)
-        relevant_count = len(relevant_docs)
+        relevant_count = state.get("relevant_count", recall_count)
         
         print(f"🎯 유사도 검사 후 관련 문서: {relevant_count}건")
         
@@ -561,10 +665,14 @@ def should_use_google_news(state: RecallState) -> str:
         print("📰 검색 결과 없음 - 구글 뉴스 검색 수행")
         return "google_search"
 
-def check_document_relevance(question: str, documents: List[Document]) -> List[Document]:
-    """이 코드는 검색된 문서와 질문의 관련성을 LLM으로 판단합니다"""
+def check_document_relevance(question: str, documents: List[Document],
+                             deadline: Optional[float] = None) -> Tuple[List[Document], bool]:
+    """
+    이 코드는 검색된 문서와 질문의 관련성을 LLM으로 판단합니다
+    반환: (관련 문서, 모든 문서를 검사했는지) - 답변 생성 시간만 남으면 남은 문서는 검사 없이 관련으로 포함
+    """
     try:
-        llm = ChatOpenAI(model_name="gpt-4o-mini", temperature=0.1)
+        llm = make_chat_model("gpt-4o-mini", temperature=0.1)
         
         # 질문에서 핵심 키워드 추출
         question_keywords = extract_question_keywords(question)
@@ -572,6 +680,10 @@ def check_document_relevance(question: str, documents: List[Document]) -> List[D
         relevant_docs = []
         
         for i, doc in enumerate(documents):
+            if expired(deadline):
+                print(f"⏱️ 응답 시간 제한 - 남은 {len(documents) - i}건은 관련성 검사 생략")
+                return relevant_docs + list(documents[i:]), False
+            
             title = doc.metadata.get('title', '')
             content_preview = doc.page_content[:500]
             
@@ -599,7 +711,7 @@ FDA 리콜 문서:
 답변: "관련" 또는 "무관" 중 하나만 반환하세요.
 """
             
-            response = llm.invoke([HumanMessage(content=relevance_prompt)])
+            response = invoke_llm(llm, [HumanMessage(content=relevance_prompt)], max_retries=retry_budget(deadline))
             relevance = response.content.strip().lower()
             
             if "관련" in relevance:
@@ -608,11 +720,11 @@ FDA 리콜 문서:
             else:
                 print(f"    ❌ 무관 문서 {i+1}: {title[:50]}...")
         
-        return relevant_docs
+        return relevant_docs, True
         
     except Exception as e:
         print(f"관련성 검사 오류: {e}")
-        return documents
+        return documents, True
 
 def extract_question_keywords(question: str) -> str:
     """이 코드는 질문에서 핵심 키워드를 간단 추출합니다"""
@@ -627,6 +739,7 @@ def extract_question_keywords(question: str) -> str:
     
     return " ".join(keywords[:3])
 
+@timed_node("recall.generate_answer")
 def answer_generation_node(state: RecallState) -> RecallState:
     """이 코드는 검색된 데이터를 바탕으로 적절한 답변을 생성합니다"""
     
@@ -636,12 +749,13 @@ def answer_generation_node(state: RecallState) -> RecallState:
     if not is_recall_question:
         # 일반 질문 처리
         try:
-            llm = ChatOpenAI(model_name="gpt-4o-mini", temperature=0.3)
+            llm = make_chat_model("gpt-4o-mini", temperature=0.3)
             prompt = PromptTemplate.from_template(PROMPT_GENERAL_QUESTION)
-            chain = prompt | llm | StrOutputParser()
             
-            answer = chain.invoke({"question": state["question"]})
+            answer = invoke_llm(llm, prompt.format(question=state["question"]),
+                                max_retries=retry_budget(state.get("deadline"))).content
             final_answer = f"{answer}\n\n💡 일반 질문으로 처리됨"
+            get_answer_cache().remember("recall_general", state["question"], final_answer)
             
             return {
                 **state,
@@ -649,14 +763,16 @@ def answer_generation_node(state: RecallState) -> RecallState:
             }
             
         except Exception as e:
+            # LLM 장애 시 이전 답변 → 안내 문구 순으로 대체 (예외 원문은 로그에만 남김)
+            print(f"⚠️ 일반 질문 답변 실패 - 대체 응답 사용: {e}")
             return {
                 **state,
-                "final_answer": f"일반 질문 처리 중 오류: {e}"
+                "final_answer": stale_answer("recall_general", state["question"]) or UNAVAILABLE_ANSWER
             }
     
     # 리콜 관련 질문 처리
     try:
-        llm = ChatOpenAI(model_name="gpt-4o-mini", temperature=0.1)
+        llm = make_chat_model("gpt-4o-mini", temperature=0.1)
         
         # 🆕 컨텍스트 결정 (FDA vs 뉴스)
         recall_context = state.get("recall_context", "")
@@ -680,16 +796,14 @@ def answer_generation_node(state: RecallState) -> RecallState:
         else:
             return {
                 **state,
-                "final_answer": "현재 데이터 기준으로 해당 리콜 사례를 확인할 수 없습니다."
+                "final_answer": f"현재 데이터 기준으로 해당 리콜 사례를 확인할 수 없습니다.{degraded_notice(state.get('degraded'))}"
             }
         
-        chain = prompt | llm | StrOutputParser()
-        
-        answer = chain.invoke({
-            "question": state["question"],
-            "recall_context": context if recall_context else "",
-            "news_context": context if news_context else ""
-        })
+        answer = invoke_llm(llm, prompt.format(
+            question=state["question"],
+            recall_context=context if recall_context else "",
+            news_context=context if news_context else ""
+        ), max_retries=retry_budget(state.get("deadline"))).content
         
         # 🆕 검색 정보 추가
         search_info = f"\n\n📋 정보 출처: {source_type}"
@@ -701,13 +815,14 @@ def answer_generation_node(state: RecallState) -> RecallState:
                                    if doc.metadata.get("source") == "realtime_crawl"])
                 search_info += f" (총 {len(recall_docs)}건"
                 if realtime_count > 0:
-                    search_info += f", ⚡실시간: {realtime_count}건"
+                    search_info += f", {REALTIME_MARKER} {realtime_count}건"
                 search_info += ")"
         elif news_context:
             news_docs = state.get("news_documents", [])
             search_info += f" (뉴스 {len(news_docs)}건)"
         
-        final_answer = f"{answer}{search_info}"
+        final_answer = f"{answer}{search_info}{degraded_notice(state.get('degraded'))}"
+        get_answer_cache().remember("recall", state["question"], final_answer)
         
         return {
             **state,
@@ -715,11 +830,18 @@ def answer_generation_node(state: RecallState) -> RecallState:
         }
         
     except Exception as e:
+        # LLM 장애 시 이전 답변 → 검색된 리콜 메타데이터 표 → 안내 문구 순으로 대체
+        print(f"⚠️ 답변 생성 실패 - 대체 응답 사용: {e}")
+        recall_docs = state.get("recall_documents", [])
+        fallback_answer = stale_answer("recall", state["question"])
+        if fallback_answer is None and recall_docs:
+            fallback_answer = recall_table_answer(recall_docs)
         return {
             **state,
-            "final_answer": f"답변 생성 중 오류: {e}"
+            "final_answer": fallback_answer or UNAVAILABLE_ANSWER
         }
 
+@timed_node("recall.update_history")
 def update_history_node(state: RecallState) -> RecallState:
     """이 코드는 채팅 히스토리를 업데이트합니다"""
     try:
@@ -729,9 +851,8 @@ def update_history_node(state: RecallState) -> RecallState:
         updated_history.append(HumanMessage(content=state["question"]))
         updated_history.append(AIMessage(content=state["final_answer"]))
         
-        # 히스토리 길이 제한 (최대 8개 메시지)
-        if len(updated_history) > 8:
-            updated_history = updated_history[-8:]
+        # 히스토리 길이 제한 (최대 8개 메시지 + 토큰 상한) - 넘친 대화는 백그라운드에서 요약해 다음 질문에 반영
+        schedule_compaction(updated_history, max_messages=8, sticky_markers=[REALTIME_MARKER])
         
         return {
             **state,
@@ -769,30 +890,35 @@ recall_workflow.add_edge("update_history", END)
 # 그래프 컴파일
 recall_graph = recall_workflow.compile()
 
-def ask_recall_question(question: str, chat_history: List = None) -> Dict[str, Any]:
-    """이 코드는 리콜 질문을 처리하는 메인 함수입니다"""
-    if chat_history is None:
-        chat_history = []
+def ask_recall_question(question: str, chat_history: List = None, sla_seconds: Optional[float] = None) -> Dict[str, Any]:
+    """이 코드는 리콜 질문을 처리하는 메인 함수입니다 (sla_seconds: 응답 시간 목표, 기본 ANSWER_SLA_SECONDS)"""
+    # 지난 답변 후 백그라운드에서 끝난 대화 요약 반영
+    chat_history = apply_pending_compaction(chat_history)
     
     try:
-        result = recall_graph.invoke({
-            "question": question,
-            "question_en": "",  # 번역 노드에서 채워짐
-            "recall_context": "",
-            "recall_documents": [],
-            "final_answer": "",
-            "chat_history": chat_history
-        })
+        with span("pipeline.recall", kind="pipeline", question_chars=len(question), history_turns=len(chat_history)):
+            result = recall_graph.invoke({
+                "question": question,
+                "question_en": "",  # 번역 노드에서 채워짐
+                "recall_context": "",
+                "recall_documents": [],
+                "final_answer": "",
+                "chat_history": chat_history,
+                "deadline": start_deadline(sla_seconds),
+                "degraded": []
+            })
         
         return {
             "answer": result["final_answer"],
             "recall_documents": result["recall_documents"],
-            "chat_history": result["chat_history"]
+            "chat_history": result["chat_history"],
+            "degraded": result.get("degraded", [])
         }
         
     except Exception as e:
         return {
             "answer": f"처리 중 오류가 발생했습니다: {e}",
             "recall_documents": [],
-            "chat_history": chat_history
+            "chat_history": chat_history,
+            "degraded": []
         }
@@ -2,24 +2,34 @@
 
 import json
 import os
+import re
 from functools import wraps
-from typing import TypedDict, List, Dict, Any 
+from typing import TypedDict, List, Dict, Any, Optional, Tuple
 from chromadb.config import Settings
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI 
+from langchain_openai import OpenAIEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
-from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate 
 from langchain_core.messages import AIMessage, HumanMessage
 from langchain_community.chat_message_histories import ChatMessageHistory
 from langgraph.graph import StateGraph, START, END
 import streamlit as st
+from utils.llm_gateway import make_chat_model, invoke_llm, wrap_embeddings
+from utils.instrumentation import span, timed_call, timed_node
+from utils.conversation_memory import apply_pending_compaction, format_history_for_prompt, schedule_compaction
+from utils.translation_memory import get_translation_memory
+from utils.speculative_retrieval import (
+    SPECULATIVE_RETRIEVAL, is_good_enough, merge_documents, select_hits,
+    speculative_search, start_speculation
+)
+from utils.deadline import SKIPPED_SYNTHESIS, can_afford, degrade, degraded_notice, retry_budget, start_deadline
+from utils.fallback import UNAVAILABLE_ANSWER, get_answer_cache, regulation_excerpt_answer, stale_answer
 
 openai_api_key = st.secrets["OPENAI_API_KEY"]
 
-llm = ChatOpenAI(model_name="gpt-4o-mini", temperature=0.1, api_key=openai_api_key)
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small", api_key=openai_api_key)
+llm = make_chat_model("gpt-4o-mini", temperature=0.1, api_key=openai_api_key)
+embeddings = wrap_embeddings(OpenAIEmbeddings(model="text-embedding-3-small", api_key=openai_api_key))
 
 from langchain_teddynote import logging   # LangSmith 추적 활성화
 
@@ -40,13 +50,17 @@ CATEGORY_HIERARCHY = {
 }
 
 # 한국어-영어 번역 함수
+def _llm_translate_korean_to_english(korean_text: str) -> str:
+    """LLM 번역 (용어집이 적용된 텍스트를 입력으로 받음)"""
+    llm = make_chat_model("gpt-4o-mini", temperature=0, api_key=openai_api_key)
+    prompt = f"Translate the following Korean text to English. Keep English words as they are. Only return the translation without any explanation:\n\n{korean_text}"
+    response = invoke_llm(llm, [HumanMessage(content=prompt)])
+    return response.content.strip()
+
 def translate_korean_to_english(korean_text: str) -> str:
-    """한국어 텍스트를 영어로 번역"""
+    """한국어 텍스트를 영어로 번역 (번역 메모리/브랜드 용어집 우선)"""
     try:
-        llm = ChatOpenAI(model_name="gpt-4o-mini", temperature=0, api_key=openai_api_key)
-        prompt = f"Translate the following Korean text to English. Only return the translation without any explanation:\n\n{korean_text}"
-        response = llm.invoke([HumanMessage(content=prompt)])
-        return response.content.strip()
+        return get_translation_memory().translate("regulation", korean_text, _llm_translate_korean_to_english)
     except Exception as e:
         print(f"번역 중 오류 발생: {e}")
         return korean_text
@@ -62,7 +76,7 @@ def initialize_chromadb_collection():
                     persist_directory="./data/chroma_db"
                 )
 
-        embeddings = OpenAIEmbeddings(model="text-embedding-3-small", api_key=openai_api_key)
+        embeddings = wrap_embeddings(OpenAIEmbeddings(model="text-embedding-3-small", api_key=openai_api_key))
         vectorstore = Chroma(
             client=client,
             collection_name="chroma_regulations",
@@ -83,6 +97,13 @@ def initialize_chromadb_collection():
         print(f"❌ DuckDB 연결 중 오류 발생: {e}")
         raise
 
+# 전역 벡터스토어 초기화
+try:
+    vectorstore = initialize_chromadb_collection()
+except Exception as e:
+    print(f"규제 벡터스토어 초기화 실패: {e}")
+    vectorstore = None
+
 # 상태 정의
 class GraphState(TypedDict):
     question: str
@@ -95,44 +116,38 @@ class GraphState(TypedDict):
     answer: str
     need_synthesis: bool
     guidance_references: List[str]  # guidance에서 regulation 참조를 위한 필드
+    speculation: Any  # 백그라운드 번역 + 원문 추측 검색 (speculative_retrieval.Speculation)
+    deadline: Optional[float]  # 응답 시간 예산 (절대 시각, None이면 제한 없음)
+    degraded: List[str]  # 시간 부족으로 생략/축소한 단계
 
-# 노드 정의
-def router_node(state: GraphState) -> GraphState:
-    """초기 라우팅: guidance vs regulation 결정 + 번역"""
-    question = state["question"].lower()
-    
-    # 한국어 질문을 영어로 번역
-    try:
-        question_en = translate_korean_to_english(state["question"])
-        print(f"번역된 질문: {question_en}")
-    except Exception as e:
-        print(f"번역 실패: {e}")
-        question_en = state["question"]
-    
-    # regulation 키워드 체크
+def resolve_question_en(state: GraphState) -> str:
+    """영어 질문 반환 - 추측 모드에서는 필요한 시점에만 백그라운드 번역을 기다림"""
+    if state.get("question_en"):
+        return state["question_en"]
+    if state.get("speculation") is not None:
+        return state["speculation"].question_en()
+    return state["question"]
+
+def score_document_type(question: str, question_en: str) -> str:
+    """원문 + 영어 질문의 키워드 점수로 guidance / regulation 결정"""
     regulation_keywords = ["법률","규제", "21usc", "규정", "regulation", "법령", "조항", "cfr", "code of federal"]
     guidance_keywords = ["가이드", "guidance", "cpg", "지침", "guideline"]
     
-    combined_text = question + " " + question_en.lower()
+    combined_text = question.lower() + " " + question_en.lower()
     
     regulation_score = sum(1 for keyword in regulation_keywords if keyword in combined_text)
     guidance_score = sum(1 for keyword in guidance_keywords if keyword in combined_text)
     
     # 기본적으로 guidance 우선
-    document_type = "regulation" if regulation_score > guidance_score else "guidance"
-    
-    return {
-        **state,
-        "question_en": question_en,
-        "document_type": document_type,
-        "guidance_references": []
-    }
+    return "regulation" if regulation_score > guidance_score else "guidance"
 
-def category_node(state: GraphState) -> GraphState:
-    """카테고리별 세부 분류 - 복합 질문 처리"""
-    question = state["question"].lower()
-    question_en = state["question_en"].lower()
-    doc_type = state["document_type"]
+def score_categories(question: str, question_en: str, doc_type: str) -> Tuple[List[str], str, Dict[str, float]]:
+    """
+    카테고리별 세부 분류 - 복합 질문 처리
+    반환: (선택된 카테고리, 문서타입(복합 패턴이면 변경), 카테고리별 점수)
+    """
+    question = question.lower()
+    question_en = question_en.lower()
     
     # 키워드 점수 계산
     category_scores = {}
@@ -168,8 +183,7 @@ def category_node(state: GraphState) -> GraphState:
     selected_categories = []
     
     # 특별 패턴 감지
-    import re
-    combined_text = question + " " + question_en.lower()
+    combined_text = question + " " + question_en
     
     complex_patterns = [
         (r'알러지.*규제|allergen.*regulation', 'allergen', 'guidance'),
@@ -181,7 +195,7 @@ def category_node(state: GraphState) -> GraphState:
     for pattern, target_category, target_doc_type in complex_patterns:
         if re.search(pattern, combined_text, re.IGNORECASE):
             selected_categories = [target_category]
-            state["document_type"] = target_doc_type
+            doc_type = target_doc_type
             pattern_matched = True
             print(f"복합 질문 감지: '{target_category}' 카테고리, '{target_doc_type}' 문서타입으로 변경")
             break
@@ -197,24 +211,88 @@ def category_node(state: GraphState) -> GraphState:
     
     # 기본값 설정
     if not selected_categories:
-        selected_categories = ["main"] if state["document_type"] == "guidance" else ["usc", "ecfr"]
+        selected_categories = ["main"] if doc_type == "guidance" else ["usc", "ecfr"]
+    
+    return selected_categories, doc_type, category_scores
+
+# 노드 정의
+@timed_node("regulation.router")
+def router_node(state: GraphState) -> GraphState:
+    """초기 라우팅: guidance vs regulation 결정 + 번역"""
+    question = state["question"].lower()
+    speculation = None
+    
+    if SPECULATIVE_RETRIEVAL and vectorstore is not None:
+        # 추측 모드: 번역은 백그라운드로 돌리고 한국어 원문으로 바로 벡터 검색 시작
+        speculation = start_speculation(
+            state["question"],
+            translate_korean_to_english,
+            lambda q: speculative_search(vectorstore, q, ["guidance", "regulation"])
+        )
+        question_en = ""
+    else:
+        # 한국어 질문을 영어로 번역
+        try:
+            question_en = translate_korean_to_english(state["question"])
+            print(f"번역된 질문: {question_en}")
+        except Exception as e:
+            print(f"번역 실패: {e}")
+            question_en = state["question"]
+    
+    # 추측 모드에서는 한국어 원문만으로 임시 결정 - 검색 노드에서 번역 결과로 다시 계산
+    document_type = score_document_type(question, question_en)
+    
+    return {
+        **state,
+        "question_en": question_en,
+        "document_type": document_type,
+        "guidance_references": [],
+        "speculation": speculation
+    }
+
+@timed_node("regulation.category")
+def category_node(state: GraphState) -> GraphState:
+    """카테고리별 세부 분류 - 복합 질문 처리 (추측 모드에서는 원문 기준 임시 분류)"""
+    selected_categories, document_type, category_scores = score_categories(
+        state["question"], state["question_en"], state["document_type"]
+    )
     
     # 여러 카테고리가 선택되면 종합이 필요
     need_synthesis = len(selected_categories) > 1
     
-    print(f"선택된 카테고리: {selected_categories}, 문서타입: {state['document_type']}, 점수: {category_scores}")
+    print(f"선택된 카테고리: {selected_categories}, 문서타입: {document_type}, 점수: {category_scores}")
     
     return {
         **state,
+        "document_type": document_type,
         "categories": selected_categories,
         "need_synthesis": need_synthesis
     }
 
+@timed_node("regulation.retrieval")
 def document_retrieval_node(state: GraphState) -> GraphState:
     """ChromaDB에서 문서 검색 - guidance → regulation 참조 로직 포함"""
     all_documents = []
     guidance_references = []
-    search_query = state["question_en"]
+    speculation = state.get("speculation")
+    
+    if speculation is not None and not state.get("question_en"):
+        # 추측 모드: 원문 검색과 겹쳐 진행된 번역 결과로 문서타입/카테고리를 다시 계산
+        # (추측 검색은 guidance/regulation 모두 검색했으므로 바뀐 라우팅에도 그대로 사용)
+        question_en = resolve_question_en(state)
+        document_type = score_document_type(state["question"], question_en)
+        categories, document_type, _ = score_categories(state["question"], question_en, document_type)
+        if (document_type, categories) != (state["document_type"], state["categories"]):
+            print(f"번역 반영 라우팅 변경: {state['document_type']} {state['categories']} → {document_type} {categories}")
+        state = {
+            **state,
+            "question_en": question_en,
+            "document_type": document_type,
+            "categories": categories,
+            "need_synthesis": len(categories) > 1,
+        }
+    
+    speculative_hits = speculation.hits() if speculation is not None else []
     
     for category in state["categories"]:
         docs_found = False
@@ -228,12 +306,19 @@ def document_retrieval_node(state: GraphState) -> GraphState:
                 ]
             }
             
-            retriever = vectorstore.as_retriever(
-                search_kwargs={"k": 3, "filter": filter_dict}
-            )
-            
-            # 영어 질문으로 검색
-            docs = retriever.invoke(search_query)
+            # 원문 추측 검색 결과가 충분하면 번역을 기다리지 않고 사용
+            docs = select_hits(speculative_hits, {"document_type": state["document_type"], "category": category.lower()}, k=3)
+            if is_good_enough(docs):
+                print(f"카테고리 '{category.lower()}' 추측 검색 결과 사용 ({len(docs)}개)")
+            else:
+                retriever = vectorstore.as_retriever(
+                    search_kwargs={"k": 3, "filter": filter_dict}
+                )
+                
+                # 영어 질문으로 검색 후 추측 결과와 병합
+                search_query = resolve_question_en(state)
+                english_docs = timed_call("chroma.regulation.search", lambda: retriever.invoke(search_query), category=category)
+                docs = merge_documents(english_docs, docs, limit=3)
             
             if docs:
                 all_documents.extend(docs)
@@ -267,7 +352,8 @@ def document_retrieval_node(state: GraphState) -> GraphState:
             type_retriever = vectorstore.as_retriever(
                 search_kwargs={"k": 5, "filter": type_filter}
             )
-            all_documents = type_retriever.invoke(search_query)
+            search_query = resolve_question_en(state)
+            all_documents = timed_call("chroma.regulation.search", lambda: type_retriever.invoke(search_query), category="*")
             print(f"문서타입 검색에서 {len(all_documents)}개 문서 발견")
         except Exception as e:
             print(f"문서타입 검색도 실패: {e}")
@@ -277,7 +363,8 @@ def document_retrieval_node(state: GraphState) -> GraphState:
         print("검색된 문서가 없습니다. 전체 검색을 시도합니다.")
         try:
             general_retriever = vectorstore.as_retriever(search_kwargs={"k": 5})
-            all_documents = general_retriever.invoke(search_query)
+            search_query = resolve_question_en(state)
+            all_documents = timed_call("chroma.regulation.search", lambda: general_retriever.invoke(search_query), category="all")
             print(f"전체 검색에서 {len(all_documents)}개 문서 발견")
         except Exception as e:
             print(f"전체 검색도 실패: {e}")
@@ -313,11 +400,17 @@ def document_retrieval_node(state: GraphState) -> GraphState:
         "guidance_references": clean_references
     }
 
+@timed_node("regulation.synthesis")
 def synthesis_node(state: GraphState) -> GraphState:
     """guidance → regulation 단방향 참조를 통한 답변 품질 향상"""
     additional_context = ""
     additional_urls = []
     
+    # 남은 시간이 부족하면 추가 검색 없이 기존 컨텍스트로 답변
+    needs_extra_search = (state["document_type"] == "guidance" and state["guidance_references"]) or state["need_synthesis"]
+    if needs_extra_search and not can_afford(state.get("deadline"), "synthesis"):
+        return {**state, "degraded": degrade(state, SKIPPED_SYNTHESIS)}
+    
     # guidance 문서에서 regulation 참조가 있는 경우에만 실행
     if state["document_type"] == "guidance" and state["guidance_references"]:
         try:
@@ -358,7 +451,7 @@ def synthesis_node(state: GraphState) -> GraphState:
                     )
                     
                     # 참조 번호를 검색 쿼리로 사용
-                    reg_docs = reg_retriever.invoke(reference)
+                    reg_docs = timed_call("chroma.regulation.reference", lambda: reg_retriever.invoke(reference))
                     
                     if reg_docs:
                         ref_context = f"\n\n[{reference} 관련 규정]\n"
@@ -377,12 +470,12 @@ def synthesis_node(state: GraphState) -> GraphState:
             # 일반적인 관련 regulation 검색 (참조가 구체적이지 않은 경우)
             if not additional_context:
                 try:
-                    search_query = state["question_en"]
+                    search_query = resolve_question_en(state)
                     reg_filter = {"document_type": {"$eq": "regulation"}}
                     reg_retriever = vectorstore.as_retriever(
                         search_kwargs={"k": 2, "filter": reg_filter}
                     )
-                    reg_docs = reg_retriever.invoke(search_query)
+                    reg_docs = timed_call("chroma.regulation.reference", lambda: reg_retriever.invoke(search_query))
                     
                     if reg_docs:
                         additional_context = "\n\n[관련 규정 참조]\n"
@@ -399,12 +492,12 @@ def synthesis_node(state: GraphState) -> GraphState:
     # 종합이 필요한 경우 (여러 카테고리)
     elif state["need_synthesis"]:
         try:
-            search_query = state["question_en"]
+            search_query = resolve_question_en(state)
             cross_filter = {"document_type": {"$eq": state["document_type"]}}
             cross_retriever = vectorstore.as_retriever(
                 search_kwargs={"k": 2, "filter": cross_filter}
             )
-            cross_docs = cross_retriever.invoke(search_query)
+            cross_docs = timed_call("chroma.regulation.cross", lambda: cross_retriever.invoke(search_query))
             
             if cross_docs:
                 additional_context = "\n\n[추가 관련 정보]\n"
@@ -427,6 +520,7 @@ def synthesis_node(state: GraphState) -> GraphState:
     
     return state
 
+@timed_node("regulation.generate")
 def generate_answer(state: GraphState) -> GraphState:
     """답변 생성"""
     doc_info = f"문서 타입: {state['document_type']}, 카테고리: {', '.join(state['categories'])}"
@@ -435,11 +529,8 @@ def generate_answer(state: GraphState) -> GraphState:
     if state["guidance_references"]:
         doc_info += f", 참조된 regulation: {', '.join(state['guidance_references'])}"
     
-    # 채팅 히스토리 처리
-    chat_history_text = ""
-    if state.get("chat_history"):
-        recent_history = state["chat_history"][-4:]
-        chat_history_text = "\n".join([f"{msg.__class__.__name__}: {msg.content}" for msg in recent_history])
+    # 채팅 히스토리 처리 (이전 대화 요약 + 최근 대화 원문, 토큰 상한은 update_chat_history에서 유지)
+    chat_history_text = format_history_for_prompt(state.get("chat_history"))
     
     prompt = PromptTemplate.from_template(
         """당신은 미국 FDA 규제를 전문적으로 해석하는 규제 자문 전문가입니다.
@@ -468,15 +559,14 @@ def generate_answer(state: GraphState) -> GraphState:
     )
     
     try:
-        llm = ChatOpenAI(model_name="gpt-4o-mini", temperature=0.1, api_key=openai_api_key)
-        chain = prompt | llm | StrOutputParser()
+        llm = make_chat_model("gpt-4o-mini", temperature=0.1, api_key=openai_api_key)
         
-        answer = chain.invoke({
-            "question": state["question"],
-            "context": state["context"],
-            "chat_history": chat_history_text,
-            "doc_info": doc_info
-        })
+        answer = invoke_llm(llm, prompt.format(
+            question=state["question"],
+            context=state["context"],
+            chat_history=chat_history_text,
+            doc_info=doc_info
+        ), max_retries=retry_budget(state.get("deadline"))).content
         
         # URL 정보 추가
         if state["urls"]:
@@ -489,18 +579,26 @@ def generate_answer(state: GraphState) -> GraphState:
         else:
             full_answer = answer
         
+        full_answer += degraded_notice(state.get("degraded"))
+        get_answer_cache().remember("regulation", state["question"], full_answer)
+        
         return {
             **state,
             "answer": full_answer
         }
     
     except Exception as e:
-        error_answer = f"답변 생성 중 오류가 발생했습니다: {e}"
+        # LLM 장애 시 이전 답변 → 검색된 규제 문서 발췌 → 안내 문구 순으로 대체
+        print(f"⚠️ 답변 생성 실패 - 대체 응답 사용: {e}")
+        error_answer = stale_answer("regulation", state["question"])
+        if error_answer is None and state["context"]:
+            error_answer = regulation_excerpt_answer(state["context"], state["urls"])
         return {
             **state,
-            "answer": error_answer
+            "answer": error_answer or UNAVAILABLE_ANSWER
         }
 
+@timed_node("regulation.update_history")
 def update_chat_history(state: GraphState) -> GraphState:
     """채팅 히스토리 업데이트"""
     try:
@@ -511,9 +609,8 @@ def update_chat_history(state: GraphState) -> GraphState:
         updated_history.append(HumanMessage(content=state["question"]))
         updated_history.append(AIMessage(content=state["answer"]))
         
-        # 히스토리 길이 제한 (최대 10개 메시지)
-        if len(updated_history) > 10:
-            updated_history = updated_history[-10:]
+        # 히스토리 길이 제한 (최근 6개 메시지 + 토큰 상한) - 넘친 대화는 백그라운드에서 요약해 다음 질문에 반영
+        schedule_compaction(updated_history, max_messages=6)
         
         return {
             **state,
@@ -548,24 +645,28 @@ workflow.add_edge("update_history", END)
 graph = workflow.compile()
 
 # 메인 실행 함수
-def ask_question(question: str, chat_history: List = None) -> Dict[str, Any]:
-    """질문 처리 메인 함수"""
-    if chat_history is None:
-        chat_history = []
+def ask_question(question: str, chat_history: List = None, sla_seconds: Optional[float] = None) -> Dict[str, Any]:
+    """질문 처리 메인 함수 (sla_seconds: 응답 시간 목표, 기본 ANSWER_SLA_SECONDS)"""
+    # 지난 답변 후 백그라운드에서 끝난 대화 요약 반영
+    chat_history = apply_pending_compaction(chat_history)
     
     try:
-        result = graph.invoke({
-            "question": question,
-            "question_en": "",
-            "chat_history": chat_history,
-            "document_type": "",
-            "categories": [],
-            "context": "",
-            "urls": [],
-            "answer": "",
-            "need_synthesis": False,
-            "guidance_references": []
-        })
+        with span("pipeline.regulation", kind="pipeline", question_chars=len(question), history_turns=len(chat_history)):
+            result = graph.invoke({
+                "question": question,
+                "question_en": "",
+                "chat_history": chat_history,
+                "document_type": "",
+                "categories": [],
+                "context": "",
+                "urls": [],
+                "answer": "",
+                "need_synthesis": False,
+                "guidance_references": [],
+                "speculation": None,
+                "deadline": start_deadline(sla_seconds),
+                "degraded": []
+            })
         
         return {
             "answer": result["answer"],
@@ -573,7 +674,8 @@ def ask_question(question: str, chat_history: List = None) -> Dict[str, Any]:
             "categories": result["categories"],
             "urls": result["urls"],
             "chat_history": result["chat_history"],
-            "guidance_references": result["guidance_references"]
+            "guidance_references": result["guidance_references"],
+            "degraded": result.get("degraded", [])
         }
     
     except Exception as e:
@@ -583,5 +685,6 @@ def ask_question(question: str, chat_history: List = None) -> Dict[str, Any]:
             "categories": [],
             "urls": [],
             "chat_history": chat_history,
-            "guidance_references": []
+            "guidance_references": [],
+            "degraded": []
         }
@@ -0,0 +1,131 @@
+# utils/circuit_breaker.py
+"""
+OpenAI 호출 서킷 브레이커 - 장애 시 빠른 실패
+- closed: 정상 호출, 최근 구간의 실패율을 집계
+- open: 실패율이 임계치를 넘으면 일정 시간 동안 호출 없이 즉시 CircuitOpenError
+- half_open: 대기 시간이 지나면 시험 호출 몇 건만 허용 → 성공하면 closed, 실패하면 다시 open
+
+환경 변수
+- LLM_BREAKER_FAILURE_RATE: open 전환 실패율 (기본 0.5)
+- LLM_BREAKER_MIN_CALLS: 실패율을 판단할 최소 호출 수 (기본 5)
+- LLM_BREAKER_WINDOW_SECONDS: 실패율 집계 구간 (기본 60초)
+- LLM_BREAKER_OPEN_SECONDS: open 유지 시간 (기본 30초)
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+FAILURE_RATE_THRESHOLD = float(os.getenv("LLM_BREAKER_FAILURE_RATE", "0.5"))
+MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", "5"))
+WINDOW_SECONDS = float(os.getenv("LLM_BREAKER_WINDOW_SECONDS", "60"))
+OPEN_SECONDS = float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30"))
+HALF_OPEN_MAX_CALLS = 1
+
+class CircuitOpenError(RuntimeError):
+    """브레이커가 열려 있어 호출하지 않고 즉시 실패"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} 서킷 브레이커 open - {retry_in:.0f}초 후 재시도")
+        self.name = name
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    """실패율 기반 서킷 브레이커 (스레드 안전)"""
+
+    def __init__(self, name: str, failure_rate_threshold: float = FAILURE_RATE_THRESHOLD,
+                 min_calls: int = MIN_CALLS, window_seconds: float = WINDOW_SECONDS,
+                 open_seconds: float = OPEN_SECONDS, half_open_max_calls: int = HALF_OPEN_MAX_CALLS):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._lock = threading.Lock()
+        self._outcomes: Deque[Tuple[float, bool]] = deque()  # (시각, 성공 여부)
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self.stats = {"rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        """open 유지 시간이 지났으면 half_open으로 전환 (호출자가 _lock 보유)"""
+        if self._state == STATE_OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = STATE_HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def _trim(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _open(self, now: float, reason: str) -> None:
+        self._state = STATE_OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self.stats["opened"] += 1
+        logger.warning(f"🔌 [{self.name}] 서킷 브레이커 open ({reason}) - {self.open_seconds:.0f}초 동안 즉시 실패")
+
+    def before_call(self) -> None:
+        """호출 전 확인 - 허용되지 않으면 CircuitOpenError"""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == STATE_OPEN:
+                self.stats["rejected"] += 1
+                raise CircuitOpenError(self.name, self.open_seconds - (now - self._opened_at))
+            if state == STATE_HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    self.stats["rejected"] += 1
+                    raise CircuitOpenError(self.name, 0)
+                self._half_open_calls += 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._current_state(now) == STATE_HALF_OPEN:
+                logger.info(f"🔌 [{self.name}] 서킷 브레이커 closed (시험 호출 성공)")
+                self._state = STATE_CLOSED
+                self._outcomes.clear()
+            self._outcomes.append((now, True))
+            self._trim(now)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._current_state(now) == STATE_HALF_OPEN:
+                self._open(now, "시험 호출 실패")
+                return
+            self._outcomes.append((now, False))
+            self._trim(now)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            total = len(self._outcomes)
+            if total >= self.min_calls and failures / total >= self.failure_rate_threshold:
+                self._open(now, f"최근 {total}건 중 {failures}건 실패")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """개발자 패널용 상태 스냅샷"""
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return {
+                "state": self._current_state(now),
+                "window_calls": len(self._outcomes),
+                "window_failures": failures,
+                **self.stats,
+            }
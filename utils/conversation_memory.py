@@ -0,0 +1,202 @@
+# utils/conversation_memory.py
+"""
+롤링 요약 대화 메모리 - 프롬프트 크기 상한 유지
+- 최근 대화는 원문 그대로 유지 (토큰/메시지 수 상한)
+- 상한을 넘은 오래된 대화는 이전 요약과 합쳐 점진적으로 재요약
+- 요약은 히스토리 맨 앞의 SystemMessage 하나로 보관 (기존 직렬화/세션 저장과 호환)
+- 답변 경로에서는 요약 LLM 호출을 기다리지 않음
+  · 답변 후 schedule_compaction으로 백그라운드 압축 시작
+  · 다음 질문 시작 시 apply_pending_compaction으로 끝난 압축 결과를 반영 (진행 중이면 원문 그대로 사용)
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from utils.llm_gateway import estimate_tokens, invoke_llm, make_chat_model
+
+SUMMARY_PREFIX = "[이전 대화 요약]"
+
+# 요약 메시지 토큰 상한
+SUMMARY_TOKEN_LIMIT = 600
+# 원문으로 유지할 최근 대화 토큰 상한 - 넘으면 절반 수준까지 압축 (매 턴 요약 호출 방지)
+RECENT_TOKEN_LIMIT = 2500
+# 요약 입력으로 넘길 메시지별 최대 글자 수 (표/URL이 긴 답변 대비)
+SUMMARY_INPUT_CHARS = 1500
+# 백그라운드 압축 스레드 수 / 결과를 보관할 최대 대화 수 (오래된 것부터 버림)
+COMPACTION_WORKERS = 2
+MAX_PENDING_COMPACTIONS = 128
+
+_compaction_executor = ThreadPoolExecutor(max_workers=COMPACTION_WORKERS, thread_name_prefix="history-compact")
+# 마지막 메시지 id → (압축 대상 히스토리, 압축 결과 Future)
+_pending_compactions: "OrderedDict[int, Tuple[List[BaseMessage], Future]]" = OrderedDict()
+_pending_lock = threading.Lock()
+
+SUMMARY_PROMPT = """다음은 FDA 규제/리콜 상담 챗봇과 사용자의 대화입니다.
+기존 요약과 새로 밀려난 대화를 합쳐 한국어로 간결한 누적 요약을 작성하세요.
+
+규칙:
+- 사용자가 관심을 가진 제품, 브랜드, 규제 항목, 결론만 남기세요.
+- 인용된 조항 번호(예: 21 CFR 101.4)와 리콜 날짜/브랜드는 유지하세요.
+- 표, URL, 인사말은 제외하세요.
+- {max_tokens} 토큰 이내, 글머리표 형식으로 작성하세요.
+
+기존 요약:
+{summary}
+
+새로 요약할 대화:
+{dialogue}
+
+누적 요약:"""
+
+def split_history(history: Sequence[BaseMessage]) -> Tuple[str, List[BaseMessage]]:
+    """히스토리를 (요약 텍스트, 나머지 메시지)로 분리"""
+    if history and isinstance(history[0], SystemMessage) and history[0].content.startswith(SUMMARY_PREFIX):
+        return history[0].content[len(SUMMARY_PREFIX):].strip(), list(history[1:])
+    return "", list(history or [])
+
+def _role(msg: BaseMessage) -> str:
+    return "사용자" if isinstance(msg, HumanMessage) else "챗봇"
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """토큰 추정치가 상한 이내가 되도록 뒤쪽을 자름"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low].rstrip() + " …"
+
+def _fallback_summary(summary: str, messages: Sequence[BaseMessage]) -> str:
+    """LLM 요약 실패 시 사용자 질문만 모아 요약 대체"""
+    questions = [f"- {msg.content.strip()[:120]}" for msg in messages if isinstance(msg, HumanMessage)]
+    return "\n".join(part for part in [summary, "\n".join(questions)] if part)
+
+def summarize_messages(summary: str, messages: Sequence[BaseMessage], max_tokens: int = SUMMARY_TOKEN_LIMIT) -> str:
+    """기존 요약 + 밀려난 메시지를 새 누적 요약으로 압축"""
+    dialogue = "\n".join(f"{_role(msg)}: {msg.content[:SUMMARY_INPUT_CHARS]}" for msg in messages)
+    try:
+        llm = make_chat_model("gpt-4o-mini", temperature=0, max_tokens=max_tokens)
+        new_summary = invoke_llm(llm, SUMMARY_PROMPT.format(
+            max_tokens=max_tokens, summary=summary or "(없음)", dialogue=dialogue
+        )).content.strip()
+    except Exception as e:
+        print(f"대화 요약 실패 - 질문 목록으로 대체: {e}")
+        new_summary = _fallback_summary(summary, messages)
+    return _truncate_to_tokens(new_summary, max_tokens)
+
+def compact_history(history: Sequence[BaseMessage], max_messages: int = 10,
+                    recent_token_limit: int = RECENT_TOKEN_LIMIT,
+                    summary_token_limit: int = SUMMARY_TOKEN_LIMIT,
+                    sticky_markers: Sequence[str] = ()) -> List[BaseMessage]:
+    """
+    최근 대화 상한(메시지 수/토큰)을 넘으면 오래된 턴을 요약으로 압축
+    sticky_markers: 압축되는 답변에 포함되어 있으면 요약에도 그대로 남길 표식 (예: "⚡실시간:")
+    """
+    summary, messages = split_history(history)
+
+    if not needs_compaction(history, max_messages, recent_token_limit):
+        return list(history)
+
+    # 최근 턴(질문+답변 쌍)부터 거꾸로 채우되 상한의 절반까지만 유지
+    keep_messages = max(2, max_messages // 2)
+    keep_tokens = recent_token_limit // 2
+    kept: List[BaseMessage] = []
+    kept_tokens = 0
+    index = len(messages)
+    while index > 0:
+        start = index - 2 if index >= 2 and isinstance(messages[index - 2], HumanMessage) else index - 1
+        turn = messages[start:index]
+        turn_tokens = sum(estimate_tokens(msg.content) for msg in turn)
+        if kept and (len(kept) + len(turn) > keep_messages or kept_tokens + turn_tokens > keep_tokens):
+            break
+        kept = turn + kept
+        kept_tokens += turn_tokens
+        index = start
+
+    evicted = messages[:index]
+    if not evicted:
+        return list(history)
+
+    new_summary = summarize_messages(summary, evicted, max_tokens=summary_token_limit)
+    markers = [marker for marker in sticky_markers
+               if any(marker in msg.content for msg in evicted) and marker not in new_summary]
+    if markers:
+        new_summary += "\n" + " ".join(markers)
+
+    return [SystemMessage(content=f"{SUMMARY_PREFIX}\n{new_summary}")] + kept
+
+def needs_compaction(history: Sequence[BaseMessage], max_messages: int = 10,
+                     recent_token_limit: int = RECENT_TOKEN_LIMIT) -> bool:
+    """요약 밖 최근 대화가 메시지 수/토큰 상한을 넘었는지"""
+    _, messages = split_history(history)
+    recent_tokens = sum(estimate_tokens(msg.content) for msg in messages)
+    return len(messages) > max_messages or recent_tokens > recent_token_limit
+
+def _is_prefix(source: Sequence[BaseMessage], history: Sequence[BaseMessage]) -> bool:
+    """source가 history의 앞부분과 같은 메시지 객체들인지 (세션에 보관된 히스토리 객체 기준)"""
+    return len(source) <= len(history) and all(a is b for a, b in zip(source, history))
+
+def schedule_compaction(history: Sequence[BaseMessage], max_messages: int = 10, **kwargs) -> None:
+    """
+    상한을 넘은 히스토리를 백그라운드에서 compact_history로 압축 (결과는 다음 질문에서 반영)
+    같은 대화의 앞부분을 압축 중이면 새로 시작하지 않음
+    kwargs: compact_history의 나머지 인자 (recent_token_limit, sticky_markers 등)
+    """
+    history = list(history)
+    recent_token_limit = kwargs.get("recent_token_limit", RECENT_TOKEN_LIMIT)
+    if not history or not needs_compaction(history, max_messages, recent_token_limit):
+        return
+
+    with _pending_lock:
+        if any(not future.done() and _is_prefix(source, history)
+               for source, future in _pending_compactions.values()):
+            return
+        future = _compaction_executor.submit(compact_history, history, max_messages=max_messages, **kwargs)
+        _pending_compactions[id(history[-1])] = (history, future)
+        while len(_pending_compactions) > MAX_PENDING_COMPACTIONS:
+            _pending_compactions.popitem(last=False)
+
+def apply_pending_compaction(history: Optional[Sequence[BaseMessage]]) -> List[BaseMessage]:
+    """
+    끝난 백그라운드 압축 결과를 히스토리에 반영 - 압축 대상 이후에 추가된 대화는 그대로 이어 붙임
+    해당하는 압축이 없거나 아직 진행 중이면 히스토리를 그대로 반환 (기다리지 않음)
+    """
+    history = list(history or [])
+    best: Optional[Tuple[List[BaseMessage], Future]] = None
+    with _pending_lock:
+        for key, (source, future) in list(_pending_compactions.items()):
+            if not future.done() or not _is_prefix(source, history):
+                continue
+            del _pending_compactions[key]
+            if best is None or len(source) > len(best[0]):
+                best = (source, future)
+
+    if best is None:
+        return history
+    source, future = best
+    try:
+        return future.result() + history[len(source):]
+    except Exception as e:
+        print(f"대화 요약 반영 실패 - 원문 유지: {e}")
+        return history
+
+def format_history_for_prompt(history: Optional[Sequence[BaseMessage]]) -> str:
+    """프롬프트용 대화 기록 텍스트 (요약 + 최근 대화 원문)"""
+    if not history:
+        return ""
+    lines = []
+    for msg in history:
+        if isinstance(msg, SystemMessage):
+            lines.append(msg.content)
+        else:
+            lines.append(f"{msg.__class__.__name__}: {msg.content}")
+    return "\n".join(lines)
+
+def has_marker(history: Optional[Sequence[BaseMessage]], marker: str) -> bool:
+    """답변 또는 요약에 표식이 남아 있는지 확인"""
+    return any(isinstance(msg, (AIMessage, SystemMessage)) and marker in msg.content for msg in history or [])
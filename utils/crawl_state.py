@@ -0,0 +1,200 @@
+# utils/crawl_state.py
+"""
+크롤링 체크포인트 저장소 (SQLite)
+- 소스별 최신 날짜(high-water mark)와 적재된 URL 인덱스를 보관
+- "새 리콜인가?" 판단을 벡터스토어 전체 조회 대신 인덱스 조회로 처리
+- 적재 시 URL 추가와 최신 날짜 갱신을 한 트랜잭션으로 기록
+- 최초 1회(또는 벡터스토어가 재생성되어 컬렉션 id가 바뀐 경우)만 벡터스토어를 훑어 동기화
+- 전체 아카이브 백필(utils/recall_backfill.py)의 진행 위치 체크포인트 보관
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set
+
+CRAWL_STATE_PATH = os.getenv("CRAWL_STATE_PATH", "./data/crawl_state.sqlite3")
+DEFAULT_SOURCE = "fda_recall"
+
+class CrawlStateStore:
+    """소스별 high-water mark + URL 인덱스"""
+
+    def __init__(self, path: str = CRAWL_STATE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS seen_urls (
+                    source TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    effective_date TEXT,
+                    ingested_at REAL NOT NULL,
+                    PRIMARY KEY (source, url)
+                );
+                CREATE TABLE IF NOT EXISTS high_water (
+                    source TEXT PRIMARY KEY,
+                    effective_date TEXT,
+                    synced_at REAL,
+                    store_id TEXT
+                );
+                CREATE TABLE IF NOT EXISTS backfill (
+                    source TEXT PRIMARY KEY,
+                    next_start INTEGER NOT NULL,
+                    total INTEGER,
+                    ingested INTEGER NOT NULL DEFAULT 0,
+                    started_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+            """)
+            # 이전 버전 파일에는 store_id 열이 없음
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(high_water)")}
+            if "store_id" not in columns:
+                conn.execute("ALTER TABLE high_water ADD COLUMN store_id TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def high_water_mark(self, source: str = DEFAULT_SOURCE) -> Optional[datetime]:
+        row = self._connect().execute(
+            "SELECT effective_date FROM high_water WHERE source = ?", (source,)
+        ).fetchone()
+        if not row or not row[0]:
+            return None
+        try:
+            return datetime.strptime(row[0], "%Y-%m-%d")
+        except ValueError:
+            return None
+
+    def url_count(self, source: str = DEFAULT_SOURCE) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM seen_urls WHERE source = ?", (source,)).fetchone()[0]
+
+    def is_synced(self, source: str = DEFAULT_SOURCE) -> bool:
+        row = self._connect().execute("SELECT synced_at FROM high_water WHERE source = ?", (source,)).fetchone()
+        return bool(row and row[0])
+
+    def synced_store_id(self, source: str = DEFAULT_SOURCE) -> Optional[str]:
+        """마지막으로 동기화한 벡터스토어 컬렉션 id"""
+        row = self._connect().execute("SELECT store_id FROM high_water WHERE source = ?", (source,)).fetchone()
+        return row[0] if row else None
+
+    def known_urls(self, urls: Iterable[str], source: str = DEFAULT_SOURCE) -> Set[str]:
+        """주어진 URL 중 이미 적재된 것 (기본키 인덱스 조회)"""
+        urls = list(dict.fromkeys(url for url in urls if url))
+        known: Set[str] = set()
+        conn = self._connect()
+        for i in range(0, len(urls), 500):  # SQLite 변수 개수 제한 대비
+            batch = urls[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT url FROM seen_urls WHERE source = ? AND url IN ({placeholders})", [source, *batch]
+            ).fetchall()
+            known.update(row[0] for row in rows)
+        return known
+
+    def all_urls(self, source: str = DEFAULT_SOURCE) -> Set[str]:
+        return {row[0] for row in self._connect().execute("SELECT url FROM seen_urls WHERE source = ?", (source,))}
+
+    def record_ingested(self, records: Iterable[Dict[str, str]], source: str = DEFAULT_SOURCE,
+                        synced: bool = False) -> None:
+        """적재된 [{url, effective_date}]를 URL 인덱스와 최신 날짜에 한 트랜잭션으로 반영"""
+        with self._write_lock, self._connect() as conn:
+            _insert_records(conn, records, source, synced)
+
+    def reset(self, source: str = DEFAULT_SOURCE) -> None:
+        with self._write_lock, self._connect() as conn:
+            _delete_source(conn, source)
+
+    def replace_index(self, records: Iterable[Dict[str, str]], store_id: Optional[str],
+                      source: str = DEFAULT_SOURCE) -> None:
+        """URL 인덱스를 records로 통째로 교체 (삭제+재구성을 한 트랜잭션으로 - 중간에 죽어도 이전 인덱스 유지)"""
+        with self._write_lock, self._connect() as conn:
+            _delete_source(conn, source)
+            _insert_records(conn, records, source, synced=True)
+            conn.execute("UPDATE high_water SET store_id = ? WHERE source = ?", (store_id, source))
+
+    def backfill_checkpoint(self, source: str = DEFAULT_SOURCE) -> Optional[Dict]:
+        """진행 중인 백필 위치 {next_start, total, ingested, started_at, updated_at} 또는 None"""
+        row = self._connect().execute(
+            "SELECT next_start, total, ingested, started_at, updated_at FROM backfill WHERE source = ?", (source,)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("next_start", "total", "ingested", "started_at", "updated_at"), row))
+
+    def save_backfill_checkpoint(self, next_start: int, total: Optional[int], ingested: int,
+                                 source: str = DEFAULT_SOURCE) -> None:
+        now = time.time()
+        with self._write_lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO backfill VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(source) DO UPDATE SET "
+                "next_start = excluded.next_start, total = excluded.total, "
+                "ingested = excluded.ingested, updated_at = excluded.updated_at",
+                (source, next_start, total, ingested, now, now),
+            )
+
+    def clear_backfill_checkpoint(self, source: str = DEFAULT_SOURCE) -> None:
+        with self._write_lock, self._connect() as conn:
+            conn.execute("DELETE FROM backfill WHERE source = ?", (source,))
+
+    def sync_with_vectorstore(self, vectorstore, source: str = DEFAULT_SOURCE) -> None:
+        """
+        최초 1회 벡터스토어 메타데이터로 인덱스 구성
+        이후에는 컬렉션 id를 비교해 벡터스토어가 재생성된 경우(삭제 후 시드 JSON으로 재구축 등)에만 다시 구성
+        """
+        try:
+            store_id = str(vectorstore._collection.id)
+        except Exception:
+            store_id = None
+        if self.is_synced(source) and (store_id is None or store_id == self.synced_store_id(source)):
+            return
+
+        print(f"🗂️ 크롤링 상태 저장소 동기화 (벡터스토어 컬렉션 {store_id})")
+        metadatas = vectorstore.get(include=["metadatas"]).get("metadatas", [])
+        records = [
+            {"url": meta["url"], "effective_date": meta.get("effective_date", "")}
+            for meta in metadatas if meta and meta.get("url")
+        ]
+        self.replace_index(records, store_id, source)
+
+def _insert_records(conn: sqlite3.Connection, records: Iterable[Dict[str, str]], source: str, synced: bool) -> None:
+    now = time.time()
+    rows = [(source, r["url"], r.get("effective_date") or "", now) for r in records if r.get("url")]
+    dates = [r[2] for r in rows if _valid_date(r[2])]
+    conn.executemany("INSERT OR IGNORE INTO seen_urls VALUES (?, ?, ?, ?)", rows)
+    conn.execute(
+        "INSERT INTO high_water (source, effective_date, synced_at) VALUES (?, ?, ?) "
+        "ON CONFLICT(source) DO UPDATE SET "
+        "effective_date = MAX(COALESCE(high_water.effective_date, ''), COALESCE(excluded.effective_date, '')), "
+        "synced_at = COALESCE(excluded.synced_at, high_water.synced_at)",
+        (source, max(dates) if dates else None, now if synced else None),
+    )
+
+def _delete_source(conn: sqlite3.Connection, source: str) -> None:
+    conn.execute("DELETE FROM seen_urls WHERE source = ?", (source,))
+    conn.execute("DELETE FROM high_water WHERE source = ?", (source,))
+
+def _valid_date(value: str) -> bool:
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+        return True
+    except (TypeError, ValueError):
+        return False
+
+_store: Optional[CrawlStateStore] = None
+_store_lock = threading.Lock()
+
+def get_crawl_state() -> CrawlStateStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CrawlStateStore()
+    return _store
@@ -0,0 +1,77 @@
+# utils/deadline.py
+"""
+질문 단위 응답 시간 예산(deadline) - 그래프 상태로 전달해 노드별로 남은 시간 확인
+- 질문 시작 시 deadline(절대 시각)을 상태에 넣고, 각 노드는 비싼 단계 전에 남은 예산을 확인
+- 예산이 부족하면 더 싼 경로를 선택하고 사유를 state["degraded"]에 기록
+- 최종 답변 생성 시간은 항상 남겨둠 (ANSWER_RESERVE_SECONDS)
+- 시작한 단계도 답변 생성 시간에 닿으면 중간에 멈추고 "일부만 반영"으로 기록 (expired / answer_cutoff)
+
+환경 변수
+- ANSWER_SLA_SECONDS: 질문당 응답 시간 목표 (기본 45초, 0이면 제한 없음)
+- ANSWER_RESERVE_SECONDS: 최종 답변 생성용으로 남겨둘 시간 (기본 10초)
+"""
+import os
+import time
+from typing import Dict, List, Mapping, Optional
+
+ANSWER_SLA_SECONDS = float(os.getenv("ANSWER_SLA_SECONDS", "45") or 0)
+ANSWER_RESERVE_SECONDS = float(os.getenv("ANSWER_RESERVE_SECONDS", "10") or 0)
+
+# 단계별 예상 소요 시간 (초) - 남은 예산이 이보다 적으면 해당 단계를 줄이거나 생략
+STEP_BUDGETS: Dict[str, float] = {
+    "crawl": 25.0,        # FDA 실시간 크롤링
+    "relevance": 8.0,     # 문서별 LLM 관련성 판단
+    "news": 10.0,         # 구글 뉴스 검색 + 본문 추출 (3건)
+    "news_minimal": 4.0,  # 구글 뉴스 1건
+    "synthesis": 4.0,     # 참조 규정 추가 검색
+}
+
+# 품질 저하 사유 (답변 하단 표시용)
+SKIPPED_CRAWL = "실시간 크롤링 생략"
+PARTIAL_CRAWL = "실시간 크롤링 일부만 반영"
+SKIPPED_RELEVANCE = "관련성 검사 생략"
+PARTIAL_RELEVANCE = "관련성 검사 일부 생략"
+CAPPED_NEWS = "뉴스 결과 축소"
+SKIPPED_NEWS = "뉴스 검색 생략"
+SKIPPED_SYNTHESIS = "참조 규정 검색 생략"
+
+def start_deadline(sla_seconds: Optional[float] = None) -> Optional[float]:
+    """지금부터 SLA 후의 절대 시각 (SLA가 0이면 None - 제한 없음)"""
+    sla = ANSWER_SLA_SECONDS if sla_seconds is None else sla_seconds
+    return time.time() + sla if sla and sla > 0 else None
+
+def remaining(deadline: Optional[float]) -> float:
+    """남은 시간(초) - deadline이 없으면 무한대"""
+    if deadline is None:
+        return float("inf")
+    return deadline - time.time()
+
+def can_afford(deadline: Optional[float], step: str, reserve: float = ANSWER_RESERVE_SECONDS) -> bool:
+    """답변 생성 시간을 남기고도 해당 단계를 수행할 예산이 있는지"""
+    return remaining(deadline) - reserve >= STEP_BUDGETS[step]
+
+def answer_cutoff(deadline: Optional[float], reserve: float = ANSWER_RESERVE_SECONDS) -> Optional[float]:
+    """답변 생성 시간을 남기려면 진행 중인 단계를 멈춰야 하는 절대 시각 (deadline이 없으면 None)"""
+    return deadline - reserve if deadline is not None else None
+
+def expired(deadline: Optional[float], reserve: float = ANSWER_RESERVE_SECONDS) -> bool:
+    """답변 생성용 시간만 남았는지 - 진행 중인 수집/검사를 멈출 시점"""
+    return remaining(deadline) < reserve
+
+def degrade(state: Mapping, reason: str) -> List[str]:
+    """품질 저하 사유를 추가한 새 목록 반환 (노드에서 {"degraded": degrade(state, ...)}로 사용)"""
+    print(f"⏱️ 남은 시간 {remaining(state.get('deadline')):.1f}초 - {reason}")
+    reasons = list(state.get("degraded") or [])
+    if reason not in reasons:
+        reasons.append(reason)
+    return reasons
+
+def retry_budget(deadline: Optional[float], reserve: float = ANSWER_RESERVE_SECONDS) -> Optional[int]:
+    """답변 생성 예산보다 적게 남았으면 재시도 없이 1회만 호출 (None이면 게이트웨이 기본값)"""
+    return 0 if remaining(deadline) < reserve else None
+
+def degraded_notice(reasons: Optional[List[str]]) -> str:
+    """답변 하단 표시 문구 (저하 없으면 빈 문자열)"""
+    if not reasons:
+        return ""
+    return f"\n\n⏱️ 응답 시간 제한으로 간소화된 답변입니다 ({', '.join(reasons)})"
@@ -0,0 +1,51 @@
+# utils/diagnostics.py
+"""
+진단(디버그) 모드 - 운영 쿼리에서는 비용이 들지 않는 조건부 구조화 로깅
+- DIAGNOSTICS_DEBUG=1 이면 항상 진단 수행
+- DIAGNOSTICS_SAMPLE_RATE=0.05 처럼 지정하면 해당 비율의 요청만 진단 수행 (기본 0)
+- 필드 값으로 함수(callable)를 넘기면 진단이 켜져 있을 때만 계산됨 (지연 평가)
+
+사용 예:
+    diag_enabled = should_sample()
+    diagnose("recall_search", "top_documents", diag_enabled, docs=lambda: summarize(docs))
+"""
+import json
+import logging
+import os
+import random
+import sys
+from typing import Any, Callable
+
+DIAGNOSTICS_DEBUG = os.getenv("DIAGNOSTICS_DEBUG", "0") == "1"
+DIAGNOSTICS_SAMPLE_RATE = float(os.getenv("DIAGNOSTICS_SAMPLE_RATE", "0") or 0)
+
+logger = logging.getLogger("risk_app.diagnostics")
+if not logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("🩺 %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+def should_sample() -> bool:
+    """이번 요청에서 진단을 수행할지 결정 (요청 시작 시 1회 호출)"""
+    if DIAGNOSTICS_DEBUG:
+        return True
+    return DIAGNOSTICS_SAMPLE_RATE > 0 and random.random() < DIAGNOSTICS_SAMPLE_RATE
+
+def _resolve(value: Any) -> Any:
+    return value() if callable(value) else value
+
+def log_event(scope: str, event: str, **fields: Any) -> None:
+    """구조화된 진단 이벤트 기록 (callable 필드는 이 시점에 평가)"""
+    try:
+        payload = {"scope": scope, "event": event}
+        payload.update({key: _resolve(value) for key, value in fields.items()})
+        logger.info(json.dumps(payload, ensure_ascii=False, default=str))
+    except Exception as e:
+        logger.warning(f"진단 이벤트 기록 실패 ({scope}.{event}): {e}")
+
+def diagnose(scope: str, event: str, enabled: bool, **fields: Callable[[], Any]) -> None:
+    """enabled일 때만 log_event 수행 - 비활성 상태에서는 필드 함수를 호출하지 않음"""
+    if enabled:
+        log_event(scope, event, **fields)
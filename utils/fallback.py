@@ -0,0 +1,109 @@
+# utils/fallback.py
+"""
+LLM 장애 시 대체 응답
+- 최근 답변 캐시: 정상 생성된 답변을 질문(정규화) 단위로 디스크에 저장 → 장애 시 이전 답변 제공
+- 검색 결과만으로 만든 응답: 리콜 메타데이터 표 / 규제 문서 발췌
+- 서킷 브레이커(utils/circuit_breaker.py)가 열려 LLM 호출이 즉시 실패할 때 사용
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+from langchain_core.documents import Document
+from utils.translation_memory import normalize_source
+
+ANSWER_CACHE_FILE = "./data/answer_cache.json"
+# 파이프라인별 최대 보관 답변 수 (오래된 것부터 삭제)
+MAX_CACHED_ANSWERS = 300
+
+class AnswerCache:
+    """파이프라인/질문별 마지막 정상 답변 (원자적 쓰기)"""
+
+    def __init__(self, path: str = ANSWER_CACHE_FILE, max_entries: int = MAX_CACHED_ANSWERS):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Dict]] = {}
+        try:
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+        except Exception as e:
+            print(f"답변 캐시 로드 실패: {e}")
+
+    def lookup(self, pipeline: str, question: str) -> Optional[Dict]:
+        """{"answer", "updated"} 또는 None"""
+        return self._entries.get(pipeline, {}).get(normalize_source(question))
+
+    def remember(self, pipeline: str, question: str, answer: str) -> None:
+        if not answer or not answer.strip():
+            return
+        with self._lock:
+            entries = self._entries.setdefault(pipeline, {})
+            entries[normalize_source(question)] = {"answer": answer, "updated": datetime.now().isoformat()}
+            if len(entries) > self.max_entries:
+                oldest = sorted(entries, key=lambda key: entries[key]["updated"])[:len(entries) - self.max_entries]
+                for key in oldest:
+                    del entries[key]
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                temp_file = f"{self.path}.tmp"
+                with open(temp_file, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f, ensure_ascii=False, indent=2)
+                os.replace(temp_file, self.path)
+            except Exception as e:
+                print(f"답변 캐시 저장 실패: {e}")
+
+_cache: Optional[AnswerCache] = None
+_cache_lock = threading.Lock()
+
+def get_answer_cache() -> AnswerCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnswerCache()
+    return _cache
+
+def stale_answer(pipeline: str, question: str) -> Optional[str]:
+    """캐시된 이전 답변 + 안내 문구 (없으면 None)"""
+    entry = get_answer_cache().lookup(pipeline, question)
+    if not entry:
+        return None
+    updated = entry.get("updated", "")[:16].replace("T", " ")
+    return f"⚠️ AI 서비스 응답 지연으로 {updated}에 생성된 이전 답변을 표시합니다.\n\n{entry['answer']}"
+
+def recall_table_answer(documents: Sequence[Document]) -> str:
+    """리콜 문서 메타데이터만으로 만든 표 형식 응답 (LLM 미사용)"""
+    rows = []
+    for doc in documents:
+        meta = doc.metadata
+        title = (meta.get("title") or "").replace("|", "/")
+        url = meta.get("url") or ""
+        source = f"[링크]({url})" if url else "-"
+        rows.append(
+            f"| {meta.get('effective_date') or '-'} | {title or '-'} | {meta.get('category') or '-'} "
+            f"| {meta.get('class') or '-'} | {source} |"
+        )
+    table = "\n".join(["| 날짜 | 제목 | 카테고리 | 등급 | 출처 |", "|---|---|---|---|---|"] + rows)
+    return (
+        "⚠️ AI 서비스 응답 지연으로 요약 없이 검색된 FDA 리콜 목록만 표시합니다.\n\n"
+        f"{table}"
+    )
+
+def regulation_excerpt_answer(documents_context: str, urls: List[str], max_chars: int = 1500) -> str:
+    """규제 문서 검색 결과 발췌 응답 (LLM 미사용)"""
+    excerpt = documents_context[:max_chars].strip()
+    if len(documents_context) > max_chars:
+        excerpt += " …"
+    answer = (
+        "⚠️ AI 서비스 응답 지연으로 해석 없이 검색된 규제 문서 원문 일부를 표시합니다.\n\n"
+        f"{excerpt}"
+    )
+    unique_urls = [url for url in dict.fromkeys(urls) if url.strip()]
+    if unique_urls:
+        answer += "\n\n📎 출처:\n" + "\n".join(f"- {url}" for url in unique_urls)
+    return answer
+
+UNAVAILABLE_ANSWER = "⚠️ AI 서비스 응답 지연으로 지금은 답변을 생성할 수 없습니다. 잠시 후 다시 시도해주세요."
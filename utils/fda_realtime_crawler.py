@@ -1,21 +1,38 @@
 # utils/fda_realtime_crawler.py
 """
-실시간 FDA 리콜 데이터 크롤링 및 업데이트 모듈 - Selenium 기반으로 수정
+실시간 FDA 리콜 데이터 크롤링 및 업데이트 모듈
+- http 모드: 리콜 목록 테이블의 데이터(DataTables AJAX 응답)와 상세 페이지를 requests로 직접 수집 (브라우저 불필요)
+- selenium 모드: 헤드리스 Chrome으로 목록 페이지를 조작해 수집 (http 모드 실패 시 대체 경로)
+
+환경 변수
+- FDA_CRAWL_MODE: auto | http | selenium (기본 auto - http 실패 시 selenium으로 대체)
+- FDA_BASE_URL: FDA 사이트 주소 (기본 https://www.fda.gov, 테스트 서버 지정용)
+- FDA_MAX_RECALLS: 1회 크롤링 최대 수집 건수 (기본 30)
+- 상세 페이지 병렬 수집 설정은 utils/polite_fetcher.py 참고 (CRAWL_WORKERS, CRAWL_HOST_CONCURRENCY, CRAWL_HOST_RPS)
+- selenium 모드 브라우저 풀 설정은 utils/browser_pool.py 참고 (BROWSER_POOL_SIZE, BROWSER_MAX_PAGES 등)
+- RECALL_PASSAGE_INDEX: "1"이면 긴 리콜 문서를 청크로 나눠 문단 단위 보조 컬렉션에도 적재 (기본 "0")
+- RECALL_PASSAGE_MIN_CHARS: 문단 색인 대상 최소 문서 길이 (기본 2400)
+- HTML 파서 백엔드는 utils/html_parsing.py 참고 (HTML_PARSER)
 """
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from bs4 import BeautifulSoup
-import time
+try:
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+    SELENIUM_AVAILABLE = True
+except ImportError:  # 브라우저/셀레니움이 없는 호스트에서는 http 모드만 사용
+    SELENIUM_AVAILABLE = False
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import hashlib
+import threading
 import os
 import json
 import re
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+from urllib.parse import urljoin, urlsplit, urlunsplit
 import streamlit as st
 from langchain_community.vectorstores import Chroma
 from langchain_openai import OpenAIEmbeddings
@@ -23,42 +40,78 @@ from langchain_core.documents import Document
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+from utils.html_parsing import make_soup, SoupStrainer
+from utils.instrumentation import timed, timed_call
+from utils.polite_fetcher import fetch_concurrently, get_host_limiter
+from utils.http_cache import cached_get
+from utils.crawl_state import get_crawl_state
+from utils.browser_pool import get_browser_pool, wait_stale
+from utils.deadline import answer_cutoff, expired
+
+# 청크 분할 시 중간에서 잘리지 않도록 보호할 정보 (회사명, 제품 수량, 로트 번호, 전화번호)
+# 회사명 패턴 '[A-Z][a-zA-Z\s&.,]+ <접미사>'는 정규식으로 돌리면 긴 문단에서 역추적이 제곱으로 늘어나므로
+# 같은 매칭 결과를 문자군 구간 단위로 직접 계산 (_company_spans)
+_COMPANY_SUFFIXES = [re.compile(r' LLC', re.I), re.compile(r' Inc\.', re.I), re.compile(r' Company', re.I)]
+_COMPANY_NAME_RUN = re.compile(r'[a-zA-Z\s&.,]+', re.I)
+_COMPANY_NAME_START = re.compile(r'[A-Z]', re.I)
+_PROTECT_PATTERNS = [
+    re.compile(r'\d+\s*boxes?\s*of\s*[^,]+', re.I),  # 제품 수량
+    re.compile(r'Lot\s*#?\s*\d+', re.I),  # 로트 번호
+    re.compile(r'1-\d{3}-\d{3}-\d{4}', re.I),  # 전화번호
+]
+_PROTECT_TOKEN = re.compile(r'__PROTECT_\d+_\d+__')
+
+def _company_spans(text: str, suffix) -> Iterator[tuple]:
+    """'[A-Z][a-zA-Z\\s&.,]+ <접미사>' 매칭 구간 - 문자군 구간마다 첫 글자부터 마지막 접미사까지"""
+    for run in _COMPANY_NAME_RUN.finditer(text):
+        first = _COMPANY_NAME_START.search(text, run.start(), run.end())
+        if not first:
+            continue
+        last = None
+        for last in suffix.finditer(text, first.start() + 2, run.end()):
+            pass
+        if last:
+            yield first.start(), last.end()
+
+def _protect_spans(text: str, index: int) -> Iterator[tuple]:
+    if index < len(_COMPANY_SUFFIXES):
+        return _company_spans(text, _COMPANY_SUFFIXES[index])
+    return (match.span() for match in _PROTECT_PATTERNS[index - len(_COMPANY_SUFFIXES)].finditer(text))
+
+def protect_important_info(text: str) -> tuple:
+    """중요한 정보를 __PROTECT_i_j__ 토큰으로 치환 (패턴마다 한 번의 순회로 재구성)"""
+    protected_refs = {}
+    for i in range(len(_COMPANY_SUFFIXES) + len(_PROTECT_PATTERNS)):
+        parts = []
+        cursor = 0
+        for j, (start, end) in enumerate(_protect_spans(text, i)):
+            ref_id = f"__PROTECT_{i}_{j}__"
+            protected_refs[ref_id] = text[start:end]
+            parts.append(text[cursor:start])
+            parts.append(ref_id)
+            cursor = end
+        if parts:
+            parts.append(text[cursor:])
+            text = "".join(parts)
+    return text, protected_refs
+
+def restore_protected_info(text: str, protected_refs: Dict[str, str]) -> str:
+    """보호 토큰 복원 (다른 보호 정보를 감싼 토큰도 끝까지 복원)"""
+    def restore(match):
+        original = protected_refs.get(match.group())
+        return _PROTECT_TOKEN.sub(restore, original) if original is not None else match.group()
+    return _PROTECT_TOKEN.sub(restore, text)
 
 def create_recall_chunks(text, chunk_size=800, overlap_size=120):
-    """리콜 Company Announcement 텍스트를 청크로 분할 (기존 코드와 동일)"""
-    
+    """
+    리콜 Company Announcement 텍스트를 청크로 분할 (기존 분할 경계와 동일, 텍스트 길이에 선형)
+    - 보호 정보 치환은 패턴마다 한 번의 순회, 복원은 청크마다 토큰 정규식 한 번
+    - 분할점은 창의 70% 이후 마지막 공백/줄바꿈 뒤 (기존 구분자 목록 '. ', ', ', '\n\n' 등은 모두
+      공백/줄바꿈으로 끝나므로 가장 뒤의 분할점은 항상 마지막 공백/줄바꿈 바로 뒤와 같음)
+    """
     if not text or len(text.strip()) < 100:
         return []
     
-    def protect_important_info(text):
-        """중요한 정보 보호 (회사명, 제품명, 날짜 등)"""
-        patterns = [
-            r'[A-Z][a-zA-Z\s&.,]+ LLC',  # 회사명
-            r'[A-Z][a-zA-Z\s&.,]+ Inc\.',  # 회사명
-            r'[A-Z][a-zA-Z\s&.,]+ Company',  # 회사명
-            r'\d+\s*boxes?\s*of\s*[^,]+',  # 제품 수량
-            r'Lot\s*#?\s*\d+',  # 로트 번호
-            r'1-\d{3}-\d{3}-\d{4}',  # 전화번호
-        ]
-        
-        protected_refs = {}
-        protected_text = text
-        
-        for i, pattern in enumerate(patterns):
-            matches = list(re.finditer(pattern, protected_text, re.IGNORECASE))
-            for j, match in enumerate(matches):
-                ref_id = f"__PROTECT_{i}_{j}__"
-                protected_refs[ref_id] = match.group()
-                protected_text = protected_text.replace(match.group(), ref_id, 1)
-        
-        return protected_text, protected_refs
-    
-    def restore_protected_info(text, protected_refs):
-        """보호된 정보 복원"""
-        for ref_id, original_text in protected_refs.items():
-            text = text.replace(ref_id, original_text)
-        return text
-    
     # 정보 보호
     protected_text, protected_refs = protect_important_info(text)
     
@@ -67,37 +120,27 @@ def create_recall_chunks(text, chunk_size=800, overlap_size=120):
     start = 0
     min_chunk_size = 150
     max_chunk_size = 1200
+    length = len(protected_text)
     
-    while start < len(protected_text):
+    while start < length:
         end = start + chunk_size
         
-        if end >= len(protected_text):
-            chunk = protected_text[start:]
-            if chunk.strip() and len(chunk.strip()) >= min_chunk_size:
-                restored_chunk = restore_protected_info(chunk.strip(), protected_refs)
-                chunks.append(restored_chunk)
+        if end >= length:
+            chunk = protected_text[start:].strip()
+            if chunk and len(chunk) >= min_chunk_size:
+                chunks.append(restore_protected_info(chunk, protected_refs))
             break
         
-        # 적절한 분할점 찾기
-        chunk_text = protected_text[start:end]
-        split_candidates = []
-        
-        separators = ['. ', '.\n', ';\n', '; ', ',\n', ', ', ')\n', ') ', '\n\n', '\n', ' ']
-        
-        for sep in separators:
-            last_sep_pos = chunk_text.rfind(sep)
-            if last_sep_pos > chunk_size * 0.7:
-                split_candidates.append(last_sep_pos + len(sep))
-        
-        if split_candidates:
-            actual_end = start + max(split_candidates)
+        # 적절한 분할점 찾기 (창 안의 마지막 공백/줄바꿈)
+        last_break = max(protected_text.rfind(' ', start, end), protected_text.rfind('\n', start, end)) - start
+        if last_break > chunk_size * 0.7:
+            actual_end = start + last_break + 1
         else:
             actual_end = min(end, start + max_chunk_size)
         
         chunk = protected_text[start:actual_end].strip()
         if chunk and len(chunk) >= min_chunk_size:
-            restored_chunk = restore_protected_info(chunk, protected_refs)
-            chunks.append(restored_chunk)
+            chunks.append(restore_protected_info(chunk, protected_refs))
         
         # 다음 청크 시작점 (오버랩 적용)
         start = max(actual_end - overlap_size, start + min_chunk_size)
@@ -105,21 +148,11 @@ def create_recall_chunks(text, chunk_size=800, overlap_size=120):
     return chunks
 
 def get_latest_date_from_vectorstore(vectorstore):
-    """벡터스토어에서 가장 최근 날짜 조회"""
+    """벡터스토어의 가장 최근 날짜 조회 (크롤링 상태 저장소의 high-water mark 사용)"""
     try:
-        all_data = vectorstore.get()
-        metadatas = all_data.get('metadatas', [])
-        
-        latest_date = None
-        for metadata in metadatas:
-            if metadata and metadata.get('effective_date'):
-                date_str = metadata['effective_date']
-                try:
-                    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                    if latest_date is None or date_obj > latest_date:
-                        latest_date = date_obj
-                except:
-                    continue
+        state = get_crawl_state()
+        state.sync_with_vectorstore(vectorstore)
+        latest_date = state.high_water_mark()
         
         if latest_date:
             print(f"📅 벡터DB 최신 날짜: {latest_date.strftime('%Y-%m-%d')}")
@@ -134,47 +167,197 @@ def get_latest_date_from_vectorstore(vectorstore):
         print(f"최신 날짜 조회 오류: {e}")
         return datetime.now() - timedelta(days=30)
 
-# utils/fda_realtime_crawler.py 의 FDARealtimeCrawler 클래스 수정
+# 크롤링 설정
+FDA_CRAWL_MODE = os.getenv("FDA_CRAWL_MODE", "auto").lower()
+FDA_BASE_URL = os.getenv("FDA_BASE_URL", "https://www.fda.gov").rstrip("/")
+RECALL_LISTING_PATH = "/safety/recalls-market-withdrawals-safety-alerts"
+RECALL_DATATABLE_PATH = "/datatables/views/ajax"
+FOOD_BEVERAGES_PRODUCT_ID = "2323"  # Product Type 필터의 Food & Beverages 값
+
+# 목록 테이블(#datatable)이 내부적으로 호출하는 DataTables 뷰 파라미터
+RECALL_DATATABLE_PARAMS = {
+    "view_name": "recall_solr_index",
+    "view_display_id": "recall_datatable_block_1",
+    "search_api_fulltext": "",
+}
+LISTING_PAGE_SIZE = 25
+MAX_LISTING_PAGES = 5
+MAX_RECALLS = int(os.getenv("FDA_MAX_RECALLS", "30"))
+INGEST_BATCH_SIZE = 5  # 스트리밍 적재 시 벡터스토어에 한 번에 추가할 문서 수
+UPSERT_BATCH_SIZE = 64  # upsert 1회당 임베딩할 최대 문서 수
+RECALL_PASSAGE_INDEX = os.getenv("RECALL_PASSAGE_INDEX", "0") == "1"
+RECALL_PASSAGE_MIN_CHARS = int(os.getenv("RECALL_PASSAGE_MIN_CHARS", "2400"))
+RECALL_PASSAGE_COLLECTION = "FDA_recall_passages"
+HTTP_TIMEOUT = (5, 15)  # (연결, 읽기) 초
+
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; RiskStreamlitApp/1.0; FDA recall monitor)",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    """커넥션 풀을 재사용하는 공용 requests 세션 (일시 오류는 짧게 재시도)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                retry = Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                              allowed_methods=["GET"], respect_retry_after_header=True)
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(HTTP_HEADERS)
+                _session = session
+    return _session
+
+def _parse_date_text(date_text: str) -> str:
+    """'June 30, 2025' → '2025-06-30' (실패 시 빈 문자열)"""
+    if not date_text:
+        return ""
+    try:
+        return datetime.strptime(date_text.strip(), '%B %d, %Y').strftime('%Y-%m-%d')
+    except ValueError:
+        return ""
+
+# 상세 페이지는 본문(<main>)만 파싱 - 헤더/메뉴/푸터는 트리를 만들지 않음
+_DETAIL_STRAINER = SoupStrainer("main")
+_LINK_STRAINER = SoupStrainer("a", href=True)
+
+def parse_recall_detail(html: str, url: str) -> Dict[str, Any]:
+    """리콜 상세 페이지 HTML에서 제목/날짜/Company Announcement 전체 내용 추출"""
+    soup = make_soup(html, only=_DETAIL_STRAINER)
+
+    title = ""
+    for selector in ['h1.content-title', 'h1[class*="content-title"]', 'h1']:
+        title_element = soup.select_one(selector)
+        if title_element:
+            title = title_element.get_text().strip()
+            break
+
+    # Summary 섹션에서 날짜 추출
+    effective_date = ""
+    last_updated = ""
+    summary_section = soup.find('h2', string='Summary')
+    if summary_section:
+        summary_content = summary_section.find_next('div', class_='inset-column')
+        if summary_content:
+            for dt in summary_content.find_all('dt'):
+                if 'Company Announcement Date' in dt.get_text():
+                    dd = dt.find_next('dd')
+                    time_element = dd.find('time') if dd else None
+                    if time_element:
+                        effective_date = _parse_date_text(time_element.get_text())
+                    break
+
+            for dt in summary_content.find_all('dt'):
+                if 'FDA Publish Date' in dt.get_text():
+                    dd = dt.find_next('dd')
+                    time_element = dd.find('time') if dd else None
+                    if time_element:
+                        last_updated = _parse_date_text(time_element.get_text())
+                    break
+
+    # Company Announcement 전체 내용 (청크 없이)
+    company_announcement = ""
+    announcement_section = soup.find('h2', string='Company Announcement')
+    if announcement_section:
+        current = announcement_section.find_next_sibling()
+        announcement_parts = []
+        while current and current.name != 'hr':
+            if current.name == 'p':
+                text = current.get_text().strip()
+                if text:
+                    announcement_parts.append(text)
+            current = current.find_next_sibling()
+        company_announcement = '\n\n'.join(announcement_parts)
+
+    return {
+        "document_type": "recall",
+        "category": "Food & Beverages",
+        "title": title,
+        "url": url,
+        "effective_date": effective_date,
+        "last_updated": last_updated,
+        "full_content": company_announcement
+    }
+
+def parse_listing_rows(payload: Dict[str, Any], base_url: str = FDA_BASE_URL) -> List[Dict[str, Any]]:
+    """
+    DataTables AJAX 응답의 행을 [{url, table_date, date_text}]로 변환
+    각 행의 첫 칸은 날짜, 둘째 칸은 상세 페이지 링크가 포함된 브랜드명 HTML
+    """
+    cell_rows = []
+    for row in payload.get("data", []):
+        cells = list(row.values()) if isinstance(row, dict) else list(row)
+        if len(cells) >= 2:
+            cell_rows.append((str(cells[0]), str(cells[1])))
+    if not cell_rows:
+        return []
+
+    # 셀마다 따로 파싱하지 않고 한 페이지 분량을 표 하나로 묶어 한 번에 파싱
+    table = make_soup("<table>" + "".join(f"<tr><td>{date}</td><td>{link}</td></tr>" for date, link in cell_rows) + "</table>")
+    parsed = [tr.find_all('td', recursive=False) for tr in table.find_all('tr')]
+    if len(parsed) != len(cell_rows) or any(len(cells) != 2 for cells in parsed):
+        # 셀 HTML이 표 구조를 깨뜨리면 셀 단위로 따로 파싱
+        parsed = [(make_soup(date), make_soup(link, only=_LINK_STRAINER)) for date, link in cell_rows]
+
+    rows = []
+    for date_cell, link_cell in parsed:
+        date_text = date_cell.get_text().strip()
+        link = link_cell.find('a', href=True)
+        if not link:
+            continue
+        try:
+            table_date = datetime.strptime(date_text, '%m/%d/%Y')
+        except ValueError:
+            print(f"      ⚠️ 날짜 파싱 실패: {date_text}")
+            continue
+        rows.append({
+            'url': urljoin(base_url + "/", link['href']),
+            'table_date': table_date,
+            'date_text': date_text
+        })
+    return rows
 
 class FDARealtimeCrawler:
-    def __init__(self):
-        self.base_url = "https://www.fda.gov/safety/recalls-market-withdrawals-safety-alerts"
-        self.driver = None
+    def __init__(self, base_url: Optional[str] = None, mode: Optional[str] = None):
+        self.site_url = (base_url or FDA_BASE_URL).rstrip("/")
+        self.base_url = self.site_url + RECALL_LISTING_PATH
+        self.mode = (mode or FDA_CRAWL_MODE).lower()
         
+    # 크롤러는 세션 간에 공유(get_crawler)되므로 대여한 드라이버는 인스턴스에 두지 않고 크롤링 호출마다 따로 보관
     def _init_driver(self):
-        """Selenium 드라이버 초기화 - 에러 메시지 숨김"""
-        if self.driver is None:
-            service = Service(ChromeDriverManager().install())
-            options = webdriver.ChromeOptions()
-            options.add_argument('--headless')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-logging')
-            options.add_argument('--log-level=3')
-            options.add_argument('--silent')
-            options.add_argument('--disable-web-security')
-            options.add_experimental_option('excludeSwitches', ['enable-logging'])
-            options.add_experimental_option('useAutomationExtension', False)
-            
-            self.driver = webdriver.Chrome(service=service, options=options)
+        """Selenium 드라이버 대여 - 브라우저 풀의 warm 드라이버 재사용"""
+        if not SELENIUM_AVAILABLE:
+            raise RuntimeError("selenium이 설치되어 있지 않습니다 (FDA_CRAWL_MODE=http 사용)")
+        return get_browser_pool().acquire()
 
-    def _close_driver(self):
-        """드라이버 종료 - 누락된 메서드 추가"""
-        if self.driver:
+    def _close_driver(self, driver, broken: bool = False):
+        """드라이버 반납 - 종료하지 않고 풀로 돌려보냄 (broken=True면 폐기)"""
+        if driver is not None:
             try:
-                self.driver.quit()
+                get_browser_pool().release(driver, broken=broken)
             except Exception as e:
-                print(f"드라이버 종료 중 오류: {e}")
-            finally:
-                self.driver = None
+                print(f"드라이버 반납 중 오류: {e}")
+
+    def _navigate(self, driver, url: str) -> bool:
+        """페이지 이동 + 문서 준비 대기 (풀의 페이지 수 집계 포함)"""
+        return get_browser_pool().navigate(driver, url)
 
-    def check_food_beverages_in_summary(self, url):
+    def _first_table_row(self, driver):
+        """테이블 첫 행 (필터/페이지 이동 후 재렌더링 감지용)"""
+        rows = driver.find_elements(By.CSS_SELECTOR, "#datatable tbody tr")
+        return rows[0] if rows else None
+
+    def check_food_beverages_in_summary(self, url, driver):
         try:
-            self.driver.get(url)
-            time.sleep(1.5)
+            self._navigate(driver, url)
             
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = make_soup(driver.page_source, only=_DETAIL_STRAINER)
             
             # Summary 섹션에서 Product Type만 확인
             summary_section = soup.find('h2', string='Summary')
@@ -212,61 +395,160 @@ class FDARealtimeCrawler:
 
     def get_existing_urls_from_vectorstore(self, vectorstore):
         try:
-            existing_data = vectorstore.get()
-            existing_urls = set()
-            for metadata in existing_data.get('metadatas', []):
-                if metadata and 'url' in metadata:
-                    existing_urls.add(metadata['url'])
+            state = get_crawl_state()
+            state.sync_with_vectorstore(vectorstore)
+            existing_urls = state.all_urls()
             print(f"📋 기존 벡터DB URL: {len(existing_urls)}개")
             return existing_urls
         except Exception as e:
             print(f"기존 URL 확인 오류: {e}")
             return set()
     
-    def crawl_latest_recalls(self, after_date=None, vectorstore=None) -> List[Dict]:
-        """날짜 기반 필터링으로 크롤링"""
+    @timed("crawl.fda.latest_recalls", kind="crawl")
+    def crawl_latest_recalls(self, after_date=None, vectorstore=None, max_recalls: Optional[int] = None) -> List[Dict]:
+        """날짜 기반 필터링으로 크롤링 (전체 결과를 모아서 반환)"""
+        return list(self.iter_latest_recalls(after_date, max_recalls=max_recalls))
+
+    def iter_latest_recalls(self, after_date=None, max_recalls: Optional[int] = None,
+                            deadline: Optional[float] = None) -> Iterator[Dict]:
+        """
+        기준일 이후 리콜을 수집되는 순서대로 반환 - http 모드 우선, 목록 수집 실패 시 selenium으로 대체 (auto)
+        http 모드에서는 상세 페이지를 호스트별 제한 안에서 병렬 수집
+        deadline: 질문 응답 시간 예산 - 답변 생성 시간만 남으면 수집 중단 (utils/deadline.py)
+        """
         if after_date is None:
             after_date = datetime.now() - timedelta(days=15)
+        max_recalls = max_recalls or MAX_RECALLS
+        
+        if self.mode in ("auto", "http"):
+            try:
+                targets = self.collect_listing_targets(after_date, max_recalls)
+            except Exception as e:
+                print(f"⚠️ HTTP 목록 수집 실패: {e}")
+                if self.mode == "http" or not SELENIUM_AVAILABLE:
+                    return
+                print("🌐 Selenium 크롤링으로 대체")
+            else:
+                yield from self.fetch_details_http(targets, deadline)
+                return
+        
+        yield from self._crawl_latest_recalls_selenium(after_date, max_recalls, deadline)
+
+    def fetch_listing_page(self, start: int, length: int = LISTING_PAGE_SIZE) -> Dict[str, Any]:
+        """Food & Beverages 필터가 적용된 목록 테이블 데이터 한 페이지 (JSON)"""
+        params = {
+            **RECALL_DATATABLE_PARAMS,
+            "field_regulated_product_field": FOOD_BEVERAGES_PRODUCT_ID,
+            "draw": start // length + 1,
+            "start": start,
+            "length": length,
+        }
+        response = get_http_session().get(
+            self.site_url + RECALL_DATATABLE_PATH, params=params, timeout=HTTP_TIMEOUT,
+            headers={"X-Requested-With": "XMLHttpRequest", "Referer": self.base_url},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def fetch_recall_detail(self, url: str) -> Optional[Dict[str, Any]]:
+        """상세 페이지를 HTTP로 받아 파싱 (브라우저 불필요, 디스크 캐시/조건부 GET 사용, 네트워크 요청만 호스트 제한)"""
+        response = cached_get(url, session=get_http_session(), timeout=HTTP_TIMEOUT, limiter=get_host_limiter())
+        response.raise_for_status()
+        return parse_recall_detail(response.text, url)
+
+    def collect_listing_targets(self, cutoff_date, max_recalls: int = MAX_RECALLS) -> List[Dict]:
+        """목록 데이터에서 기준일 이후 리콜 URL 수집 (최대 max_recalls건)"""
+        targets = []
+        processed_urls = set()
+        print(f"📅 [HTTP] 수집 기준: {cutoff_date.strftime('%Y-%m-%d')} 이후 데이터만 수집")
+        
+        for page in range(MAX_LISTING_PAGES):
+            payload = timed_call(
+                "crawl.fda.listing", lambda: self.fetch_listing_page(page * LISTING_PAGE_SIZE),
+                kind="http", page=page + 1
+            )
+            rows = parse_listing_rows(payload, self.site_url)
+            if page == 0 and not rows and payload.get("recordsFiltered", 0):
+                # 응답 형식이 바뀌어 행을 해석하지 못한 경우 - selenium 대체 경로로
+                raise ValueError("목록 응답에서 리콜 행을 찾을 수 없음")
+            
+            # 이미 적재된 URL은 상세 페이지를 받지 않음 (크롤링 상태 저장소 인덱스 조회)
+            candidates = [row for row in rows if row['table_date'] >= cutoff_date and row['url'] not in processed_urls]
+            known_urls = get_crawl_state().known_urls(row['url'] for row in candidates)
+            page_targets = [row for row in candidates if row['url'] not in known_urls]
+            processed_urls.update(row['url'] for row in page_targets)
+            targets.extend(page_targets)
+            print(f"페이지 {page + 1}: {len(rows)}행 중 수집 대상 {len(page_targets)}개 (기존 {len(known_urls)}개 제외)")
+            
+            # 목록은 날짜 내림차순 - 기준일 이전 행이 나오거나 마지막 페이지면 중단
+            found_old_data = any(row['table_date'] < cutoff_date for row in rows)
+            if len(targets) >= max_recalls or found_old_data or len(rows) < LISTING_PAGE_SIZE:
+                break
         
-        # 🆕 벡터DB 최신 날짜 이후만 수집
-        cutoff_date = after_date  # 하루 여유 제거, 정확한 날짜부터 수집
+        return targets[:max_recalls]
+
+    def fetch_details_http(self, targets: List[Dict], deadline: Optional[float] = None) -> Iterator[Dict]:
+        """상세 페이지 병렬 수집 - 완료되는 순서대로 반환 (targets: [{url, date_text}], deadline 도달 시 중단)"""
+        collected = 0
+        for row, recall_data, error in fetch_concurrently(
+            targets,
+            lambda row: timed_call("crawl.fda.detail", lambda: self.fetch_recall_detail(row['url']), kind="http", url=row['url']),
+            url_of=lambda row: row['url'],
+            stop_at=answer_cutoff(deadline),
+            self_limited=True,
+        ):
+            if error is not None:
+                print(f"    ❌ 데이터 추출 오류 ({row['date_text']}): {error}")
+                continue
+            if recall_data:
+                collected += 1
+                print(f"    ✅ 수집 완료 ({collected}/{len(targets)}): {recall_data['title'][:40]}... (날짜: {recall_data.get('effective_date', 'N/A')})")
+                yield recall_data
+        
+        print(f"크롤링 완료: Food & Beverages 리콜 {collected}건 수집")
+
+    def _crawl_latest_recalls_selenium(self, cutoff_date, max_recalls: int = MAX_RECALLS,
+                                       deadline: Optional[float] = None) -> List[Dict]:
+        """헤드리스 Chrome으로 목록 페이지를 조작해 수집 (http 모드 대체 경로, 최대 max_recalls건)"""
         recalls = []
+        broken = False  # WebDriverException으로 중단되면 드라이버를 풀에 돌려놓지 않고 폐기
+        driver = None
         
         try:
-            self._init_driver()
+            driver = timed_call("crawl.fda.driver_init", self._init_driver, kind="crawl")
             
-            self.driver.get(self.base_url)
-            time.sleep(3)
+            timed_call("crawl.fda.listing", lambda: self._navigate(driver, self.base_url), kind="http")
             
             print("🎯 Food & Beverages 필터 적용 중...")
             
             # Product Type 드롭다운 클릭
             try:
-                product_type_dropdown = WebDriverWait(self.driver, 10).until(
+                product_type_dropdown = WebDriverWait(driver, 10).until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, "select[name='field_regulated_product_field']"))
                 )
                 product_type_dropdown.click()
-                time.sleep(1)
                 
                 # Food & Beverages 옵션 선택
-                food_beverages_option = WebDriverWait(self.driver, 5).until(
+                food_beverages_option = WebDriverWait(driver, 5).until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, "option[value='2323']"))
                 )
+                unfiltered_row = self._first_table_row(driver)
                 food_beverages_option.click()
-                time.sleep(2)
+                # 필터 결과로 테이블이 다시 그려질 때까지 대기
+                wait_stale(driver, unfiltered_row, timeout=10)
                 
                 print("✅ Food & Beverages 필터 적용 완료")
                 
             except Exception as e:
                 print(f"❌ 필터 적용 실패: {e}")
+                broken = isinstance(e, WebDriverException)
                 return []
             
             # 필터 적용 후 테이블 로딩 대기
             try:
-                WebDriverWait(self.driver, 15).until(
-                    EC.presence_of_element_located((By.ID, "datatable"))
+                WebDriverWait(driver, 15).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "#datatable tbody tr td a"))
                 )
-                time.sleep(3)
                 print("📊 필터링된 테이블 로딩 완료")
             except TimeoutException:
                 print("❌ 필터링된 테이블 로딩 실패")
@@ -284,7 +566,7 @@ class FDARealtimeCrawler:
                 # 현재 페이지의 리콜 링크 및 날짜 수집
                 page_recall_data = []
                 try:
-                    table = self.driver.find_element(By.ID, "datatable")
+                    table = driver.find_element(By.ID, "datatable")
                     rows = table.find_elements(By.XPATH, ".//tbody/tr")
                     
                     for row in rows:
@@ -334,6 +616,7 @@ class FDARealtimeCrawler:
                     
                 except Exception as e:
                     print(f"페이지 {page} 링크 수집 오류: {e}")
+                    broken = isinstance(e, WebDriverException)
                     break
                 
                 # 🆕 수집 대상이 없으면서 오래된 데이터를 발견했으면 중단
@@ -342,20 +625,27 @@ class FDARealtimeCrawler:
                     break
                 
                 # 개별 리콜 페이지 처리
-                for i, recall_info in enumerate(page_recall_data[:10]):
+                page_targets = page_recall_data[:max_recalls - len(recalls)]
+                for i, recall_info in enumerate(page_targets):
+                    if expired(deadline):
+                        print(f"⏱️ 수집 시간 제한 도달 - {len(recalls)}건까지만 수집")
+                        return recalls
                     try:
                         recall_url = recall_info['url']
-                        print(f"  데이터 추출 중 ({i+1}/{min(10, len(page_recall_data))}): {recall_info['date_text']}...")
+                        print(f"  데이터 추출 중 ({i+1}/{len(page_targets)}): {recall_info['date_text']}...")
                         
                         # 메타데이터 추출
-                        recall_data = self.extract_recall_metadata_direct(recall_url)
+                        recall_data = timed_call(
+                            "crawl.fda.detail", lambda: self.extract_recall_metadata_direct(recall_url, driver),
+                            kind="http", url=recall_url
+                        )
                         
                         if recall_data:
                             print(f"    ✅ 수집 완료: {recall_data['title'][:40]}... (날짜: {recall_data.get('effective_date', 'N/A')})")
                             recalls.append(recall_data)
                             
                             # 충분히 수집했으면 중단
-                            if len(recalls) >= 10:
+                            if len(recalls) >= max_recalls:
                                 print(f"목표 달성: {len(recalls)}건 수집 완료")
                                 return recalls
                         
@@ -366,7 +656,7 @@ class FDARealtimeCrawler:
                 # 다음 페이지로 이동
                 if page < max_pages and page_recall_data:  # 수집 데이터가 있을 때만 다음 페이지
                     try:
-                        next_button = WebDriverWait(self.driver, 8).until(
+                        next_button = WebDriverWait(driver, 8).until(
                             EC.element_to_be_clickable((By.ID, "datatable_next"))
                         )
                         
@@ -375,11 +665,14 @@ class FDARealtimeCrawler:
                             break
                         
                         next_link = next_button.find_element(By.TAG_NAME, "a")
-                        self.driver.execute_script("arguments[0].click();", next_link)
-                        time.sleep(3)
+                        previous_row = self._first_table_row(driver)
+                        driver.execute_script("arguments[0].click();", next_link)
+                        if not wait_stale(driver, previous_row, timeout=10):
+                            print("다음 페이지 로딩 대기 시간 초과")
                         
                     except Exception as e:
                         print(f"페이지 이동 오류: {e}")
+                        broken = isinstance(e, WebDriverException)
                         break
                 else:
                     print("수집할 데이터가 없어 크롤링 종료")
@@ -390,132 +683,115 @@ class FDARealtimeCrawler:
             
         except Exception as e:
             print(f"크롤링 전체 오류: {e}")
+            broken = isinstance(e, WebDriverException)
             return []
             
         finally:
-            self._close_driver()
+            self._close_driver(driver, broken=broken)
 
     
 
-    def extract_recall_metadata(self, url):
-        """메타데이터 추출 - 청크 없이 전체 내용 저장"""
+    def extract_recall_metadata(self, url, driver):
+        """메타데이터 추출 (Selenium) - 청크 없이 전체 내용 저장"""
         try:
-            self.driver.get(url)
-            time.sleep(2)
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-        
-            # 제목, 날짜 추출 (기존과 동일)
-            title = ""
-            title_selectors = ['h1.content-title', 'h1[class*="content-title"]', 'h1']
-            
-            for selector in title_selectors:
-                title_element = soup.select_one(selector)
-                if title_element:
-                    title = title_element.get_text().strip()
-                    break
-            
-            # 날짜 정보 추출 (기존과 동일)
-            effective_date = ""
-            last_updated = ""
-            
-            def parse_date_text(date_text):
-                if not date_text:
-                    return ""
-                try:
-                    date_obj = datetime.strptime(date_text.strip(), '%B %d, %Y')
-                    return date_obj.strftime('%Y-%m-%d')
-                except:
-                    return ""
-            
-            # Summary 섹션에서 날짜 추출 (기존과 동일)
-            summary_section = soup.find('h2', string='Summary')
-            if summary_section:
-                summary_content = summary_section.find_next('div', class_='inset-column')
-                if summary_content:
-                    for dt in summary_content.find_all('dt'):
-                        if 'Company Announcement Date' in dt.get_text():
-                            dd = dt.find_next('dd')
-                            if dd:
-                                time_element = dd.find('time')
-                                if time_element:
-                                    effective_date = parse_date_text(time_element.get_text())
-                                break
-                    
-                    for dt in summary_content.find_all('dt'):
-                        if 'FDA Publish Date' in dt.get_text():
-                            dd = dt.find_next('dd')
-                            if dd:
-                                time_element = dd.find('time')
-                                if time_element:
-                                    last_updated = parse_date_text(time_element.get_text())
-                                break
-            
-            # 🆕 Company Announcement 전체 내용 저장 (청크 없이)
-            company_announcement = ""
-            announcement_section = soup.find('h2', string='Company Announcement')
-            if announcement_section:
-                current = announcement_section.find_next_sibling()
-                announcement_parts = []
-                
-                while current and current.name != 'hr':
-                    if current.name == 'p':
-                        text = current.get_text().strip()
-                        if text:
-                            announcement_parts.append(text)
-                    current = current.find_next_sibling()
-                
-                company_announcement = '\n\n'.join(announcement_parts)
-        
-            return {
-                "document_type": "recall",
-                "category": "Food & Beverages", 
-                "title": title,
-                "url": url,
-                "effective_date": effective_date,
-                "last_updated": last_updated,
-                "full_content": company_announcement  # 🆕 청크 대신 전체 내용
-            }
+            self._navigate(driver, url)
+            WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "h1")))
+            return parse_recall_detail(driver.page_source, url)
         except Exception as e:
             print(f"메타데이터 추출 오류: {e}")
             return None
 
         
-    def extract_recall_metadata_direct(self, url):
+    def extract_recall_metadata_direct(self, url, driver):
         """Food & Beverages 확인 없이 바로 메타데이터 추출"""
-        return self.extract_recall_metadata(url)  # 기존 메서드 재사용
+        return self.extract_recall_metadata(url, driver)  # 기존 메서드 재사용
+
+def normalize_recall_url(url: str) -> str:
+    """문서 ID용 URL 정규화 (스킴/호스트 소문자, 프래그먼트와 끝 슬래시 제거)"""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+def recall_document_id(url: str) -> str:
+    """정규화된 URL 해시 기반 결정적 문서 ID - 같은 리콜은 항상 같은 ID로 upsert"""
+    return "recall-" + hashlib.sha256(normalize_recall_url(url).encode("utf-8")).hexdigest()
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def get_passage_vectorstore(vectorstore) -> Chroma:
+    """리콜 문서와 같은 저장소/임베딩을 쓰는 문단 단위 보조 컬렉션"""
+    return Chroma(
+        client=vectorstore._client,
+        collection_name=RECALL_PASSAGE_COLLECTION,
+        embedding_function=vectorstore._embedding_function,
+    )
+
+def index_recall_passages(vectorstore, documents: List[Document], ids: List[str], replace: bool = True) -> int:
+    """
+    긴 리콜 문서를 create_recall_chunks로 나눠 보조 컬렉션에 upsert (ID: <문서 ID>:p<순번>)
+    replace=True면 문서별 기존 문단을 먼저 삭제 (내용이 바뀌어 문단 수가 줄어든 경우 대비)
+    """
+    passages, passage_ids, parents = [], [], []
+    for doc_id, doc in zip(ids, documents):
+        if len(doc.page_content) < RECALL_PASSAGE_MIN_CHARS:
+            continue
+        parents.append(doc_id)
+        for i, chunk in enumerate(create_recall_chunks(doc.page_content)):
+            passages.append(Document(page_content=chunk, metadata={
+                "document_type": "recall_passage",
+                "parent_id": doc_id,
+                "chunk_index": i,
+                "title": doc.metadata.get("title", ""),
+                "url": doc.metadata.get("url", ""),
+                "effective_date": doc.metadata.get("effective_date", ""),
+            }))
+            passage_ids.append(f"{doc_id}:p{i}")
+    if not parents:
+        return 0
+    
+    store = get_passage_vectorstore(vectorstore)
+    if replace:
+        for doc_id in parents:
+            store._collection.delete(where={"parent_id": doc_id})
+    for i in range(0, len(passages), UPSERT_BATCH_SIZE):
+        batch = passages[i:i + UPSERT_BATCH_SIZE]
+        store.add_texts(
+            [doc.page_content for doc in batch],
+            metadatas=[doc.metadata for doc in batch],
+            ids=passage_ids[i:i + UPSERT_BATCH_SIZE],
+        )
+    return len(passages)
+
+def search_recall_passages(vectorstore, query: str, parent_ids: Optional[List[str]] = None, k: int = 4) -> List[Document]:
+    """문단 단위 유사도 검색 (parent_ids를 주면 해당 리콜 문서의 문단으로 한정)"""
+    where = None
+    if parent_ids:
+        where = {"parent_id": parent_ids[0]} if len(parent_ids) == 1 else {"$or": [{"parent_id": p} for p in parent_ids]}
+    return get_passage_vectorstore(vectorstore).similarity_search(query, k=k, filter=where)
 
-def update_vectorstore_with_new_data(new_recalls: List[Dict], vectorstore) -> int:
-    """새로운 리콜 데이터를 벡터스토어에 추가 - 청크 없이 단일 문서로"""
-    if not new_recalls or not vectorstore:
+def update_vectorstore_with_new_data(new_recalls: List[Dict], vectorstore, raise_errors: bool = False) -> int:
+    """
+    리콜 데이터를 벡터스토어에 upsert - 청크 없이 단일 문서로
+    - 문서 ID는 URL 해시라 동시 크롤링/재적재에도 중복 문서가 생기지 않음
+    - 같은 ID의 content_hash가 같으면 임베딩 없이 건너뜀 (ID 조회만 사용, 전체 조회 없음)
+    - raise_errors=True면 upsert 오류를 0건으로 처리하지 않고 호출자에게 전달 (백필 체크포인트 보호용)
+    """
+    if not new_recalls or vectorstore is None:
         print("⚠️ 추가할 데이터가 없거나 벡터스토어가 없습니다")
         return 0
     
     try:
-        # 기존 중복 확인 (동일)
-        existing_urls = set()
-        try:
-            existing_data = vectorstore.get()
-            for metadata in existing_data.get('metadatas', []):
-                if metadata and 'url' in metadata:
-                    existing_urls.add(metadata['url'])
-            print(f"📋 기존 벡터스토어: {len(existing_urls)}개 URL 확인")
-        except Exception as e:
-            print(f"기존 데이터 확인 중 오류: {e}")
+        state = get_crawl_state()
         
-        # 🆕 새 문서들 생성 (1개 URL = 1개 문서)
-        new_documents = []
-        processed_urls = set()
+        # 🆕 문서 후보 생성 (1개 URL = 1개 문서, 배치 내 중복은 마지막 것 사용)
+        candidates: Dict[str, Document] = {}
         
         for recall in new_recalls:
             recall_url = recall.get('url', '')
-            
-            # 중복 체크
-            if recall_url in existing_urls or recall_url in processed_urls:
-                print(f"⏩ 중복 건너뛰기: {recall.get('title', '')[:50]}...")
+            if not recall_url:
                 continue
             
-            processed_urls.add(recall_url)
-            
             # 🆕 전체 내용 처리 (청크 없이)
             full_content = recall.get("full_content", "")
             if not full_content or len(full_content.strip()) < 100:
@@ -534,7 +810,7 @@ def update_vectorstore_with_new_data(new_recalls: List[Dict], vectorstore) -> in
 {full_content}
             """.strip()
             
-            # 🆕 메타데이터 (chunk_index 제거)
+            # 🆕 메타데이터 (chunk_index 제거, 변경 감지용 content_hash 추가)
             metadata = {
                 "document_type": "recall",
                 "category": recall.get('category', ''),
@@ -544,23 +820,84 @@ def update_vectorstore_with_new_data(new_recalls: List[Dict], vectorstore) -> in
                 "effective_date": recall.get('effective_date', ''),
                 "last_updated": recall.get('last_updated', ''),
                 "source": "realtime_crawl",
+                "content_hash": content_hash(structured_content),
                 "crawl_timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             }
             
-            doc = Document(page_content=structured_content, metadata=metadata)
+            candidates[recall_document_id(recall_url)] = Document(page_content=structured_content, metadata=metadata)
+        
+        if not candidates:
+            print("ℹ️ 추가할 새 문서가 없습니다")
+            return 0
+        
+        # 같은 ID 문서의 content_hash만 조회해 변경 없는 문서는 재임베딩 생략
+        stored_hashes: Dict[str, str] = {}
+        try:
+            existing = vectorstore.get(ids=list(candidates), include=["metadatas"])
+            for doc_id, meta in zip(existing.get("ids", []), existing.get("metadatas", [])):
+                stored_hashes[doc_id] = (meta or {}).get("content_hash", "")
+        except Exception as e:
+            print(f"기존 문서 확인 중 오류: {e}")
+        
+        # ID 도입 전(무작위 ID)에 적재된 URL은 상태 저장소 인덱스로 확인해 중복 추가 방지
+        legacy_urls = set()
+        missing = [doc for doc_id, doc in candidates.items() if doc_id not in stored_hashes]
+        if missing:
+            try:
+                state.sync_with_vectorstore(vectorstore)
+                legacy_urls = state.known_urls(doc.metadata["url"] for doc in missing)
+            except Exception as e:
+                print(f"기존 데이터 확인 중 오류: {e}")
+        
+        new_documents = []
+        new_ids = []
+        unchanged = []
+        for doc_id, doc in candidates.items():
+            if stored_hashes.get(doc_id) == doc.metadata["content_hash"] or (
+                doc_id not in stored_hashes and doc.metadata["url"] in legacy_urls
+            ):
+                print(f"⏩ 변경 없음 건너뛰기: {doc.metadata.get('title', '')[:50]}...")
+                unchanged.append(doc.metadata)
+                continue
             new_documents.append(doc)
+            new_ids.append(doc_id)
+        
+        # 이미 적재된 문서도 URL 인덱스에 기록 (인덱스에서 빠진 URL이 피드 확인 때마다 새 리콜로 잡히지 않도록)
+        if unchanged:
+            try:
+                state.record_ingested(unchanged)
+            except Exception as e:
+                print(f"크롤링 상태 기록 오류: {e}")
         
-        # 벡터스토어에 추가 (동일)
+        # 벡터스토어에 upsert (UPSERT_BATCH_SIZE건씩 묶어 임베딩)
         if new_documents:
             try:
-                vectorstore.add_documents(new_documents)
-                print(f"✅ 벡터스토어에 {len(new_documents)}개 새 문서 추가 완료")
+                for i in range(0, len(new_documents), UPSERT_BATCH_SIZE):
+                    batch = new_documents[i:i + UPSERT_BATCH_SIZE]
+                    vectorstore.add_texts(
+                        [doc.page_content for doc in batch],
+                        metadatas=[doc.metadata for doc in batch],
+                        ids=new_ids[i:i + UPSERT_BATCH_SIZE],
+                    )
+                # 적재 성공한 URL과 최신 날짜를 한 트랜잭션으로 기록
+                state.record_ingested([doc.metadata for doc in new_documents])
+                updated = sum(1 for doc_id in new_ids if doc_id in stored_hashes)
+                if RECALL_PASSAGE_INDEX:
+                    try:
+                        passage_count = index_recall_passages(vectorstore, new_documents, new_ids)
+                        if passage_count:
+                            print(f"📑 문단 색인 {passage_count}개 upsert")
+                    except Exception as e:
+                        print(f"⚠️ 문단 색인 실패: {e}")
+                print(f"✅ 벡터스토어에 {len(new_documents)}개 문서 upsert 완료 (갱신 {updated}개)")
                 
                 total_count = vectorstore._collection.count()
                 print(f"📊 현재 벡터스토어 총 문서 수: {total_count}개")
                 
             except Exception as e:
                 print(f"❌ 벡터스토어 추가 오류: {e}")
+                if raise_errors:
+                    raise
                 return 0
         else:
             print("ℹ️ 추가할 새 문서가 없습니다")
@@ -568,9 +905,38 @@ def update_vectorstore_with_new_data(new_recalls: List[Dict], vectorstore) -> in
         return len(new_documents)
         
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"❌ 벡터스토어 업데이트 전체 오류: {e}")
         return 0
 
+@timed("crawl.fda.stream_ingest", kind="crawl")
+def ingest_recall_stream(recalls: Iterable[Dict], vectorstore, batch_size: int = INGEST_BATCH_SIZE,
+                         deadline: Optional[float] = None) -> int:
+    """
+    수집되는 리콜을 batch_size건씩 바로 벡터스토어에 적재 (크롤링 완료를 기다리지 않음)
+    deadline: 답변 생성 시간만 남으면 스트림을 더 읽지 않고 이미 받은 건만 적재
+    """
+    if vectorstore is None:
+        print("⚠️ 벡터스토어가 없습니다")
+        return 0
+    
+    added_count = 0
+    batch = []
+    for recall in recalls:
+        batch.append(recall)
+        if expired(deadline):
+            print("⏱️ 응답 시간 제한 - 실시간 수집 중단")
+            if hasattr(recalls, "close"):
+                recalls.close()  # 진행 중인 수집 작업 취소
+            break
+        if len(batch) >= batch_size:
+            added_count += update_vectorstore_with_new_data(batch, vectorstore)
+            batch = []
+    if batch:
+        added_count += update_vectorstore_with_new_data(batch, vectorstore)
+    return added_count
+
 # 벡터스토어 상태 확인 함수 추가
 def check_vectorstore_status(vectorstore=None) -> Dict[str, Any]:
     """벡터스토어 현재 상태 확인"""
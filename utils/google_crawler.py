@@ -1,15 +1,52 @@
 # utils/google_crawler.py
 """
 구글 뉴스 RSS 피드 기반 리콜 정보 검색 모듈
+- 검색 전략(쿼리) 5개의 RSS를 공용 세션(keep-alive 연결 풀)으로 동시에 요청
+- 앞선 전략부터 모인 결과가 요청 건수에 도달하면 남은 요청은 취소 → 지연시간은 가장 느린 피드 1개 수준
+
+환경 변수
+- NEWS_RSS_WORKERS: 동시에 요청하는 RSS 피드 수 (기본 5)
+- NEWS_RSS_TIMEOUT: RSS 응답 읽기 제한 시간 초 (기본 8)
 """
+import contextvars
 import feedparser
-import requests
-from bs4 import BeautifulSoup
+import os
+import threading
 import time
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import re
 from urllib.parse import quote_plus
+from requests.adapters import HTTPAdapter
+from utils.instrumentation import timed, timed_call
+from utils.http_cache import cached_get
+from utils.html_parsing import make_soup
+
+NEWS_RSS_WORKERS = int(os.getenv("NEWS_RSS_WORKERS", "5"))
+NEWS_RSS_TIMEOUT = (3, float(os.getenv("NEWS_RSS_TIMEOUT", "8")))  # (연결, 읽기) 초
+
+# 전략별 RSS 요청 전용 스레드 풀 (질문 단위 병렬 작업 풀과 분리해 중첩 대기 방지)
+_rss_executor = ThreadPoolExecutor(max_workers=NEWS_RSS_WORKERS, thread_name_prefix="news-rss")
+_rss_session: Optional[requests.Session] = None
+_rss_session_lock = threading.Lock()
+
+def get_rss_session() -> requests.Session:
+    """구글 뉴스 RSS용 공용 세션 - 전략/질문 간에 연결 재사용"""
+    global _rss_session
+    if _rss_session is None:
+        with _rss_session_lock:
+            if _rss_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=NEWS_RSS_WORKERS)
+                session.mount("https://", adapter)
+                session.headers.update({
+                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+                    "Accept": "application/rss+xml, application/xml;q=0.9, */*;q=0.8",
+                })
+                _rss_session = session
+    return _rss_session
 
 def get_google_news_rss_url(keyword: str) -> str:
     """이 코드는 키워드로 구글 뉴스 RSS URL을 생성합니다"""
@@ -19,8 +56,58 @@ def get_google_news_rss_url(keyword: str) -> str:
     rss_url = f"https://news.google.com/rss/search?q={encoded_keyword}&hl=ko&gl=KR&ceid=KR:ko"
     return rss_url
 
+def _fetch_rss(rss_url: str):
+    """공용 세션으로 RSS를 받아 feedparser로 해석 (제한 시간 적용)"""
+    response = get_rss_session().get(rss_url, timeout=NEWS_RSS_TIMEOUT)
+    response.raise_for_status()
+    return feedparser.parse(response.content)
+
+def _strategy_results(entries, strategy: int, max_results: int) -> List[Dict]:
+    """RSS 항목 → FDA/리콜 관련 뉴스 결과 (전략당 최대 max_results개 항목 검사)"""
+    strategy_results = []
+    for entry in entries[:max_results]:
+        try:
+            pub_date = None
+            if hasattr(entry, 'published_parsed') and entry.published_parsed:
+                pub_date = datetime(*entry.published_parsed[:6])
+            
+            title = entry.title if hasattr(entry, 'title') else '제목 없음'
+            link = entry.link if hasattr(entry, 'link') else ''
+            summary = entry.summary if hasattr(entry, 'summary') else ''
+            
+            source = 'Unknown'
+            if hasattr(entry, 'source') and hasattr(entry.source, 'title'):
+                source = entry.source.title
+            
+            is_fda_related = any(term in (title + summary).lower() 
+                               for term in ['fda', '미국', 'usa', 'america', 'recall', '리콜'])
+            
+            is_recall_relevant = is_recall_related_text(title + " " + summary)
+            
+            if is_fda_related or is_recall_relevant:
+                strategy_results.append({
+                    'title': title,
+                    'link': link,
+                    'summary': summary,
+                    'published': pub_date.strftime('%Y-%m-%d %H:%M') if pub_date else 'Unknown',
+                    'source': source,
+                    'content': '',
+                    'search_strategy': strategy,
+                    'is_fda_related': is_fda_related,
+                    'is_recall_related': is_recall_relevant
+                })
+                
+        except Exception as e:
+            continue
+    return strategy_results
+
 def search_google_news_rss(keyword: str, max_results: int = 5, days_back: int = 30) -> List[Dict]:
-    """이 코드는 구글 뉴스 RSS에서 리콜 관련 뉴스를 검색합니다"""
+    """
+    이 코드는 구글 뉴스 RSS에서 리콜 관련 뉴스를 검색합니다
+    - 모든 전략의 RSS를 동시에 요청하고 도착하는 대로 병합
+    - 1번 전략부터 차례로 끝난 전략들의 결과가 max_results건 이상이면 뒤 전략은 취소하고 결과에서 제외
+      (전략을 순서대로 실행하다 충분해지면 멈추던 기존 동작과 같은 결과)
+    """
     try:
         search_strategies = [
             f"{keyword} FDA 리콜",           
@@ -30,61 +117,48 @@ def search_google_news_rss(keyword: str, max_results: int = 5, days_back: int =
             f"{keyword} 제품 회수"           
         ]
         
-        all_results = []
-        
-        for i, search_query in enumerate(search_strategies):
-
+        def fetch_strategy(i: int, search_query: str) -> List[Dict]:
             print(f"🔍 검색 전략 {i+1}: '{search_query}'")  # 🆕 디버깅 추가
-            
-            encoded_query = quote_plus(search_query)
-            rss_url = f"https://news.google.com/rss/search?q={encoded_query}&hl=ko&gl=KR&ceid=KR:ko"
-            
-            feed = feedparser.parse(rss_url)
-            print(f"   RSS 결과: {len(feed.entries)}건") 
-            
-            if not feed.entries:
-                continue
-                
-            strategy_results = []
-            for entry in feed.entries[:max_results]:
+            rss_url = f"https://news.google.com/rss/search?q={quote_plus(search_query)}&hl=ko&gl=KR&ceid=KR:ko"
+            feed = timed_call("news.rss_fetch", lambda: _fetch_rss(rss_url), kind="http", strategy=i + 1)
+            print(f"   RSS 결과 (전략 {i+1}): {len(feed.entries)}건")
+            return _strategy_results(feed.entries, i + 1, max_results)
+        
+        # 계측 스팬이 이어지도록 제출 시점의 컨텍스트에서 실행
+        futures = {
+            _rss_executor.submit(contextvars.copy_context().run, fetch_strategy, i, search_query): i
+            for i, search_query in enumerate(search_strategies)
+        }
+        results_by_strategy: Dict[int, List[Dict]] = {}
+        used_strategies = len(search_strategies)
+        
+        try:
+            for future in as_completed(futures):
+                i = futures[future]
                 try:
-                    pub_date = None
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        pub_date = datetime(*entry.published_parsed[:6])
-                    
-                    title = entry.title if hasattr(entry, 'title') else '제목 없음'
-                    link = entry.link if hasattr(entry, 'link') else ''
-                    summary = entry.summary if hasattr(entry, 'summary') else ''
-                    
-                    source = 'Unknown'
-                    if hasattr(entry, 'source') and hasattr(entry.source, 'title'):
-                        source = entry.source.title
-                    
-                    is_fda_related = any(term in (title + summary).lower() 
-                                       for term in ['fda', '미국', 'usa', 'america', 'recall', '리콜'])
-                    
-                    is_recall_relevant = is_recall_related_text(title + " " + summary)
-                    
-                    if is_fda_related or is_recall_relevant:
-                        strategy_results.append({
-                            'title': title,
-                            'link': link,
-                            'summary': summary,
-                            'published': pub_date.strftime('%Y-%m-%d %H:%M') if pub_date else 'Unknown',
-                            'source': source,
-                            'content': '',
-                            'search_strategy': i+1,
-                            'is_fda_related': is_fda_related,
-                            'is_recall_related': is_recall_relevant
-                        })
-                        
+                    results_by_strategy[i] = future.result()
                 except Exception as e:
-                    continue
-            
-            all_results.extend(strategy_results)
-            
-            if len(all_results) >= max_results:
-                break
+                    print(f"   RSS 요청 실패 (전략 {i+1}): {e}")
+                    results_by_strategy[i] = []
+                
+                # 앞선 전략들이 모두 끝났고 결과가 충분하면 나머지는 기다리지 않음
+                collected = 0
+                for j in range(len(search_strategies)):
+                    if j not in results_by_strategy:
+                        break
+                    collected += len(results_by_strategy[j])
+                    if collected >= max_results:
+                        used_strategies = j + 1
+                        break
+                if used_strategies < len(search_strategies):
+                    break
+        finally:
+            for future in futures:
+                future.cancel()  # 아직 시작하지 않은 요청 취소 (진행 중인 요청은 결과만 버림)
+        
+        all_results = []
+        for i in range(used_strategies):
+            all_results.extend(results_by_strategy.get(i, []))
         
         def sort_priority(item):
             fda_score = 10 if item['is_fda_related'] else 0
@@ -132,12 +206,13 @@ def extract_news_content(url: str) -> str:
             'Upgrade-Insecure-Requests': '1',
         }
         
-        response = requests.get(url, headers=headers, timeout=15)
+        # 기사 본문은 잘 바뀌지 않으므로 디스크 캐시(조건부 GET) 사용
+        response = cached_get(url, headers=headers, timeout=15)
         response.raise_for_status()
         
         response.encoding = response.apparent_encoding
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response.text)
         
         for script in soup(["script", "style", "nav", "header", "footer", "aside"]):
             script.decompose()
@@ -185,6 +260,7 @@ def extract_news_content(url: str) -> str:
     except Exception as e:
         return ""
 
+@timed("news.search_and_extract", kind="crawl")
 def search_and_extract_news(keyword: str, max_results: int = 3) -> List[Dict]:
     """이 코드는 구글 뉴스 RSS 검색과 본문 추출을 통합 수행합니다"""
     try:
@@ -195,7 +271,7 @@ def search_and_extract_news(keyword: str, max_results: int = 3) -> List[Dict]:
         
         enriched_results = []
         for i, news_item in enumerate(news_results):
-            content = extract_news_content(news_item['link'])
+            content = timed_call("news.article_fetch", lambda: extract_news_content(news_item['link']), kind="http")
             
             if content and len(content) > 50:
                 news_item['content'] = content
@@ -0,0 +1,39 @@
+# utils/html_parsing.py
+"""
+스크레이퍼 공용 HTML 파싱 계층
+- 모든 스크레이퍼가 같은 BeautifulSoup 파서 백엔드를 사용 (기본: C 확장 기반 lxml, 미설치 시 html.parser)
+- make_soup(markup, only=SoupStrainer(...)): 필요한 하위 트리만 파싱해 트리 생성 비용 절감
+  제한 파싱 결과가 비어 있으면(사이트 구조 변경 등) 문서 전체를 다시 파싱하므로 결과가 누락되지 않음
+- 백엔드별 파싱 시간 비교: python -m benchmarks.bench_html_parsing
+
+환경 변수
+- HTML_PARSER: BeautifulSoup 파서 이름 (lxml | html.parser | html5lib, 기본 lxml)
+"""
+import os
+from typing import Optional, Union
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401 - BeautifulSoup "lxml" 백엔드
+    LXML_AVAILABLE = True
+except ImportError:  # lxml이 없는 호스트에서는 표준 라이브러리 파서 사용
+    LXML_AVAILABLE = False
+
+DEFAULT_PARSER = "lxml" if LXML_AVAILABLE else "html.parser"
+HTML_PARSER = os.getenv("HTML_PARSER") or DEFAULT_PARSER
+
+__all__ = ["HTML_PARSER", "LXML_AVAILABLE", "SoupStrainer", "make_soup"]
+
+def make_soup(markup: Union[str, bytes], only: Optional[SoupStrainer] = None,
+              parser: Optional[str] = None) -> BeautifulSoup:
+    """
+    공용 파서로 BeautifulSoup 트리 생성
+    - only: 이 조건에 맞는 태그(와 그 하위 트리)만 파싱 - 일치하는 태그가 없으면 전체 문서를 파싱
+    - parser: 백엔드 지정 (벤치마크/비교용, 기본 HTML_PARSER)
+    """
+    parser = parser or HTML_PARSER
+    if only is not None:
+        soup = BeautifulSoup(markup, parser, parse_only=only)
+        if soup.contents:
+            return soup
+    return BeautifulSoup(markup, parser)
@@ -0,0 +1,197 @@
+# utils/http_cache.py
+"""
+크롤링 페이지용 디스크 HTTP 캐시 (조건부 GET)
+- 응답 본문을 zlib 압축해 SQLite에 저장, ETag / Last-Modified 검증자 함께 보관
+- 신선도 구간(max_age) 안이면 네트워크 없이 로컬 응답 반환
+- 구간이 지나면 If-None-Match / If-Modified-Since로 재검증 → 304면 저장된 본문 재사용
+- 네트워크 오류 시 저장된 본문이 있으면 그대로 반환 (stale)
+- 캐시에서 온 응답은 X-Cache 헤더로 구분: HIT(신선/304 재검증), STALE(네트워크 오류로 검증 못 한 이전 본문)
+- 반환값은 requests.Response 이므로 기존 호출부(.text, .json(), raise_for_status) 그대로 사용
+
+환경 변수
+- HTTP_CACHE: "0"이면 비활성화 (기본 "1")
+- HTTP_CACHE_PATH: 캐시 파일 경로 (기본 ./data/http_cache.sqlite3)
+- HTTP_CACHE_MAX_AGE: 기본 신선도 구간 초 (기본 3600)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import nullcontext
+from typing import Any, Dict, Optional
+import requests
+from requests.structures import CaseInsensitiveDict
+
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE", "1") != "0"
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", "./data/http_cache.sqlite3")
+HTTP_CACHE_MAX_AGE = float(os.getenv("HTTP_CACHE_MAX_AGE", "3600"))
+
+# 재사용 시 함께 복원할 응답 헤더
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Content-Language")
+
+class HTTPCache:
+    """URL 단위 압축 본문 + 검증자 저장소 (스레드별 SQLite 연결)"""
+
+    def __init__(self, path: str = HTTP_CACHE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._stats_lock = threading.Lock()  # 워커 스레드들이 동시에 집계 - SQLite 쓰기와 분리
+        self.stats = {"fresh_hits": 0, "revalidated": 0, "misses": 0, "stale": 0, "bytes_saved": 0}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[Dict]:
+        row = self._connect().execute(
+            "SELECT url, status, headers, body, etag, last_modified, fetched_at FROM http_cache WHERE key = ?",
+            (self.key(url),),
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "url": row[0], "status": row[1], "headers": json.loads(row[2]), "body": zlib.decompress(row[3]),
+            "etag": row[4], "last_modified": row[5], "fetched_at": row[6],
+        }
+
+    def put(self, url: str, response: requests.Response) -> None:
+        headers = {name: response.headers[name] for name in _STORED_HEADERS if name in response.headers}
+        with self._write_lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.key(url), url, response.status_code, json.dumps(headers), zlib.compress(response.content, 6),
+                 response.headers.get("ETag"), response.headers.get("Last-Modified"), time.time()),
+            )
+
+    def touch(self, url: str, response: requests.Response) -> None:
+        """304 응답 - 저장 시각과 (새로 받은) 검증자만 갱신"""
+        with self._write_lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE http_cache SET fetched_at = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (time.time(), response.headers.get("ETag"), response.headers.get("Last-Modified"), self.key(url)),
+            )
+
+    def prune(self, older_than_seconds: float) -> int:
+        """오래된 항목 삭제 - 삭제 건수 반환"""
+        with self._write_lock, self._connect() as conn:
+            cursor = conn.execute("DELETE FROM http_cache WHERE fetched_at < ?", (time.time() - older_than_seconds,))
+            return cursor.rowcount
+
+    def count(self, **increments: int) -> None:
+        """통계 누적 (여러 워커 스레드에서 호출)"""
+        with self._stats_lock:
+            for stat, amount in increments.items():
+                self.stats[stat] += amount
+
+def _response_from_entry(entry: Dict, url: str, cache_status: str = "HIT") -> requests.Response:
+    """저장된 항목으로 requests.Response 재구성 (cache_status: X-Cache 헤더 값)"""
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response._content = entry["body"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response.headers["X-Cache"] = cache_status
+    response.url = url
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+_cache: Optional[HTTPCache] = None
+_cache_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+
+def get_http_cache() -> HTTPCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = HTTPCache()
+    return _cache
+
+def _default_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _cache_lock:
+            if _session is None:
+                _session = requests.Session()
+    return _session
+
+def cached_get(url: str, session: Optional[requests.Session] = None, headers: Optional[Dict[str, str]] = None,
+               timeout=15, max_age: Optional[float] = None, limiter: Optional[Any] = None) -> requests.Response:
+    """
+    캐시를 거치는 GET
+    max_age: 이 시간(초) 안에 받은 응답은 재검증 없이 사용 (0이면 항상 재검증, 기본 HTTP_CACHE_MAX_AGE)
+    limiter: 네트워크 요청 직전에만 잡을 호스트 제한 (utils/polite_fetcher.py HostLimiter) - 신선한 캐시 응답은 대기 없음
+    """
+    session = session or _default_session()
+    host_slot = (lambda: limiter.slot(url)) if limiter is not None else nullcontext
+    if not HTTP_CACHE_ENABLED:
+        with host_slot():
+            return session.get(url, headers=headers, timeout=timeout)
+
+    cache = get_http_cache()
+    max_age = HTTP_CACHE_MAX_AGE if max_age is None else max_age
+    try:
+        entry = cache.get(url)
+    except Exception as e:
+        print(f"HTTP 캐시 조회 실패: {e}")
+        entry = None
+
+    if entry is not None and time.time() - entry["fetched_at"] < max_age:
+        cache.count(fresh_hits=1, bytes_saved=len(entry["body"]))
+        return _response_from_entry(entry, url)
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        if entry["etag"]:
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        with host_slot():
+            response = session.get(url, headers=request_headers, timeout=timeout)
+    except requests.exceptions.RequestException:
+        if entry is None:
+            raise
+        cache.count(stale=1)
+        return _response_from_entry(entry, url, cache_status="STALE")
+
+    try:
+        if response.status_code == 304 and entry is not None:
+            cache.touch(url, response)
+            cache.count(revalidated=1, bytes_saved=len(entry["body"]))
+            return _response_from_entry(entry, url)
+
+        cache.count(misses=1)
+        cache_control = response.headers.get("Cache-Control", "").lower()
+        if response.status_code == 200 and "no-store" not in cache_control:
+            cache.put(url, response)
+    except Exception as e:
+        print(f"HTTP 캐시 저장 실패: {e}")
+    return response
@@ -0,0 +1,315 @@
+# utils/instrumentation.py
+"""
+노드/LLM/임베딩/Chroma 호출 타이밍 계측
+- span(): 실행 시간, 입력/출력 토큰, 결과 크기를 기록하는 컨텍스트 매니저
+- timed_node(): LangGraph 노드 함수용 데코레이터
+- timed_call(): 단일 호출(Chroma 검색 등) 계측 헬퍼
+- timed(): 일반 함수용 데코레이터 (크롤링, 뉴스 검색 등)
+- 싱크: 롤링 JSONL 로그 + Prometheus 텍스트 스냅샷 + 메모리 집계 (개발자 패널용)
+- 각 스팬은 OpenTelemetry 스팬으로도 내보냄 (utils/tracing.py)
+
+환경 변수
+- INSTRUMENTATION_ENABLED: "0"이면 계측 비활성화 (기본 "1")
+- SPAN_LOG_PATH: 스팬 JSONL 경로 (기본 ./logs/spans.jsonl)
+- SPAN_LOG_MAX_BYTES / SPAN_LOG_BACKUPS: 롤링 크기/보관 개수 (기본 5MB / 3개)
+- METRICS_SNAPSHOT_PATH: Prometheus 텍스트 스냅샷 경로 (기본 ./logs/metrics.prom)
+"""
+import contextvars
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from utils.tracing import set_span_attributes, span_ids, start_span
+
+INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", "1") != "0"
+SPAN_LOG_PATH = os.getenv("SPAN_LOG_PATH", "./logs/spans.jsonl")
+SPAN_LOG_MAX_BYTES = int(os.getenv("SPAN_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+SPAN_LOG_BACKUPS = int(os.getenv("SPAN_LOG_BACKUPS", "3"))
+METRICS_SNAPSHOT_PATH = os.getenv("METRICS_SNAPSHOT_PATH", "./logs/metrics.prom")
+
+# 스팬 이름별로 보관할 최근 실행 시간 개수 (백분위수 계산용)
+LATENCY_WINDOW = 512
+# 개발자 패널에 보여줄 최근 스팬 개수
+RECENT_SPANS = 300
+
+_current_span: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar("current_span", default=None)
+
+_stats: Dict[str, Dict[str, Any]] = {}
+_recent: deque = deque(maxlen=RECENT_SPANS)
+_stats_lock = threading.Lock()
+
+_span_logger: Optional[logging.Logger] = None
+_span_logger_lock = threading.Lock()
+
+def _get_span_logger() -> Optional[logging.Logger]:
+    """스팬 전용 롤링 JSONL 로거 (최초 사용 시 생성, 실패하면 None)"""
+    global _span_logger
+    if _span_logger is not None:
+        return _span_logger
+    with _span_logger_lock:
+        if _span_logger is None:
+            try:
+                os.makedirs(os.path.dirname(SPAN_LOG_PATH) or ".", exist_ok=True)
+                handler = RotatingFileHandler(SPAN_LOG_PATH, maxBytes=SPAN_LOG_MAX_BYTES,
+                                              backupCount=SPAN_LOG_BACKUPS, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                span_logger = logging.getLogger("risk_app.spans")
+                span_logger.setLevel(logging.INFO)
+                span_logger.propagate = False
+                span_logger.addHandler(handler)
+                _span_logger = span_logger
+            except Exception as e:
+                print(f"⚠️ 스팬 로그 파일 초기화 실패: {e}")
+                _span_logger = logging.getLogger("risk_app.spans.disabled")
+                _span_logger.disabled = True
+    return _span_logger
+
+def result_size(result: Any) -> Optional[int]:
+    """결과 크기 추정 (리스트 길이, 문자열 길이, Chroma get() 결과의 문서 수)"""
+    if result is None:
+        return 0
+    if isinstance(result, dict) and "ids" in result:
+        return len(result.get("ids") or [])
+    if isinstance(result, (list, tuple, str)):
+        return len(result)
+    content = getattr(result, "content", None)
+    if isinstance(content, str):
+        return len(content)
+    return None
+
+def _record_span(record: Dict[str, Any]) -> None:
+    """완료된 스팬을 집계/로그 싱크로 전달"""
+    with _stats_lock:
+        stats = _stats.get(record["name"])
+        if stats is None:
+            stats = {
+                "kind": record["kind"],
+                "count": 0,
+                "errors": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "tokens_in": 0,
+                "tokens_out": 0,
+                "recent_ms": deque(maxlen=LATENCY_WINDOW),
+            }
+            _stats[record["name"]] = stats
+        stats["count"] += 1
+        stats["errors"] += 1 if record["status"] == "error" else 0
+        stats["total_ms"] += record["duration_ms"]
+        stats["max_ms"] = max(stats["max_ms"], record["duration_ms"])
+        stats["tokens_in"] += record["tokens_in"]
+        stats["tokens_out"] += record["tokens_out"]
+        stats["recent_ms"].append(record["duration_ms"])
+        _recent.append(record)
+
+    span_logger = _get_span_logger()
+    if span_logger is not None and not span_logger.disabled:
+        span_logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+    # 요청 단위(루트) 스팬이 끝날 때마다 Prometheus 스냅샷 갱신
+    if record["parent_id"] is None:
+        write_prometheus_snapshot()
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attrs) -> Iterator[Dict[str, Any]]:
+    """
+    실행 구간 계측 컨텍스트 매니저
+    반환된 dict에 tokens_in / tokens_out / result_size / 임의 속성을 채우면 함께 기록됨
+    하위 스팬의 토큰 사용량은 상위 스팬에 합산됨
+    """
+    parent = _current_span.get()
+    record = {
+        "name": name,
+        "kind": kind,
+        "trace_id": parent["trace_id"] if parent else uuid.uuid4().hex,
+        "span_id": uuid.uuid4().hex[:16],
+        "parent_id": parent["span_id"] if parent else None,
+        "tokens_in": 0,
+        "tokens_out": 0,
+        "result_size": None,
+        "attrs": dict(attrs),
+    }
+    if not INSTRUMENTATION_ENABLED:
+        yield record
+        return
+
+    with start_span(name, {"app.kind": kind}) as otel_span:
+        # OTel이 활성화되어 있으면 같은 ID를 사용해 JSONL 스팬과 트레이스를 연결
+        ids = span_ids(otel_span)
+        if ids:
+            record["trace_id"], record["span_id"] = ids["trace_id"], ids["span_id"]
+
+        token = _current_span.set(record)
+        started_at = datetime.now()
+        start = time.perf_counter()
+        status, error = "ok", None
+        try:
+            yield record
+        except BaseException as e:
+            status, error = "error", f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            record["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            record["start"] = started_at.isoformat()
+            record["status"] = status
+            if error:
+                record["error"] = error[:300]
+            if parent is not None:
+                parent["tokens_in"] += record["tokens_in"]
+                parent["tokens_out"] += record["tokens_out"]
+            try:
+                set_span_attributes(otel_span, _otel_attributes(record))
+                _record_span(record)
+            except Exception as e:
+                print(f"⚠️ 스팬 기록 실패: {e}")
+
+def _otel_attributes(record: Dict[str, Any]) -> Dict[str, Any]:
+    """스팬 기록을 OTel 속성으로 변환 (LLM 호출은 gen_ai 시맨틱 컨벤션 사용)"""
+    attributes = {
+        "app.tokens_in": record["tokens_in"],
+        "app.tokens_out": record["tokens_out"],
+        "app.result_size": record["result_size"],
+    }
+    for key, value in record["attrs"].items():
+        attributes[f"app.{key}"] = json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+    if record["kind"] in ("llm", "embedding"):
+        attributes.update({
+            "gen_ai.system": "openai",
+            "gen_ai.request.model": record["attrs"].get("model"),
+            "gen_ai.usage.input_tokens": record["tokens_in"],
+            "gen_ai.usage.output_tokens": record["tokens_out"],
+        })
+    return attributes
+
+def current_span() -> Optional[Dict[str, Any]]:
+    """현재 실행 중인 스팬 (없으면 None)"""
+    return _current_span.get()
+
+def timed_call(name: str, fn: Callable[[], Any], kind: str = "chroma", **attrs) -> Any:
+    """fn()을 스팬으로 감싸 실행하고 결과 크기를 기록"""
+    with span(name, kind=kind, **attrs) as record:
+        result = fn()
+        record["result_size"] = result_size(result)
+        return result
+
+def timed(name: str, kind: str = "internal") -> Callable:
+    """일반 함수 데코레이터 - 실행 시간과 반환값 크기 기록"""
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, kind=kind) as record:
+                result = fn(*args, **kwargs)
+                record["result_size"] = result_size(result)
+                return result
+        return wrapper
+    return decorator
+
+def timed_node(name: str) -> Callable:
+    """LangGraph 노드 데코레이터 - 실행 시간과 노드가 갱신한 상태 필드 크기 기록"""
+    def decorator(node_fn: Callable) -> Callable:
+        @wraps(node_fn)
+        def wrapper(state, *args, **kwargs):
+            with span(name, kind="node") as record:
+                result = node_fn(state, *args, **kwargs)
+                if isinstance(result, dict) and isinstance(state, dict):
+                    sizes = {
+                        key: len(value) for key, value in result.items()
+                        if isinstance(value, (str, list)) and value is not state.get(key)
+                    }
+                    record["attrs"]["output_sizes"] = sizes
+                    record["result_size"] = sum(sizes.values())
+                return result
+        return wrapper
+    return decorator
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(len(ordered) * pct / 100.0) - 1))
+    return ordered[index]
+
+def get_span_summary() -> List[Dict[str, Any]]:
+    """스팬 이름별 집계 (평균/p50/p95/최대 실행 시간, 토큰 합계)"""
+    with _stats_lock:
+        items = [(name, dict(stats), list(stats["recent_ms"])) for name, stats in _stats.items()]
+
+    summary = []
+    for name, stats, recent in items:
+        summary.append({
+            "name": name,
+            "kind": stats["kind"],
+            "count": stats["count"],
+            "errors": stats["errors"],
+            "avg_ms": round(stats["total_ms"] / stats["count"], 2) if stats["count"] else 0.0,
+            "p50_ms": round(_percentile(recent, 50), 2),
+            "p95_ms": round(_percentile(recent, 95), 2),
+            "max_ms": round(stats["max_ms"], 2),
+            "total_ms": round(stats["total_ms"], 2),
+            "tokens_in": stats["tokens_in"],
+            "tokens_out": stats["tokens_out"],
+        })
+    summary.sort(key=lambda item: item["total_ms"], reverse=True)
+    return summary
+
+def get_recent_spans(limit: int = 100) -> List[Dict[str, Any]]:
+    """최근 완료된 스팬 목록 (최신순)"""
+    with _stats_lock:
+        recent = list(_recent)
+    return list(reversed(recent))[:limit]
+
+def reset_spans() -> None:
+    """메모리 집계 초기화 (로그 파일은 유지)"""
+    with _stats_lock:
+        _stats.clear()
+        _recent.clear()
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+def render_prometheus() -> str:
+    """집계 결과를 Prometheus 텍스트 노출 형식으로 변환"""
+    lines = [
+        "# HELP app_span_duration_seconds 계측 구간 실행 시간",
+        "# TYPE app_span_duration_seconds summary",
+    ]
+    summary = get_span_summary()
+    for item in summary:
+        labels = f'name="{_label(item["name"])}",kind="{_label(item["kind"])}"'
+        lines.append(f'app_span_duration_seconds{{{labels},quantile="0.5"}} {item["p50_ms"] / 1000:.6f}')
+        lines.append(f'app_span_duration_seconds{{{labels},quantile="0.95"}} {item["p95_ms"] / 1000:.6f}')
+        lines.append(f'app_span_duration_seconds_sum{{{labels}}} {item["total_ms"] / 1000:.6f}')
+        lines.append(f'app_span_duration_seconds_count{{{labels}}} {item["count"]}')
+
+    lines += ["# HELP app_span_errors_total 오류로 끝난 구간 수", "# TYPE app_span_errors_total counter"]
+    for item in summary:
+        lines.append(f'app_span_errors_total{{name="{_label(item["name"])}"}} {item["errors"]}')
+
+    lines += ["# HELP app_span_tokens_total 구간별 LLM 토큰 사용량", "# TYPE app_span_tokens_total counter"]
+    for item in summary:
+        name = _label(item["name"])
+        lines.append(f'app_span_tokens_total{{name="{name}",direction="in"}} {item["tokens_in"]}')
+        lines.append(f'app_span_tokens_total{{name="{name}",direction="out"}} {item["tokens_out"]}')
+    return "\n".join(lines) + "\n"
+
+def write_prometheus_snapshot(path: str = METRICS_SNAPSHOT_PATH) -> None:
+    """Prometheus 텍스트 스냅샷 파일 저장 (원자적 쓰기, textfile collector 호환)"""
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(render_prometheus())
+        os.replace(temp_path, path)
+    except Exception as e:
+        print(f"⚠️ 지표 스냅샷 저장 실패: {e}")
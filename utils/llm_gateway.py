@@ -0,0 +1,471 @@
+# utils/llm_gateway.py
+"""
+LLM 호출 게이트웨이 - 모든 OpenAI 채팅/임베딩 호출의 단일 진입점
+- 모델별 토큰 버킷 레이트 리밋 (분당 요청 수 / 분당 토큰 수)
+- 모델별 동시 실행 수 제한
+- 지수 백오프 + 지터 재시도 (Retry-After 헤더 존중)
+- 모델별 호출 지표 수집
+- 녹화/재생 백엔드 연동 (utils/llm_replay.py)
+- 호출별 타이밍 스팬 기록 (utils/instrumentation.py)
+- 동일 요청 동시 호출 병합 (utils/single_flight.py)
+- 장애 시 빠른 실패 서킷 브레이커 (utils/circuit_breaker.py, 모든 채팅/임베딩 호출 공유)
+"""
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from utils.circuit_breaker import CircuitBreaker
+from utils.instrumentation import result_size, span
+from utils.llm_replay import ReplayBackend, backend_from_env, normalize_messages, request_hash
+from utils.single_flight import SINGLE_FLIGHT_ENABLED, SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# 모델별 쿼터 설정 (OpenAI 계정 티어에 맞게 조정)
+DEFAULT_MODEL_LIMITS = {
+    "gpt-4o-mini": {"rpm": 500, "tpm": 200000, "max_concurrency": 8},
+    "gpt-4o": {"rpm": 500, "tpm": 30000, "max_concurrency": 4},
+    "text-embedding-3-small": {"rpm": 3000, "tpm": 1000000, "max_concurrency": 8},
+}
+FALLBACK_MODEL_LIMITS = {"rpm": 60, "tpm": 60000, "max_concurrency": 4}
+
+# 재시도 설정
+MAX_RETRIES = 4
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+
+# 응답 토큰 수를 알 수 없을 때 예약할 기본 출력 토큰 수
+DEFAULT_COMPLETION_TOKENS = 1000
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = {
+    "RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError",
+    "Timeout", "ReadTimeout", "ConnectTimeout", "ConnectionError",
+}
+
+def estimate_tokens(content: Any) -> int:
+    """텍스트/메시지의 토큰 수 추정 (영문 4자 ≈ 1토큰, 한글 1자 ≈ 1토큰)"""
+    if content is None:
+        return 0
+    if isinstance(content, (list, tuple)):
+        return sum(estimate_tokens(item) for item in content)
+    if isinstance(content, dict):
+        return estimate_tokens(content.get("content", ""))
+    if hasattr(content, "to_messages"):  # PromptValue
+        return estimate_tokens(content.to_messages())
+    if hasattr(content, "content"):  # LangChain 메시지
+        return estimate_tokens(content.content)
+
+    text = str(content)
+    ascii_count = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_count // 4 + (len(text) - ascii_count) + 4
+
+class TokenBucket:
+    """분당 보충량 기반 토큰 버킷 - 예약 후 대기 방식 (잔고가 음수가 될 수 있음)"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.capacity = float(capacity or rate_per_minute)
+        self.fill_rate = rate_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """amount 만큼 예약하고 대기해야 할 시간(초)을 반환"""
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            self._refill()
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.fill_rate
+
+    def acquire(self, amount: float) -> float:
+        """예약 후 필요한 만큼 대기 - 실제 대기 시간 반환"""
+        if amount <= 0:
+            return 0.0
+        wait = self.reserve(amount)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def adjust(self, delta: float) -> None:
+        """실제 사용량 보정 (양수면 추가 차감, 음수면 환급)"""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - delta)
+
+class _ModelLane:
+    """모델 하나에 대한 레이트 리밋/동시성/지표 상태"""
+
+    def __init__(self, model: str, limits: Dict[str, Any]):
+        self.model = model
+        self.request_bucket = TokenBucket(limits["rpm"])
+        self.token_bucket = TokenBucket(limits["tpm"])
+        self.semaphore = threading.BoundedSemaphore(limits["max_concurrency"])
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+        self.metrics = {
+            "requests": 0,
+            "successes": 0,
+            "failures": 0,
+            "retries": 0,
+            "throttle_wait_seconds": 0.0,
+            "latency_seconds_total": 0.0,
+            "tokens_in": 0,
+            "tokens_out": 0,
+            "in_flight": 0,
+            "max_in_flight": 0,
+            "coalesced": 0,
+            "short_circuited": 0,
+        }
+
+    def pause(self, seconds: float) -> None:
+        """Retry-After 응답 시 해당 모델의 모든 호출을 잠시 멈춤"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def wait_if_paused(self) -> float:
+        wait = self.paused_until - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+            return wait
+        return 0.0
+
+    def record(self, **updates) -> None:
+        with self.lock:
+            for key, value in updates.items():
+                self.metrics[key] += value
+            self.metrics["max_in_flight"] = max(self.metrics["max_in_flight"], self.metrics["in_flight"])
+
+def _status_code(exc: Exception) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+def is_retryable_error(exc: Exception) -> bool:
+    """재시도 가능한 오류인지 판단 (429, 5xx, 타임아웃, 연결 오류)"""
+    status = _status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES or status >= 500
+    return type(exc).__name__ in RETRYABLE_ERROR_NAMES
+
+def retry_after_seconds(exc: Exception) -> Optional[float]:
+    """오류 응답의 Retry-After / retry-after-ms 헤더를 초 단위로 변환"""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except Exception:
+            return None
+
+def _usage_from_ai_message(message: Any) -> Optional[Tuple[int, int]]:
+    """LangChain AIMessage에서 (입력 토큰, 출력 토큰) 추출"""
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    token_usage = (getattr(message, "response_metadata", None) or {}).get("token_usage")
+    if token_usage:
+        return token_usage.get("prompt_tokens", 0), token_usage.get("completion_tokens", 0)
+    return None
+
+def _usage_from_completion(response: Any) -> Optional[Tuple[int, int]]:
+    """OpenAI ChatCompletion 응답에서 (입력 토큰, 출력 토큰) 추출"""
+    usage = getattr(response, "usage", None)
+    if usage:
+        return getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0
+    return None
+
+def _model_name(llm: Any) -> str:
+    return getattr(llm, "model_name", None) or getattr(llm, "model", None) or "unknown"
+
+class LLMGateway:
+    """레이트 리밋 + 재시도 + 지표 수집을 담당하는 LLM 호출 게이트웨이"""
+
+    def __init__(self, model_limits: Optional[Dict[str, Dict]] = None, max_retries: int = MAX_RETRIES,
+                 base_backoff: float = BASE_BACKOFF_SECONDS, max_backoff: float = MAX_BACKOFF_SECONDS,
+                 backend: Optional[ReplayBackend] = None, single_flight: bool = SINGLE_FLIGHT_ENABLED):
+        self.backend = backend
+        self.single_flight = SingleFlight() if single_flight else None
+        self.breaker = CircuitBreaker("openai")
+        self.model_limits = {model: dict(limits) for model, limits in (model_limits or DEFAULT_MODEL_LIMITS).items()}
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._lanes: Dict[str, _ModelLane] = {}
+        self._lanes_lock = threading.Lock()
+
+    def configure_model(self, model: str, rpm: Optional[int] = None, tpm: Optional[int] = None,
+                        max_concurrency: Optional[int] = None) -> None:
+        """모델 쿼터 변경 (기존 레인은 새 설정으로 재생성)"""
+        limits = dict(self.model_limits.get(model, FALLBACK_MODEL_LIMITS))
+        if rpm is not None:
+            limits["rpm"] = rpm
+        if tpm is not None:
+            limits["tpm"] = tpm
+        if max_concurrency is not None:
+            limits["max_concurrency"] = max_concurrency
+        with self._lanes_lock:
+            self.model_limits[model] = limits
+            self._lanes.pop(model, None)
+
+    def _lane(self, model: str) -> _ModelLane:
+        with self._lanes_lock:
+            lane = self._lanes.get(model)
+            if lane is None:
+                lane = _ModelLane(model, self.model_limits.get(model, FALLBACK_MODEL_LIMITS))
+                self._lanes[model] = lane
+            return lane
+
+    def _backoff_delay(self, attempt: int, exc: Exception) -> float:
+        """지수 백오프 + full jitter, Retry-After가 있으면 그 이상 대기"""
+        ceiling = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+        retry_after = retry_after_seconds(exc)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
+
+    def call(self, model: str, fn: Callable[[], Any], est_tokens: int = 0,
+             usage_fn: Optional[Callable[[Any], Optional[Tuple[int, int]]]] = None,
+             max_retries: Optional[int] = None) -> Any:
+        """레이트 리밋과 재시도를 적용해 fn()을 실행"""
+        lane = self._lane(model)
+        retries = self.max_retries if max_retries is None else max_retries
+
+        for attempt in range(retries + 1):
+            # 브레이커가 열려 있으면 대기/재시도 없이 즉시 CircuitOpenError
+            try:
+                self.breaker.before_call()
+            except Exception:
+                lane.record(short_circuited=1)
+                raise
+
+            waited = lane.wait_if_paused()
+            waited += lane.request_bucket.acquire(1)
+            waited += lane.token_bucket.acquire(est_tokens)
+
+            error = None
+            with lane.semaphore:
+                lane.record(requests=1, in_flight=1, throttle_wait_seconds=waited)
+                start = time.monotonic()
+                try:
+                    result = fn()
+                except Exception as e:
+                    lane.record(in_flight=-1, failures=1, latency_seconds_total=time.monotonic() - start)
+                    retryable = is_retryable_error(e)
+                    # 429/5xx/타임아웃만 장애로 집계 (잘못된 요청 등은 서버가 응답한 것으로 간주)
+                    if retryable:
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()
+                    if attempt >= retries or not retryable:
+                        raise
+                    error = e
+
+            # 대기는 동시성 슬롯을 반납한 뒤에 수행
+            if error is not None:
+                delay = self._backoff_delay(attempt, error)
+                if retry_after_seconds(error) is not None:
+                    lane.pause(delay)
+                lane.record(retries=1)
+                logger.warning(f"[{model}] LLM 호출 실패, {delay:.1f}초 후 재시도 ({attempt + 1}/{retries}): {error}")
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            elapsed = time.monotonic() - start
+            usage = usage_fn(result) if usage_fn else None
+            tokens_in, tokens_out = usage if usage else (est_tokens, 0)
+            # 추정치와 실제 사용량 차이를 버킷에 반영
+            lane.token_bucket.adjust(tokens_in + tokens_out - est_tokens)
+            lane.record(in_flight=-1, successes=1, latency_seconds_total=elapsed,
+                        tokens_in=tokens_in, tokens_out=tokens_out)
+            return result
+
+    def _dispatch(self, kind: str, model: str, payload: Dict[str, Any], fn: Callable[[], Any],
+                  est_tokens: int, usage_fn: Optional[Callable] = None, max_retries: Optional[int] = None) -> Any:
+        """동일 요청이 이미 실행 중이면 그 결과를 공유, 아니면 백엔드 모드에 따라 재생하거나 실제 호출(+녹화)"""
+        backend = self.backend
+        span_kind = "embedding" if kind == "embedding" else "llm"
+        with span(f"{span_kind}.{model}", kind=span_kind, model=model, call=kind) as record:
+            def execute() -> Any:
+                if backend is not None and backend.is_replaying:
+                    record["attrs"]["replayed"] = True
+                    return self._replay(backend, kind, model, payload, usage_fn)
+                start = time.monotonic()
+                result = self.call(model, fn, est_tokens=est_tokens, usage_fn=usage_fn, max_retries=max_retries)
+                if backend is not None and backend.is_recording:
+                    backend.record(kind, payload, result, latency_seconds=time.monotonic() - start)
+                return result
+
+            coalesced = False
+            if self.single_flight is not None:
+                result, coalesced = self.single_flight.do(request_hash(kind, payload), execute)
+            else:
+                result = execute()
+
+            if coalesced:
+                # 다른 호출의 결과를 공유 - 실제 사용 토큰 없음
+                record["attrs"]["coalesced"] = True
+                self._lane(model).record(coalesced=1)
+                record["tokens_in"], record["tokens_out"] = 0, 0
+            else:
+                usage = usage_fn(result) if usage_fn else None
+                record["tokens_in"], record["tokens_out"] = usage if usage else (est_tokens, 0)
+            record["result_size"] = len(payload["texts"]) if kind == "embedding" else result_size(result)
+            return result
+
+    def _replay(self, backend: ReplayBackend, kind: str, model: str, payload: Dict[str, Any],
+                usage_fn: Optional[Callable]) -> Any:
+        """재생 모드 - 레이트 리밋/재시도 없이 카세트 응답 반환 (지표는 동일하게 기록)"""
+        lane = self._lane(model)
+        lane.record(requests=1, in_flight=1)
+        start = time.monotonic()
+        try:
+            result = backend.replay(kind, payload)
+        except Exception:
+            lane.record(in_flight=-1, failures=1, latency_seconds_total=time.monotonic() - start)
+            raise
+        usage = usage_fn(result) if usage_fn else None
+        tokens_in, tokens_out = usage if usage else (0, 0)
+        lane.record(in_flight=-1, successes=1, latency_seconds_total=time.monotonic() - start,
+                    tokens_in=tokens_in, tokens_out=tokens_out)
+        return result
+
+    def invoke_chat(self, llm: Any, messages: Any, max_retries: Optional[int] = None, **kwargs) -> Any:
+        """LangChain 채팅 모델 호출 (llm.invoke)"""
+        model = _model_name(llm)
+        max_tokens = getattr(llm, "max_tokens", None) or DEFAULT_COMPLETION_TOKENS
+        payload = {
+            "model": model,
+            "temperature": getattr(llm, "temperature", None),
+            "max_tokens": getattr(llm, "max_tokens", None),
+            "messages": normalize_messages(messages),
+            "kwargs": kwargs,
+        }
+        return self._dispatch(
+            "chat", model, payload,
+            lambda: llm.invoke(messages, **kwargs),
+            est_tokens=estimate_tokens(messages) + max_tokens,
+            usage_fn=_usage_from_ai_message,
+            max_retries=max_retries,
+        )
+
+    def chat_completion(self, client: Any = None, max_retries: Optional[int] = None, **request) -> Any:
+        """OpenAI SDK chat.completions.create 호출"""
+        max_tokens = request.get("max_tokens") or DEFAULT_COMPLETION_TOKENS
+        return self._dispatch(
+            "completion", request["model"], request,
+            lambda: (client or openai_client()).chat.completions.create(**request),
+            est_tokens=estimate_tokens(request.get("messages", [])) + max_tokens,
+            usage_fn=_usage_from_completion,
+            max_retries=max_retries,
+        )
+
+    def embed(self, model: str, fn: Callable[[], Any], texts: List[str], operation: str = "documents") -> Any:
+        """임베딩 호출 (operation: documents | query)"""
+        payload = {"model": model, "operation": operation, "texts": list(texts)}
+        return self._dispatch("embedding", model, payload, fn, est_tokens=estimate_tokens(texts))
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """모델별 호출 지표 스냅샷"""
+        with self._lanes_lock:
+            lanes = list(self._lanes.values())
+        snapshot = {}
+        for lane in lanes:
+            with lane.lock:
+                metrics = dict(lane.metrics)
+            completed = metrics["successes"] + metrics["failures"]
+            metrics["avg_latency_seconds"] = (metrics["latency_seconds_total"] / completed) if completed else 0.0
+            snapshot[lane.model] = metrics
+        return snapshot
+
+class GatewayEmbeddings(Embeddings):
+    """기존 임베딩 객체를 게이트웨이 경유로 감싸는 래퍼 (Chroma embedding_function으로 사용)"""
+
+    def __init__(self, inner: Embeddings, model: Optional[str] = None, gateway: Optional[LLMGateway] = None):
+        self.inner = inner
+        self.model = model or getattr(inner, "model", None) or "unknown"
+        self._gateway = gateway
+
+    @property
+    def gateway(self) -> LLMGateway:
+        return self._gateway or get_gateway()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.gateway.embed(self.model, lambda: self.inner.embed_documents(texts), texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.gateway.embed(self.model, lambda: self.inner.embed_query(text), [text], operation="query")
+
+# 전역 게이트웨이 (프로세스 내 모든 세션 공유)
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+def get_gateway() -> LLMGateway:
+    """전역 게이트웨이 인스턴스 반환"""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = LLMGateway(backend=backend_from_env())
+    return _gateway
+
+@lru_cache(maxsize=8)
+def openai_client(api_key: Optional[str] = None):
+    """SDK 자체 재시도를 끈 OpenAI 클라이언트 (재시도는 게이트웨이가 담당)"""
+    from openai import OpenAI
+    return OpenAI(api_key=api_key, max_retries=0)
+
+def configure_backend(backend: Optional[ReplayBackend]) -> None:
+    """전역 게이트웨이의 녹화/재생 백엔드 교체 (None이면 live)"""
+    get_gateway().backend = backend
+
+def make_chat_model(model: str = "gpt-4o-mini", temperature: float = 0.1, **kwargs):
+    """SDK 자체 재시도를 끈 ChatOpenAI 생성"""
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model_name=model, temperature=temperature, max_retries=0, **kwargs)
+
+def wrap_embeddings(embeddings: Embeddings) -> GatewayEmbeddings:
+    """임베딩 객체를 게이트웨이 경유로 감싸기"""
+    if isinstance(embeddings, GatewayEmbeddings):
+        return embeddings
+    return GatewayEmbeddings(embeddings)
+
+def invoke_llm(llm: Any, messages: Any, **kwargs) -> Any:
+    """게이트웨이를 통한 LangChain 채팅 모델 호출"""
+    return get_gateway().invoke_chat(llm, messages, **kwargs)
+
+def chat_completion(client: Any = None, **request) -> Any:
+    """게이트웨이를 통한 OpenAI chat.completions.create 호출"""
+    return get_gateway().chat_completion(client=client, **request)
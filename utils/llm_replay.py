@@ -0,0 +1,204 @@
+# utils/llm_replay.py
+"""
+LLM/임베딩 호출 녹화·재생 백엔드 - 오프라인 벤치마크 및 부하 테스트용
+- live: 실제 API 호출 (기본값)
+- record: 실제 API 호출 후 요청 해시 → 응답을 카세트 파일로 저장
+- replay: 카세트에서 응답을 읽어 반환 (네트워크 미사용), 가상 지연시간 적용
+
+환경 변수
+- LLM_BACKEND_MODE: live | record | replay
+- LLM_CASSETTE_DIR: 카세트 저장 경로 (기본 ./data/llm_cassettes)
+- LLM_REPLAY_LATENCY_MS: 재생 지연시간. "800" 또는 "chat=800,embedding=60" 또는 "recorded"(녹화 당시 지연 재현)
+- LLM_REPLAY_JITTER: 지연시간 변동 비율 (0.2 → ±20%)
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+MODE_LIVE = "live"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+VALID_MODES = (MODE_LIVE, MODE_RECORD, MODE_REPLAY)
+
+DEFAULT_CASSETTE_DIR = "./data/llm_cassettes"
+
+class CassetteMissError(RuntimeError):
+    """재생 모드에서 요청에 해당하는 카세트가 없을 때 발생"""
+
+def normalize_messages(messages: Any) -> List[Dict[str, str]]:
+    """문자열/LangChain 메시지/PromptValue/OpenAI dict 메시지를 [{role, content}]로 정규화"""
+    if hasattr(messages, "to_messages"):  # PromptValue
+        messages = messages.to_messages()
+    if isinstance(messages, str):
+        return [{"role": "human", "content": messages}]
+    if isinstance(messages, dict):
+        messages = [messages]
+
+    normalized = []
+    for msg in messages or []:
+        if isinstance(msg, dict):
+            normalized.append({"role": str(msg.get("role", "")), "content": str(msg.get("content", ""))})
+        elif isinstance(msg, (list, tuple)) and len(msg) == 2:
+            normalized.append({"role": str(msg[0]), "content": str(msg[1])})
+        else:
+            normalized.append({"role": getattr(msg, "type", type(msg).__name__), "content": str(getattr(msg, "content", msg))})
+    return normalized
+
+def request_hash(kind: str, payload: Dict[str, Any]) -> str:
+    """요청 종류 + 페이로드의 정규화된 JSON 해시"""
+    canonical = json.dumps({"kind": kind, "payload": payload}, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+# 종류별 응답 직렬화/역직렬화
+def _encode_response(kind: str, response: Any) -> Any:
+    if kind == "chat":
+        return {
+            "content": response.content,
+            "usage_metadata": dict(getattr(response, "usage_metadata", None) or {}),
+            "response_metadata": getattr(response, "response_metadata", None) or {},
+        }
+    if kind == "completion":
+        return response.model_dump() if hasattr(response, "model_dump") else response
+    return response  # embedding: list[float] 또는 list[list[float]]
+
+def _decode_response(kind: str, data: Any) -> Any:
+    if kind == "chat":
+        from langchain_core.messages import AIMessage
+        message = AIMessage(content=data["content"], response_metadata=data.get("response_metadata") or {})
+        usage = data.get("usage_metadata")
+        if usage:
+            message.usage_metadata = usage
+        return message
+    if kind == "completion":
+        from openai.types.chat import ChatCompletion
+        return ChatCompletion.model_validate(data)
+    return data
+
+def parse_latency_spec(spec: Union[str, float, int, Dict, None]) -> Union[str, Dict[str, float]]:
+    """지연시간 설정 파싱 → "recorded" 또는 {종류: 초}"""
+    if spec is None or spec == "":
+        return {}
+    if isinstance(spec, dict):
+        return {kind: float(ms) / 1000.0 for kind, ms in spec.items()}
+    if isinstance(spec, (int, float)):
+        return {"*": float(spec) / 1000.0}
+    spec = spec.strip()
+    if spec == "recorded":
+        return "recorded"
+    if "=" not in spec:
+        return {"*": float(spec) / 1000.0}
+
+    latencies = {}
+    for part in spec.split(","):
+        kind, _, ms = part.partition("=")
+        if kind.strip() and ms.strip():
+            latencies[kind.strip()] = float(ms) / 1000.0
+    return latencies
+
+class ReplayBackend:
+    """요청 해시 → 응답 카세트 저장소"""
+
+    def __init__(self, mode: str = MODE_LIVE, cassette_dir: str = DEFAULT_CASSETTE_DIR,
+                 latency: Union[str, float, int, Dict, None] = None, jitter: float = 0.0):
+        if mode not in VALID_MODES:
+            raise ValueError(f"지원하지 않는 LLM 백엔드 모드: {mode} (가능: {', '.join(VALID_MODES)})")
+        self.mode = mode
+        self.cassette_dir = cassette_dir
+        self.latency = parse_latency_spec(latency)
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._memory: Dict[str, Dict] = {}  # 읽은 카세트 메모리 캐시
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0}
+
+    @property
+    def is_recording(self) -> bool:
+        return self.mode == MODE_RECORD
+
+    @property
+    def is_replaying(self) -> bool:
+        return self.mode == MODE_REPLAY
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.cassette_dir, kind, key[:2], f"{key}.json")
+
+    def _load(self, kind: str, key: str) -> Optional[Dict]:
+        with self._lock:
+            cached = self._memory.get(key)
+        if cached is not None:
+            return cached
+
+        path = self._path(kind, key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            cassette = json.load(f)
+        with self._lock:
+            self._memory[key] = cassette
+        return cassette
+
+    def record(self, kind: str, payload: Dict[str, Any], response: Any, latency_seconds: float = 0.0) -> None:
+        """응답을 카세트로 저장 (원자적 쓰기)"""
+        key = request_hash(kind, payload)
+        cassette = {
+            "kind": kind,
+            "request": payload,
+            "response": _encode_response(kind, response),
+            "latency_seconds": round(latency_seconds, 4),
+            "recorded_at": datetime.now().isoformat(),
+        }
+        path = self._path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(cassette, f, ensure_ascii=False, default=str)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self._memory[key] = cassette
+            self.stats["recorded"] += 1
+
+    def replay(self, kind: str, payload: Dict[str, Any]) -> Any:
+        """카세트에서 응답 재생 + 가상 지연시간 적용"""
+        key = request_hash(kind, payload)
+        cassette = self._load(kind, key)
+        if cassette is None:
+            with self._lock:
+                self.stats["misses"] += 1
+            raise CassetteMissError(
+                f"카세트 없음 ({kind}, {payload.get('model', '')}, {key[:12]}): "
+                f"LLM_BACKEND_MODE=record 로 먼저 녹화하세요"
+            )
+
+        delay = self._latency_for(kind, cassette)
+        if delay > 0:
+            time.sleep(delay)
+
+        with self._lock:
+            self.stats["replayed"] += 1
+        return _decode_response(kind, cassette["response"])
+
+    def _latency_for(self, kind: str, cassette: Dict) -> float:
+        if self.latency == "recorded":
+            delay = float(cassette.get("latency_seconds", 0.0))
+        else:
+            delay = self.latency.get(kind, self.latency.get("*", 0.0))
+        if delay > 0 and self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(0.0, delay)
+
+def backend_from_env() -> Optional[ReplayBackend]:
+    """환경 변수 기반 백엔드 생성 (live 모드면 None)"""
+    mode = os.getenv("LLM_BACKEND_MODE", MODE_LIVE).strip().lower() or MODE_LIVE
+    if mode == MODE_LIVE:
+        return None
+    return ReplayBackend(
+        mode=mode,
+        cassette_dir=os.getenv("LLM_CASSETTE_DIR", DEFAULT_CASSETTE_DIR),
+        latency=os.getenv("LLM_REPLAY_LATENCY_MS"),
+        jitter=float(os.getenv("LLM_REPLAY_JITTER", "0") or 0),
+    )
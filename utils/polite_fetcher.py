@@ -0,0 +1,96 @@
+# utils/polite_fetcher.py
+"""
+호스트별 예의(politeness)를 지키는 병렬 페이지 수집
+- 작업 풀 크기만큼 병렬 실행하되, 같은 호스트에는 동시 요청 수와 초당 요청 수 상한 적용
+- 완료되는 순서대로 결과를 스트리밍 (다음 단계가 전체 완료를 기다리지 않음)
+
+환경 변수
+- CRAWL_WORKERS: 전체 작업 스레드 수 (기본 8)
+- CRAWL_HOST_CONCURRENCY: 호스트당 동시 요청 수 (기본 4)
+- CRAWL_HOST_RPS: 호스트당 초당 요청 수 (기본 4)
+"""
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+from utils.llm_gateway import TokenBucket
+
+CRAWL_WORKERS = int(os.getenv("CRAWL_WORKERS", "8"))
+CRAWL_HOST_CONCURRENCY = int(os.getenv("CRAWL_HOST_CONCURRENCY", "4"))
+CRAWL_HOST_RPS = float(os.getenv("CRAWL_HOST_RPS", "4"))
+
+class HostLimiter:
+    """호스트별 동시 요청 수(세마포어) + 요청 속도(토큰 버킷) 제한"""
+
+    def __init__(self, concurrency: int = CRAWL_HOST_CONCURRENCY, requests_per_second: float = CRAWL_HOST_RPS):
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Tuple[threading.BoundedSemaphore, TokenBucket]] = {}
+
+    def _host(self, url: str) -> Tuple[threading.BoundedSemaphore, TokenBucket]:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            if host not in self._hosts:
+                # 버킷 용량 1 → 첫 요청부터 일정 간격으로 분산 (순간 폭주 방지)
+                self._hosts[host] = (
+                    threading.BoundedSemaphore(self.concurrency),
+                    TokenBucket(self.requests_per_second * 60, capacity=1),
+                )
+            return self._hosts[host]
+
+    @contextmanager
+    def slot(self, url: str):
+        """호스트 슬롯 확보 후 실행 (속도 제한 대기 포함)"""
+        semaphore, bucket = self._host(url)
+        with semaphore:
+            bucket.acquire(1)
+            yield
+
+# 프로세스 공용 호스트 제한 (여러 크롤러가 같은 사이트를 동시에 두드리지 않도록)
+_limiter = HostLimiter()
+
+def get_host_limiter() -> HostLimiter:
+    return _limiter
+
+def fetch_concurrently(items: Iterable[Any], fetch: Callable[[Any], Any], url_of: Callable[[Any], str],
+                       max_workers: int = CRAWL_WORKERS,
+                       limiter: Optional[HostLimiter] = None,
+                       stop_at: Optional[float] = None,
+                       self_limited: bool = False) -> Iterator[Tuple[Any, Any, Optional[Exception]]]:
+    """
+    items를 병렬로 fetch하고 완료 순서대로 (item, 결과, 예외) 반환
+    제너레이터를 중간에 닫으면 아직 시작하지 않은 작업은 취소됨
+    stop_at: 이 시각(time.time() 기준)까지 끝나지 않은 작업은 기다리지 않고 취소
+    self_limited: fetch가 네트워크로 나갈 때만 직접 호스트 슬롯을 잡는 경우(cached_get(limiter=...)) True
+                  - 디스크 캐시에서 바로 응답하는 URL은 호스트 제한 없이 처리
+    """
+    limiter = limiter or get_host_limiter()
+
+    def run(item):
+        if self_limited:
+            return fetch(item)
+        with limiter.slot(url_of(item)):
+            return fetch(item)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crawl")
+    try:
+        # 계측 스팬이 이어지도록 작업마다 현재 컨텍스트 복사본에서 실행
+        futures = {executor.submit(contextvars.copy_context().run, run, item): item for item in items}
+        timeout = None if stop_at is None else max(0.0, stop_at - time.time())
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                item = futures[future]
+                try:
+                    yield item, future.result(), None
+                except Exception as e:
+                    yield item, None, e
+        except FuturesTimeoutError:
+            pending = sum(1 for future in futures if not future.done())
+            print(f"⏱️ 수집 시간 제한 도달 - 남은 {pending}건은 수집하지 않음")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,180 @@
+# utils/recall_backfill.py
+"""
+FDA 리콜 전체 아카이브 백필 (재개 가능)
+- FDARealtimeCrawler의 http 경로로 목록 테이블 전체를 페이지 단위로 순회
+- 상세 페이지는 병렬 수집 (utils/polite_fetcher.py의 호스트별 제한 적용)
+- 문서는 batch_size건씩 벡터스토어에 upsert, 목록 페이지 하나를 다 적재할 때마다 체크포인트 저장
+- 중단 후 다시 실행하면 마지막 체크포인트부터 이어서 진행 (이미 적재된 URL은 상세 페이지를 받지 않음)
+- 벡터스토어 적재가 실패한 페이지는 체크포인트를 넘기지 않고 실행을 멈춤 (서킷 브레이커 open 포함)
+- 목록은 최신순이라 백필 중 새 리콜이 추가되면 행이 뒤로 밀릴 뿐 누락되지 않음 (다시 보이는 행은 URL 인덱스로 건너뜀)
+
+사용법 (프로젝트 루트에서 실행):
+  python -m utils.recall_backfill                  # 처음부터 또는 체크포인트부터 이어서
+  python -m utils.recall_backfill --max-pages 10   # 이번 실행은 목록 10페이지까지만
+  python -m utils.recall_backfill --restart        # 체크포인트 무시하고 처음부터
+
+환경 변수
+- FDA_BASE_URL, CRAWL_WORKERS 등 크롤러 설정은 utils/fda_realtime_crawler.py 참고
+- BACKFILL_PAGE_SIZE: 목록 요청 1회당 행 수 (기본 100)
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from utils.circuit_breaker import CircuitOpenError
+from utils.crawl_state import get_crawl_state
+from utils.fda_realtime_crawler import (
+    FDARealtimeCrawler, parse_listing_rows, update_vectorstore_with_new_data, UPSERT_BATCH_SIZE
+)
+from utils.instrumentation import timed_call
+from utils.polite_fetcher import fetch_concurrently
+
+BACKFILL_PAGE_SIZE = int(os.getenv("BACKFILL_PAGE_SIZE", "100"))
+
+# utils/chat_recall.py initialize_recall_vectorstore와 같은 저장소
+RECALL_PERSIST_DIR = "./data/chroma_db_recall"
+RECALL_COLLECTION = "FDA_recalls"
+
+def open_recall_vectorstore():
+    """리콜 벡터스토어 열기 (없으면 빈 컬렉션 생성) - 챗봇 모듈 초기화 없이 사용"""
+    from langchain_community.vectorstores import Chroma
+    from langchain_openai import OpenAIEmbeddings
+    from utils.llm_gateway import wrap_embeddings
+
+    return Chroma(
+        persist_directory=RECALL_PERSIST_DIR,
+        embedding_function=wrap_embeddings(OpenAIEmbeddings(model="text-embedding-3-small")),
+        collection_name=RECALL_COLLECTION,
+    )
+
+def _fetch_details(crawler: FDARealtimeCrawler, rows: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """상세 페이지 병렬 수집 → (성공한 리콜 데이터, 실패한 행)"""
+    recalls, failed = [], []
+    for row, recall_data, error in fetch_concurrently(
+        rows,
+        lambda row: timed_call("crawl.fda.detail", lambda: crawler.fetch_recall_detail(row['url']), kind="http", url=row['url']),
+        url_of=lambda row: row['url'],
+        self_limited=True,  # fetch_recall_detail이 네트워크 요청에만 호스트 제한 적용
+    ):
+        if error is not None or not recall_data:
+            failed.append(row)
+        else:
+            recalls.append(recall_data)
+    return recalls, failed
+
+def run_backfill(vectorstore, crawler: Optional[FDARealtimeCrawler] = None, page_size: int = BACKFILL_PAGE_SIZE,
+                 batch_size: int = UPSERT_BATCH_SIZE, max_pages: Optional[int] = None,
+                 restart: bool = False) -> Dict:
+    """
+    목록 전체를 순회하며 미적재 리콜을 수집/적재
+    반환: {"pages", "ingested", "failed", "next_start", "total", "completed", "error"}
+    - error: 적재 실패로 중단된 경우 오류 메시지 (체크포인트는 실패한 페이지 시작 위치에 그대로 남음)
+    """
+    crawler = crawler or FDARealtimeCrawler(mode="http")
+    state = get_crawl_state()
+    state.sync_with_vectorstore(vectorstore)
+    if restart:
+        state.clear_backfill_checkpoint()
+
+    checkpoint = state.backfill_checkpoint() or {"next_start": 0, "total": None, "ingested": 0}
+    start, total, ingested = checkpoint["next_start"], checkpoint["total"], checkpoint["ingested"]
+    if start:
+        print(f"↩️ 체크포인트에서 재개: {start}행부터 (누적 적재 {ingested}건)")
+
+    pages = 0
+    failed_urls: List[str] = []
+    completed = False
+    error: Optional[str] = None
+    began = time.perf_counter()
+
+    while max_pages is None or pages < max_pages:
+        payload = timed_call("crawl.fda.listing", lambda: crawler.fetch_listing_page(start, page_size),
+                             kind="http", start=start)
+        total = payload.get("recordsFiltered", total)
+        rows = parse_listing_rows(payload, crawler.site_url)
+        if not rows:
+            completed = True
+            break
+
+        known_urls = state.known_urls(row['url'] for row in rows)
+        targets = [row for row in rows if row['url'] not in known_urls]
+
+        # 일시적인 실패는 한 번 더 시도 후 건너뜀 (다음 전체 백필에서 다시 수집 대상이 됨)
+        recalls, failed = _fetch_details(crawler, targets)
+        if failed:
+            retried, failed = _fetch_details(crawler, failed)
+            recalls.extend(retried)
+        failed_urls.extend(row['url'] for row in failed)
+
+        # 적재 실패 시 이 페이지의 체크포인트를 저장하지 않고 중단 (다음 실행에서 이 페이지부터 다시 수집)
+        page_ingested = 0
+        for i in range(0, len(recalls), batch_size):
+            try:
+                page_ingested += update_vectorstore_with_new_data(recalls[i:i + batch_size], vectorstore, raise_errors=True)
+            except CircuitOpenError as e:
+                error = f"서킷 브레이커 open: {e}"
+            except Exception as e:
+                error = f"벡터스토어 적재 실패: {e}"
+            if error:
+                failed_urls.extend(recall['url'] for recall in recalls[i:])
+                break
+        ingested += page_ingested
+        if error:
+            break
+
+        start += len(rows)
+        pages += 1
+        state.save_backfill_checkpoint(start, total, ingested)
+
+        elapsed = time.perf_counter() - began
+        progress = f"{start}/{total}" if total else f"{start}"
+        print(f"📦 백필 진행 {progress}행 | 이번 페이지 신규 {len(targets)}건, 실패 {len(failed)}건 | "
+              f"누적 적재 {ingested}건 | {elapsed:.0f}초")
+
+        if len(rows) < page_size:
+            completed = True
+            break
+
+    if error:
+        print(f"❌ 백필 중단 ({error}): 다음 실행은 {start}행부터")
+    elif completed:
+        state.clear_backfill_checkpoint()
+        print(f"✅ 백필 완료: 누적 적재 {ingested}건")
+    else:
+        print(f"⏸️ 백필 일시 중단: 다음 실행은 {start}행부터")
+    if failed_urls:
+        print(f"⚠️ 수집/적재 실패 {len(failed_urls)}건 (다음 백필 실행 시 다시 수집 대상)")
+
+    return {
+        "pages": pages, "ingested": ingested, "failed": failed_urls,
+        "next_start": start, "total": total, "completed": completed, "error": error,
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="FDA 리콜 전체 아카이브 백필 (재개 가능)")
+    parser.add_argument("--max-pages", type=int, help="이번 실행에서 처리할 최대 목록 페이지 수")
+    parser.add_argument("--page-size", type=int, default=BACKFILL_PAGE_SIZE)
+    parser.add_argument("--batch-size", type=int, default=UPSERT_BATCH_SIZE, help="벡터스토어 upsert 1회당 문서 수")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 지우고 처음부터 시작")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    vectorstore = open_recall_vectorstore()
+    try:
+        result = run_backfill(
+            vectorstore, page_size=args.page_size, batch_size=args.batch_size,
+            max_pages=args.max_pages, restart=args.restart,
+        )
+    except KeyboardInterrupt:
+        print("\n⏸️ 중단됨 - 다시 실행하면 마지막 체크포인트부터 이어서 진행합니다")
+        return 130
+    except Exception as e:
+        print(f"❌ 백필 오류: {e} - 다시 실행하면 마지막 체크포인트부터 이어서 진행합니다")
+        return 1
+    return 1 if result["error"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
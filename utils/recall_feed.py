@@ -0,0 +1,154 @@
+# utils/recall_feed.py
+"""
+FDA 리콜 RSS 피드 폴러 - 증분 업데이트의 "새 리콜이 있나?" 확인용
+- 피드 1건을 조건부 GET(If-None-Match / If-Modified-Since, utils/http_cache.py)으로 요청 → 변경 없으면 304
+- 피드 항목 중 식품/음료 리콜 상세 페이지만 남기고, 크롤링 상태 저장소에 없는 URL만 새 리콜로 판단
+- 새 URL은 상세 페이지 수집(FDARealtimeCrawler.fetch_details_http)으로 바로 넘김 - 목록 크롤링 생략
+- 목록 크롤링은 피드로 판단할 수 없을 때만 수행
+  · 피드 요청/해석 실패 (네트워크 오류로 캐시된 이전 본문(X-Cache: STALE)만 받은 경우 포함)
+  · 피드의 식품 리콜이 모두 새 항목 (피드 범위 밖에도 새 리콜이 있을 수 있음, 최초 실행 포함)
+
+사용법 (프로젝트 루트에서 실행):
+  python -m utils.recall_feed                        # 피드만 확인하고 새 리콜 URL 출력 (적재하지 않음)
+  FDA_BASE_URL=http://127.0.0.1:8765 python -m utils.recall_feed   # 대역 서버(benchmarks/fda_stub_server.py) 피드 확인
+
+환경 변수
+- FDA_RECALL_FEED_URL: 리콜 피드 주소 (기본 FDA_BASE_URL + Food Safety Recalls 피드 경로)
+- FDA_FEED_POLL: "0"이면 피드 확인 없이 항상 목록 크롤링 (기본 "1")
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+import feedparser
+from utils.crawl_state import get_crawl_state
+from utils.fda_realtime_crawler import (
+    FDARealtimeCrawler, FDA_BASE_URL, HTTP_TIMEOUT, MAX_RECALLS, RECALL_LISTING_PATH, get_http_session
+)
+from utils.http_cache import cached_get
+from utils.instrumentation import timed_call
+
+RECALL_FEED_PATH = "/about-fda/contact-fda/stay-informed/rss-feeds/food-safety-recalls/rss.xml"
+FDA_RECALL_FEED_URL = os.getenv("FDA_RECALL_FEED_URL", "")
+FDA_FEED_POLL = os.getenv("FDA_FEED_POLL", "1") != "0"
+
+# 피드 항목에 분류(category)가 있으면 이 단어가 들어간 항목만 식품/음료 리콜로 간주
+FOOD_CATEGORY_TERMS = ("food", "beverage")
+
+def recall_feed_url(site_url: str = FDA_BASE_URL) -> str:
+    return FDA_RECALL_FEED_URL or site_url.rstrip("/") + RECALL_FEED_PATH
+
+def _entry_url(entry) -> str:
+    """피드 링크 → 목록 크롤링과 같은 형태의 상세 페이지 URL (추적용 쿼리/프래그먼트/끝 슬래시 제거)"""
+    parts = urlsplit((entry.get("link") or "").strip())
+    return urlunsplit((parts.scheme, parts.netloc, parts.path.rstrip("/"), "", ""))
+
+def is_food_recall_entry(entry) -> bool:
+    """리콜 상세 페이지 링크이면서 (분류가 있는 경우) 식품/음료로 분류된 항목"""
+    if not urlsplit(_entry_url(entry)).path.startswith(RECALL_LISTING_PATH + "/"):
+        return False
+    terms = [(tag.get("term") or "").lower() for tag in entry.get("tags") or []]
+    return not terms or any(word in term for term in terms for word in FOOD_CATEGORY_TERMS)
+
+def parse_recall_feed(content: bytes) -> List[Dict[str, Any]]:
+    """피드 본문 → 식품/음료 리콜 [{url, title, table_date, date_text}] (피드 순서 유지, 중복 제거)"""
+    parsed = feedparser.parse(content)
+    if parsed.bozo and not parsed.entries:
+        raise ValueError(f"피드를 해석할 수 없음: {parsed.get('bozo_exception')}")
+
+    rows, seen = [], set()
+    for entry in parsed.entries:
+        if not is_food_recall_entry(entry):
+            continue
+        url = _entry_url(entry)
+        if url in seen:
+            continue
+        seen.add(url)
+        published = entry.get("published_parsed") or entry.get("updated_parsed")
+        table_date = datetime(*published[:6]) if published else None
+        rows.append({
+            'url': url,
+            'title': entry.get("title", ""),
+            'table_date': table_date,
+            'date_text': table_date.strftime('%m/%d/%Y') if table_date else "",
+        })
+    return rows
+
+def poll_recall_feed(site_url: str = FDA_BASE_URL, feed_url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    피드 1회 확인 (조건부 GET 1건 + 로컬 URL 인덱스 조회)
+    반환: {"feed_url", "not_modified", "entries", "new", "complete"}
+    - new: 아직 적재되지 않은 식품/음료 리콜 행
+    - complete: 이미 적재된 항목이 피드에 보이면 True (그 이후의 새 리콜은 모두 피드 안에 있음)
+    """
+    feed_url = feed_url or recall_feed_url(site_url)
+    response = timed_call(
+        "crawl.fda.feed",
+        lambda: cached_get(feed_url, session=get_http_session(), timeout=HTTP_TIMEOUT, max_age=0),
+        kind="http", url=feed_url,
+    )
+    response.raise_for_status()
+    # 네트워크 오류로 받은 이전 본문은 새 리콜 여부를 판단할 수 없으므로 피드 실패로 처리
+    if response.headers.get("X-Cache") == "STALE":
+        raise ConnectionError(f"피드 요청 실패 - 캐시된 이전 본문만 있음: {feed_url}")
+
+    # 피드 본문은 304여도 캐시에 있으므로 항상 URL 인덱스와 비교 (지난 적재가 실패했어도 누락되지 않음)
+    rows = parse_recall_feed(response.content)
+    known_urls = get_crawl_state().known_urls(row['url'] for row in rows)
+    return {
+        "feed_url": feed_url,
+        "not_modified": response.headers.get("X-Cache") == "HIT",
+        "entries": len(rows),
+        "new": [row for row in rows if row['url'] not in known_urls],
+        "complete": bool(known_urls),
+    }
+
+def iter_new_recalls(crawler: Optional[FDARealtimeCrawler] = None, after_date=None,
+                     max_recalls: Optional[int] = None, deadline: Optional[float] = None) -> Iterator[Dict]:
+    """
+    증분 업데이트용 수집 - 피드로 새 리콜 여부를 먼저 확인
+    - 새 URL이 없으면 아무것도 수집하지 않음
+    - 새 URL이 모두 피드 안에 있으면 해당 상세 페이지만 수집
+    - 그 밖의 경우 목록 크롤링(iter_latest_recalls)으로 대체
+    - deadline: 질문 응답 시간 예산 - 답변 생성 시간만 남으면 상세 페이지 수집 중단
+    """
+    crawler = crawler or FDARealtimeCrawler()
+    if FDA_FEED_POLL:
+        try:
+            result = poll_recall_feed(crawler.site_url)
+        except Exception as e:
+            print(f"⚠️ 리콜 피드 확인 실패: {e} - 목록 크롤링으로 대체")
+        else:
+            if result["complete"]:
+                if not result["new"]:
+                    print(f"📭 리콜 피드 변경 없음 ({'304' if result['not_modified'] else '새 리콜 없음'})")
+                    return
+                targets = result["new"][:max_recalls or MAX_RECALLS]
+                print(f"📰 리콜 피드에서 새 리콜 {len(targets)}건 발견 - 상세 페이지만 수집")
+                yield from crawler.fetch_details_http(targets, deadline)
+                return
+            print(f"📰 피드의 식품 리콜 {result['entries']}건이 모두 새 항목 - 목록 크롤링으로 확인")
+
+    yield from crawler.iter_latest_recalls(after_date, max_recalls=max_recalls, deadline=deadline)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="FDA 리콜 피드 확인 (적재하지 않음)")
+    parser.add_argument("--feed-url", help="피드 주소 (기본 FDA_RECALL_FEED_URL 또는 FDA_BASE_URL 기준 경로)")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    result = poll_recall_feed(feed_url=args.feed_url)
+    print(f"피드: {result['feed_url']} ({'304 변경 없음' if result['not_modified'] else '새 본문'}) "
+          f"| 식품 리콜 {result['entries']}건 | 새 리콜 {len(result['new'])}건")
+    for row in result["new"]:
+        print(f"  - {row['date_text']} {row['title'][:60]} {row['url']}")
+    if not result["complete"]:
+        print("⚠️ 피드 범위 밖에도 새 리콜이 있을 수 있음 - 목록 크롤링 필요")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+# utils/report_summarizer.py
+"""
+분석 리포트용 Q&A 맵-리듀스 요약
+- map: Q&A 쌍을 토큰 상한 단위 청크로 묶어 병렬 요약
+- reduce: 청크 요약들을 하나의 규제/리콜 요약으로 병합 (많으면 단계적으로 병합)
+- 청크 요약은 내용 해시로 디스크 캐시 → 질문이 몇 개 추가되면 새 청크만 다시 요약
+  (최대 MAX_CACHED_SUMMARIES개 보관, 오래된 것부터 삭제)
+"""
+import contextvars
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from langchain_core.messages import HumanMessage
+from utils.llm_gateway import estimate_tokens, invoke_llm, make_chat_model
+
+SUMMARY_CACHE_FILE = "./data/report_summary_cache.json"
+# 최대 보관 청크/병합 요약 수 (오래된 것부터 삭제)
+MAX_CACHED_SUMMARIES = 500
+
+# 청크당 Q&A 토큰 상한 / 한 번에 병합할 요약 개수 / 병렬 요약 수
+CHUNK_TOKEN_LIMIT = 6000
+REDUCE_FAN_IN = 8
+MAP_WORKERS = 4
+
+# 프롬프트가 바뀌면 캐시가 자동으로 무효화되도록 해시에 포함
+PROMPT_VERSION = "v1"
+
+RESPONSE_FORMAT = """응답 형식:
+📋 **규제 관련 요약**
+[규제 관련 요약 내용]
+
+🚨 **리콜사례 요약**
+[리콜사례 관련 요약 내용]"""
+
+MAP_PROMPT = """
+다음 Q&A 대화들을 분석하여 규제 및 리콜사례 관련 내용을 요약해주세요.
+
+분석 요구사항:
+1. 규제 관련 내용 (FDA 규정, 법령, 허가, 등록, 라벨링 등)
+2. 리콜사례 관련 내용 (제품 리콜, 회수, 안전 경고 등)
+
+각 카테고리별로 3-4문장으로 핵심 내용을 요약하고, 해당 내용이 없는 경우 "관련 내용 없음"으로 표시해주세요.
+
+{response_format}
+
+Q&A 내용:
+{qa_text}
+"""
+
+REDUCE_PROMPT = """
+다음은 같은 프로젝트의 Q&A 대화를 구간별로 나누어 요약한 결과입니다.
+구간별 요약을 하나로 통합해 규제 및 리콜사례 관련 내용을 요약해주세요.
+
+통합 규칙:
+- 중복되는 내용은 한 번만 서술하고, 서로 다른 제품/규정/리콜 사례는 모두 유지하세요.
+- 각 카테고리별로 3-4문장으로 핵심 내용을 요약하세요.
+- 모든 구간에서 "관련 내용 없음"인 카테고리만 "관련 내용 없음"으로 표시하세요.
+
+{response_format}
+
+구간별 요약:
+{summaries}
+"""
+
+def split_qa_pairs(chat_history: Sequence[Dict]) -> List[Tuple[str, str]]:
+    """채팅 기록(user/assistant 교대)을 (질문, 답변) 쌍 목록으로 변환"""
+    pairs = []
+    for i in range(0, len(chat_history), 2):
+        if i + 1 < len(chat_history):
+            pairs.append((chat_history[i]["content"], chat_history[i + 1]["content"]))
+    return pairs
+
+def format_pairs(pairs: Sequence[Tuple[str, str]]) -> str:
+    return "".join(f"질문: {question}\n답변: {answer}\n\n" for question, answer in pairs)
+
+def chunk_pairs(pairs: Sequence[Tuple[str, str]], token_limit: int = CHUNK_TOKEN_LIMIT) -> List[List[Tuple[str, str]]]:
+    """
+    앞에서부터 토큰 상한까지 순서대로 묶음
+    앞쪽 청크 경계는 질문이 뒤에 추가되어도 바뀌지 않으므로 캐시가 그대로 재사용됨
+    """
+    chunks, current, current_tokens = [], [], 0
+    for pair in pairs:
+        pair_tokens = estimate_tokens(format_pairs([pair]))
+        if current and current_tokens + pair_tokens > token_limit:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(pair)
+        current_tokens += pair_tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+class SummaryCache:
+    """내용 해시 → 요약 디스크 캐시 (원자적 쓰기)"""
+
+    def __init__(self, path: str = SUMMARY_CACHE_FILE, max_entries: int = MAX_CACHED_SUMMARIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        try:
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+        except Exception as e:
+            print(f"요약 캐시 로드 실패: {e}")
+
+    @staticmethod
+    def key(kind: str, text: str) -> str:
+        return hashlib.sha256(f"{PROMPT_VERSION}:{kind}:{text}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        return entry["summary"] if entry else None
+
+    def put_many(self, items: Dict[str, str]) -> None:
+        if not items:
+            return
+        with self._lock:
+            now = datetime.now().isoformat()
+            for key, summary in items.items():
+                self._entries[key] = {"summary": summary, "updated": now}
+            entries = self._entries
+            if len(entries) > self.max_entries:
+                oldest = sorted(entries, key=lambda key: entries[key]["updated"])[:len(entries) - self.max_entries]
+                for key in oldest:
+                    del entries[key]
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                temp_file = f"{self.path}.tmp"
+                with open(temp_file, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f, ensure_ascii=False, indent=2)
+                os.replace(temp_file, self.path)
+            except Exception as e:
+                print(f"요약 캐시 저장 실패: {e}")
+
+_cache: Optional[SummaryCache] = None
+_cache_lock = threading.Lock()
+
+def get_summary_cache() -> SummaryCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SummaryCache()
+    return _cache
+
+def _summarize(llm, prompt: str) -> str:
+    return invoke_llm(llm, [HumanMessage(content=prompt)]).content.strip()
+
+def _run_cached(llm, kind: str, texts: List[str], build_prompt, cache: SummaryCache) -> List[str]:
+    """캐시에 없는 텍스트만 병렬로 요약하고 입력 순서대로 결과 반환"""
+    keys = [cache.key(kind, text) for text in texts]
+    results = {key: cache.get(key) for key in keys}
+    missing = [(key, text) for key, text in zip(keys, texts) if results[key] is None]
+
+    if missing:
+        print(f"📝 {kind} 요약: 전체 {len(texts)}개 중 {len(missing)}개 새로 요약 (캐시 {len(texts) - len(missing)}개)")
+        with ThreadPoolExecutor(max_workers=MAP_WORKERS) as executor:
+            # 계측 스팬이 이어지도록 작업마다 현재 컨텍스트 복사본에서 실행
+            contexts = [contextvars.copy_context() for _ in missing]
+            summaries = list(executor.map(
+                lambda item, context: context.run(_summarize, llm, build_prompt(item[1])),
+                missing, contexts,
+            ))
+        new_items = {key: summary for (key, _), summary in zip(missing, summaries)}
+        cache.put_many(new_items)
+        results.update(new_items)
+    return [results[key] for key in keys]
+
+def summarize_qa_pairs(pairs: Sequence[Tuple[str, str]], openai_api_key: Optional[str] = None,
+                       cache: Optional[SummaryCache] = None) -> str:
+    """Q&A 쌍 맵-리듀스 요약 (청크가 하나면 단일 요청)"""
+    if not pairs:
+        return ""
+    cache = cache or get_summary_cache()
+    llm = make_chat_model("gpt-4o-mini", temperature=0.3, openai_api_key=openai_api_key)
+
+    # map: 청크별 요약
+    chunk_texts = [format_pairs(chunk) for chunk in chunk_pairs(pairs)]
+    summaries = _run_cached(
+        llm, "map", chunk_texts,
+        lambda text: MAP_PROMPT.format(response_format=RESPONSE_FORMAT, qa_text=text),
+        cache,
+    )
+
+    # reduce: REDUCE_FAN_IN개씩 묶어 하나가 될 때까지 병합
+    while len(summaries) > 1:
+        groups = [summaries[i:i + REDUCE_FAN_IN] for i in range(0, len(summaries), REDUCE_FAN_IN)]
+        group_texts = [
+            "\n\n".join(f"[구간 {index + 1}]\n{summary}" for index, summary in enumerate(group))
+            for group in groups
+        ]
+        summaries = _run_cached(
+            llm, "reduce", group_texts,
+            lambda text: REDUCE_PROMPT.format(response_format=RESPONSE_FORMAT, summaries=text),
+            cache,
+        )
+    return summaries[0]
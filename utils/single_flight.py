@@ -0,0 +1,67 @@
+# utils/single_flight.py
+"""
+동일 요청 병합(single-flight) - 같은 요청 해시로 동시에 들어온 호출은 한 번만 실행
+- 첫 호출자(leader)만 실제 함수를 실행하고, 나머지(follower)는 완료를 기다려 결과를 공유
+- 예외도 동일하게 모든 대기자에게 전파
+- 완료되면 키를 즉시 제거 (결과 캐시가 아님 - 실행 중인 호출만 병합)
+
+환경 변수
+- LLM_SINGLE_FLIGHT: "0"이면 비활성화 (기본 "1")
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+SINGLE_FLIGHT_ENABLED = os.getenv("LLM_SINGLE_FLIGHT", "1") != "0"
+
+class _Call:
+    """실행 중인 호출 하나 (완료 이벤트 + 결과/예외)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.followers = 0
+
+class SingleFlight:
+    """키 단위 실행 중 호출 병합기"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.stats = {"leaders": 0, "followers": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """fn()을 키당 한 번만 실행 - (결과, 다른 호출 결과를 공유했는지) 반환"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                self.stats["followers"] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.stats["leaders"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
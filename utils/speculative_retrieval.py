@@ -0,0 +1,103 @@
+# utils/speculative_retrieval.py
+"""
+추측(speculative) 병렬 검색 - 번역 LLM 왕복을 검색의 임계 경로에서 제거
+- 한국어 원문 질문으로 바로 벡터 검색을 시작 (다국어 임베딩 활용)
+- 동시에 번역은 백그라운드에서 진행
+- 추측 검색 결과가 충분히 가까우면 그대로 사용, 부족하면 번역 결과로 검색해 병합
+
+환경 변수
+- SPECULATIVE_RETRIEVAL: "0"이면 비활성화 (기본 "1")
+- SPECULATIVE_K: 문서 타입별 추측 검색 개수 (기본 8)
+- SPECULATIVE_MAX_DISTANCE: 사용할 추측 결과의 최대 거리 (기본 1.1, 작을수록 유사)
+- SPECULATIVE_MIN_DOCS: 추측 결과만으로 충분하다고 판단할 최소 문서 수 (기본 2)
+"""
+import contextvars
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from langchain_core.documents import Document
+from utils.instrumentation import timed_call
+
+SPECULATIVE_RETRIEVAL = os.getenv("SPECULATIVE_RETRIEVAL", "1") != "0"
+SPECULATIVE_K = int(os.getenv("SPECULATIVE_K", "8"))
+SPECULATIVE_MAX_DISTANCE = float(os.getenv("SPECULATIVE_MAX_DISTANCE", "1.1"))
+SPECULATIVE_MIN_DOCS = int(os.getenv("SPECULATIVE_MIN_DOCS", "2"))
+
+# 번역/추측 검색/키워드 추출 등 질문 단위 병렬 작업용 공용 스레드 풀
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="speculative")
+
+def submit(fn: Callable, *args, **kwargs) -> Future:
+    """현재 컨텍스트(계측 스팬 등)를 유지한 채 백그라운드 실행"""
+    context = contextvars.copy_context()
+    return _executor.submit(context.run, fn, *args, **kwargs)
+
+class Speculation:
+    """질문 하나에 대한 백그라운드 번역 + 추측 검색 결과"""
+
+    def __init__(self, question: str, translation: Future, hits: Optional[Future]):
+        self.question = question
+        self._translation = translation
+        self._hits = hits
+
+    def question_en(self) -> str:
+        """번역 결과 (필요한 시점에만 대기, 실패 시 원문)"""
+        try:
+            return self._translation.result() or self.question
+        except Exception as e:
+            print(f"백그라운드 번역 실패: {e}")
+            return self.question
+
+    def hits(self) -> List[Tuple[Document, float]]:
+        """추측 검색 결과 [(문서, 거리)] (실패 시 빈 목록)"""
+        if self._hits is None:
+            return []
+        try:
+            return self._hits.result()
+        except Exception as e:
+            print(f"추측 검색 실패: {e}")
+            return []
+
+def speculative_search(vectorstore: Any, question: str, document_types: Sequence[str],
+                       k: int = SPECULATIVE_K) -> List[Tuple[Document, float]]:
+    """원문 질문을 한 번만 임베딩하고 문서 타입별로 벡터 검색"""
+    embedding = vectorstore.embeddings.embed_query(question)
+    hits = []
+    for document_type in document_types:
+        hits.extend(timed_call(
+            "chroma.speculative.search",
+            lambda: vectorstore.similarity_search_by_vector_with_relevance_scores(
+                embedding, k=k, filter={"document_type": {"$eq": document_type}}
+            ),
+            document_type=document_type,
+        ))
+    return hits
+
+def start_speculation(question: str, translate_fn: Callable[[str], str],
+                      search_fn: Optional[Callable[[str], List[Tuple[Document, float]]]] = None) -> Speculation:
+    """번역과 원문 추측 검색을 동시에 시작"""
+    translation = submit(translate_fn, question)
+    hits = submit(search_fn, question) if search_fn else None
+    return Speculation(question, translation, hits)
+
+def select_hits(hits: Sequence[Tuple[Document, float]], metadata: Dict[str, str], k: int,
+                max_distance: float = SPECULATIVE_MAX_DISTANCE) -> List[Document]:
+    """메타데이터가 일치하고 충분히 가까운 추측 결과를 거리순으로 최대 k개 선택"""
+    matched = [
+        (doc, distance) for doc, distance in hits
+        if distance <= max_distance and all(doc.metadata.get(key) == value for key, value in metadata.items())
+    ]
+    matched.sort(key=lambda item: item[1])
+    return [doc for doc, _ in matched[:k]]
+
+def is_good_enough(docs: Sequence[Document], min_docs: int = SPECULATIVE_MIN_DOCS) -> bool:
+    return len(docs) >= min_docs
+
+def merge_documents(primary: Sequence[Document], secondary: Sequence[Document], limit: int) -> List[Document]:
+    """두 결과를 앞 100자 기준으로 중복 제거하며 병합"""
+    merged, seen = [], set()
+    for doc in list(primary) + list(secondary):
+        key = doc.page_content[:100]
+        if key not in seen:
+            merged.append(doc)
+            seen.add(key)
+    return merged[:limit]
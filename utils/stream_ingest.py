@@ -0,0 +1,151 @@
+# utils/stream_ingest.py
+"""
+대용량 JSON → 벡터스토어 스트리밍 적재
+- iter_json_array: 최상위 JSON 배열을 청크 단위로 읽으며 항목을 하나씩 반환 (파일 전체를 메모리에 올리지 않음)
+- ingest_documents: 문서 이터레이터를 고정 크기 배치로 묶어 병렬 임베딩 → 순서대로 upsert
+  동시에 진행 중인 배치 수를 제한해 파일 크기와 무관하게 최대 메모리 사용량을 일정하게 유지
+
+환경 변수
+- INGEST_BATCH_DOCS: 임베딩/적재 배치 크기 (기본 64)
+- INGEST_EMBED_WORKERS: 동시에 임베딩하는 배치 수 (기본 4)
+"""
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from langchain_core.documents import Document
+
+INGEST_BATCH_DOCS = int(os.getenv("INGEST_BATCH_DOCS", "64"))
+INGEST_EMBED_WORKERS = int(os.getenv("INGEST_EMBED_WORKERS", "4"))
+
+_WHITESPACE = " \t\r\n"
+_DELIMITERS = _WHITESPACE + ",]"
+
+def iter_json_array(path: str, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """최상위 JSON 배열의 항목을 순서대로 반환 (json.JSONDecoder.raw_decode 기반 증분 파싱)"""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip_whitespace() -> None:
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buffer) or not fill():
+                    return
+
+        skip_whitespace()
+        if pos < len(buffer) and buffer[pos] == "\ufeff":  # BOM
+            pos += 1
+            skip_whitespace()
+        if pos >= len(buffer) or buffer[pos] != "[":
+            raise ValueError(f"JSON 배열이 아닙니다: {path}")
+        pos += 1
+
+        expect_item = True
+        while True:
+            skip_whitespace()
+            if pos >= len(buffer):
+                raise ValueError(f"JSON 배열이 닫히지 않았습니다: {path}")
+            if buffer[pos] == "]":
+                return
+            if not expect_item:
+                if buffer[pos] != ",":
+                    raise ValueError(f"JSON 배열 구분자 오류 (위치 {pos}): {path}")
+                pos += 1
+                expect_item = True
+                continue
+
+            # 항목이 청크 경계에 걸쳐 있으면 더 읽어서 다시 시도
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                    # 숫자는 청크 경계에서 잘려도 앞부분만으로 해석되므로 뒤에 구분자가 보일 때까지 확정하지 않음
+                    if eof or (end < len(buffer) and buffer[end] in _DELIMITERS):
+                        break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                fill()
+            pos = end
+            expect_item = False
+            yield item
+
+def _batches(items: Iterable[Document], size: int) -> Iterator[List[Document]]:
+    batch: List[Document] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def ingest_documents(vectorstore, documents: Iterable[Document], id_of: Callable[[Document], str],
+                     batch_size: int = INGEST_BATCH_DOCS, max_workers: int = INGEST_EMBED_WORKERS,
+                     progress: Optional[Callable[[Dict], None]] = None,
+                     after_batch: Optional[Callable[[List[str], List[Document]], None]] = None) -> int:
+    """
+    문서 이터레이터를 배치 단위로 임베딩해 vectorstore(Chroma)에 upsert
+    - 임베딩은 최대 max_workers 배치까지 병렬, 적재는 제출 순서대로 호출 스레드에서 수행
+    - id_of로 만든 결정적 ID로 upsert하므로 다시 실행해도 중복 문서가 생기지 않음
+    - after_batch(ids, docs): 배치 적재 직후 호출 (보조 색인 등)
+    반환: 적재한 문서 수
+    """
+    embeddings = vectorstore._embedding_function
+    collection = vectorstore._collection
+    inserted = 0
+    started = time.perf_counter()
+
+    def embed(batch: List[Document]):
+        # 배치 내 같은 ID는 마지막 문서만 사용 (upsert 1회에 중복 ID 불가)
+        unique = {id_of(doc): doc for doc in batch}
+        docs = list(unique.values())
+        return list(unique), docs, embeddings.embed_documents([doc.page_content for doc in docs])
+
+    def flush(future) -> None:
+        nonlocal inserted
+        ids, docs, vectors = future.result()
+        collection.upsert(
+            ids=ids,
+            embeddings=vectors,
+            documents=[doc.page_content for doc in docs],
+            metadatas=[doc.metadata for doc in docs],
+        )
+        inserted += len(ids)
+        if after_batch:
+            after_batch(ids, docs)
+        if progress:
+            elapsed = time.perf_counter() - started
+            progress({"inserted": inserted, "elapsed": elapsed, "rate": inserted / elapsed if elapsed else 0.0})
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="embed") as executor:
+        try:
+            for batch in _batches(documents, batch_size):
+                # 진행 중인 배치가 max_workers개면 가장 오래된 배치를 적재한 뒤 다음 배치 제출
+                if len(pending) >= max_workers:
+                    flush(pending.popleft())
+                pending.append(executor.submit(embed, batch))
+            while pending:
+                flush(pending.popleft())
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+    return inserted
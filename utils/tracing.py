@@ -0,0 +1,141 @@
+# utils/tracing.py
+"""
+OpenTelemetry 트레이싱 설정 - 질문 1건 = 트레이스 1개
+- utils/instrumentation.py의 span()이 OTel 스팬도 함께 생성 (그래프 노드, LLM 호출, 크롤링, 뉴스 검색)
+- OTel 패키지를 불러올 수 없거나 TRACING_EXPORTER=none 이면 아무 동작도 하지 않음
+
+환경 변수
+- TRACING_EXPORTER: otlp | file | console | none
+  (기본값: OTEL_EXPORTER_OTLP_ENDPOINT가 설정되어 있으면 otlp, 아니면 none - 스팬은 utils/instrumentation.py 롤링 로그에 이미 기록됨)
+- OTEL_EXPORTER_OTLP_ENDPOINT / OTEL_EXPORTER_OTLP_PROTOCOL: 로컬 컬렉터 주소 / grpc | http/protobuf
+- TRACING_FILE_PATH: file 익스포터 경로 (기본 ./logs/otel_traces.jsonl, SPAN_LOG_MAX_BYTES / SPAN_LOG_BACKUPS 기준으로 롤링)
+- OTEL_SERVICE_NAME: 서비스 이름 (기본 risk-killer)
+"""
+import atexit
+import logging
+import os
+import threading
+from contextlib import nullcontext
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, Optional
+
+TRACING_FILE_PATH = os.getenv("TRACING_FILE_PATH", "./logs/otel_traces.jsonl")
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "risk-killer")
+# 스팬 JSONL 로그(utils/instrumentation.py)와 같은 롤링 기준
+TRACING_FILE_MAX_BYTES = int(os.getenv("SPAN_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+TRACING_FILE_BACKUPS = int(os.getenv("SPAN_LOG_BACKUPS", "3"))
+
+_tracer = None
+_initialized = False
+_init_lock = threading.Lock()
+
+def _exporter_name() -> str:
+    default = "otlp" if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT") else "none"
+    return os.getenv("TRACING_EXPORTER", default).strip().lower()
+
+def _build_exporter(name: str):
+    """익스포터 이름에 맞는 SpanExporter 생성"""
+    if name == "otlp":
+        protocol = os.getenv("OTEL_EXPORTER_OTLP_PROTOCOL", "grpc").strip().lower()
+        if protocol.startswith("http"):
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        else:
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter()
+    if name == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        return ConsoleSpanExporter()
+    if name == "file":
+        return _file_exporter(TRACING_FILE_PATH)
+    raise ValueError(f"지원하지 않는 TRACING_EXPORTER: {name}")
+
+def _file_exporter(path: str):
+    """스팬을 한 줄에 하나씩 JSON으로 기록하는 롤링 파일 익스포터"""
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+    class FileSpanExporter(SpanExporter):
+        def __init__(self, file_path: str):
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+            handler = RotatingFileHandler(file_path, maxBytes=TRACING_FILE_MAX_BYTES,
+                                          backupCount=TRACING_FILE_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._logger = logging.getLogger("risk_app.otel_traces")
+            self._logger.setLevel(logging.INFO)
+            self._logger.propagate = False
+            self._logger.addHandler(handler)
+
+        def export(self, spans) -> "SpanExportResult":
+            try:
+                for span in spans:
+                    self._logger.info(span.to_json(indent=None))
+                return SpanExportResult.SUCCESS
+            except Exception as e:
+                print(f"⚠️ 트레이스 파일 기록 실패: {e}")
+                return SpanExportResult.FAILURE
+
+    return FileSpanExporter(path)
+
+def init_tracing():
+    """트레이서 프로바이더 초기화 (최초 1회) - 실패 시 None 반환"""
+    global _tracer, _initialized
+    if _initialized:
+        return _tracer
+    with _init_lock:
+        if _initialized:
+            return _tracer
+        _initialized = True
+
+        exporter_name = _exporter_name()
+        if exporter_name == "none":
+            return None
+        try:
+            from opentelemetry import trace
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+            provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+            provider.add_span_processor(BatchSpanProcessor(_build_exporter(exporter_name)))
+            trace.set_tracer_provider(provider)
+            atexit.register(provider.shutdown)
+            _tracer = trace.get_tracer("risk_killer")
+            print(f"✅ OpenTelemetry 트레이싱 활성화 ({exporter_name})")
+        except Exception as e:
+            print(f"⚠️ OpenTelemetry 트레이싱 비활성화: {e}")
+            _tracer = None
+    return _tracer
+
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None):
+    """현재 컨텍스트의 자식 OTel 스팬 시작 (트레이싱 비활성화 시 None을 돌려주는 빈 컨텍스트)"""
+    tracer = init_tracing()
+    if tracer is None:
+        return nullcontext(None)
+    return tracer.start_as_current_span(name, attributes=_clean_attributes(attributes or {}))
+
+def _clean_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    """OTel 속성으로 쓸 수 있는 값(str/bool/int/float)으로 변환"""
+    cleaned = {}
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, (str, bool, int, float)):
+            cleaned[key] = value
+        else:
+            cleaned[key] = str(value)
+    return cleaned
+
+def set_span_attributes(otel_span: Any, attributes: Dict[str, Any]) -> None:
+    """OTel 스팬 속성 일괄 설정"""
+    if otel_span is None:
+        return
+    for key, value in _clean_attributes(attributes).items():
+        otel_span.set_attribute(key, value)
+
+def span_ids(otel_span: Any) -> Optional[Dict[str, str]]:
+    """OTel 스팬의 trace_id / span_id (16진수 문자열) - JSONL 스팬과 연결용"""
+    if otel_span is None:
+        return None
+    context = otel_span.get_span_context()
+    if not context.is_valid:
+        return None
+    return {"trace_id": format(context.trace_id, "032x"), "span_id": format(context.span_id, "016x")}
@@ -0,0 +1,170 @@
+# utils/translation_memory.py
+"""
+한→영 번역 메모리 + 브랜드 용어집
+- 정규화된 원문을 키로 번역 결과를 디스크(JSON)에 영구 저장, 메모리 dict로 조회
+- 용어집(브랜드/제품명)은 LLM 호출 전에 항상 결정적으로 먼저 적용
+- 용어집 적용만으로 한글이 남지 않으면 LLM 없이 로컬에서 바로 반환
+- 네임스페이스로 번역 방식(프롬프트)별 결과를 분리 (regulation / recall)
+"""
+import json
+import os
+import re
+import threading
+import unicodedata
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+TRANSLATION_MEMORY_FILE = "./data/translation_memory.json"
+# 사용자 정의 용어집 (선택) - {"한국어": "English"} 형식, 기본 용어집을 덮어씀
+GLOSSARY_FILE = "./data/brand_glossary.json"
+
+# 기본 브랜드/제품 용어집 (긴 표현이 먼저 적용됨)
+BRAND_GLOSSARY = {
+    "불닭볶음면": "Buldak ramen",
+    "불닭": "Buldak",
+    "신라면": "Shin Ramyun",
+    "짜파게티": "Chapagetti",
+    "너구리": "Neoguri",
+    "농심": "Nongshim",
+    "삼양": "Samyang",
+    "오뚜기": "Ottogi",
+    "팔도": "Paldo",
+    "오리온": "Orion",
+    "초코파이": "Choco Pie",
+    "꼬북칩": "Turtle Chips",
+    "롯데": "Lotte",
+    "빼빼로": "Pepero",
+    "해태": "Haitai",
+    "크라운": "Crown",
+    "CJ제일제당": "CJ CheilJedang",
+    "비비고": "Bibigo",
+    "종가집": "Jongga",
+    "풀무원": "Pulmuone",
+    "동원": "Dongwon",
+    "빙그레": "Binggrae",
+    "메로나": "Melona",
+    "하이트진로": "HiteJinro",
+    "참이슬": "Chamisul",
+    "고추장": "gochujang",
+    "된장": "doenjang",
+    "김치": "kimchi",
+    "만두": "dumplings",
+    "라면": "ramen",
+    "떡볶이": "tteokbokki",
+    "리콜": "recall",
+    "사례": "cases",
+}
+
+_HANGUL_RE = re.compile(r"[가-힣ㄱ-ㆎ]")
+_SPACE_RE = re.compile(r"\s+")
+
+def normalize_source(text: str) -> str:
+    """번역 메모리 키 정규화 (유니코드 NFKC, 공백 축약, 소문자, 끝 문장부호 제거)"""
+    normalized = unicodedata.normalize("NFKC", text or "")
+    normalized = _SPACE_RE.sub(" ", normalized).strip().lower()
+    return normalized.rstrip("?!.~ ")
+
+def has_hangul(text: str) -> bool:
+    return bool(_HANGUL_RE.search(text or ""))
+
+class TranslationMemory:
+    """디스크 영구 저장 번역 메모리"""
+
+    def __init__(self, path: str = TRANSLATION_MEMORY_FILE, glossary: Optional[Dict[str, str]] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Dict]] = self._load()
+        self.glossary: Dict[str, str] = dict(BRAND_GLOSSARY)
+        self.glossary.update(glossary if glossary is not None else self._load_glossary_file())
+        self._glossary_items: List[Tuple[str, str]] = sorted(self.glossary.items(), key=lambda item: len(item[0]), reverse=True)
+        self._stats_lock = threading.Lock()
+        self.stats = {"exact_hits": 0, "glossary_hits": 0, "misses": 0}
+
+    def _count(self, stat: str) -> None:
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def _load(self) -> Dict[str, Dict[str, Dict]]:
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"번역 메모리 로드 실패: {e}")
+        return {}
+
+    @staticmethod
+    def _load_glossary_file() -> Dict[str, str]:
+        try:
+            if os.path.exists(GLOSSARY_FILE):
+                with open(GLOSSARY_FILE, "r", encoding="utf-8") as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"용어집 로드 실패: {e}")
+        return {}
+
+    def _save(self) -> None:
+        """원자적 쓰기 (호출자가 _lock 보유)"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_file = f"{self.path}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, self.path)
+
+    def apply_glossary(self, text: str) -> str:
+        """용어집 치환 (긴 표현 우선, 치환된 영문 앞뒤 공백 보정)"""
+        result = text
+        for source, target in self._glossary_items:
+            if source in result:
+                result = result.replace(source, f" {target} ")
+        return _SPACE_RE.sub(" ", result).strip()
+
+    def lookup(self, namespace: str, text: str) -> Optional[str]:
+        entry = self._entries.get(namespace, {}).get(normalize_source(text))
+        return entry["target"] if entry else None
+
+    def store(self, namespace: str, text: str, translation: str) -> None:
+        key = normalize_source(text)
+        with self._lock:
+            self._entries.setdefault(namespace, {})[key] = {
+                "source": text,
+                "target": translation,
+                "updated": datetime.now().isoformat(),
+            }
+            try:
+                self._save()
+            except Exception as e:
+                print(f"번역 메모리 저장 실패: {e}")
+
+    def translate(self, namespace: str, text: str, llm_translate: Callable[[str], str]) -> str:
+        """
+        번역 메모리 → 용어집 → LLM 순으로 번역
+        llm_translate에는 용어집이 적용된 텍스트가 전달됨 (브랜드명이 항상 같은 영문으로 고정)
+        """
+        cached = self.lookup(namespace, text)
+        if cached is not None:
+            self._count("exact_hits")
+            return cached
+
+        glossed = self.apply_glossary(text)
+        if not has_hangul(glossed):
+            self._count("glossary_hits")
+            return glossed
+
+        self._count("misses")
+        translated = llm_translate(glossed)
+        if translated and translated.strip() and translated != glossed:
+            self.store(namespace, text, translated)
+        return translated
+
+_memory: Optional[TranslationMemory] = None
+_memory_lock = threading.Lock()
+
+def get_translation_memory() -> TranslationMemory:
+    """전역 번역 메모리 인스턴스"""
+    global _memory
+    if _memory is None:
+        with _memory_lock:
+            if _memory is None:
+                _memory = TranslationMemory()
+    return _memory